@@ -0,0 +1,176 @@
+"""
+Micro benchmarks of the java_bot hot helpers on synthetic maps from 20x20 to 60x60
+Every helper is timed with timeit (best of --repeats) and reported in nanoseconds per call.
+--save records the timings as the baseline, otherwise they are compared against the saved baseline
+and the run fails if any helper got slower than the baseline by more than --threshold.
+Run from the python directory: python bench/bench_java_bot.py, or python run.py bench
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from battlecode25.stubs import *
+from sim import load_player, FakeRC, SimRobot, SyntheticMap
+
+PLAYER_DIR = Path("src/java_bot")
+BASELINE_FILE = Path(".temp/bench_baseline.json")
+SIZES = (20, 30, 40, 50, 60)
+
+
+def reset_state(bot, defaults):
+    """Puts back the navigation state of the robot, so every call starts from the same state"""
+    for name, value in defaults.items():
+        setattr(bot.state, name, value)
+
+
+def make_rc(bot, world, unit_type, near, blocked_towards=None):
+    """Places a robot of unit_type on world and sets up its world map like the first turn of the robot does"""
+    # The robot is not added to the world, so every benchmark sees the same map
+    rc = FakeRC(world, SimRobot(0, Team.A, unit_type, world.find_location(near, blocked_towards)))
+    bot.WorldMap.init(rc)
+    bot.Symmetry.init(rc)
+    bot.WorldMap.refresh(rc)
+    return rc
+
+
+def bench_score_splasher_tiles(bot, world, center):
+    rc = make_rc(bot, world, UnitType.SPLASHER, center)
+    return lambda: bot.Sensing.score_splasher_tiles(rc)
+
+
+def bench_score_tile(bot, world, center):
+    rc = make_rc(bot, world, UnitType.SOLDIER, center)
+    tile = rc.get_location().translate(1, 1)
+    return lambda: bot.Sensing.score_tile(rc, tile, True)
+
+
+def bench_better_explore(bot, world, center):
+    rc = make_rc(bot, world, UnitType.SOLDIER, center)
+    target = MapLocation(world.width - 1, world.height - 1)
+    defaults = {name: getattr(bot.state, name) for name in NAV_STATE}
+
+    def call():
+        reset_state(bot, defaults)
+        return bot.Pathfinding.better_explore(rc, rc.get_location(), target, True)
+    return call
+
+
+def bench_bug1(bot, world, center):
+    # Stand next to a wall that is in the way, so the second call traces around it
+    rc = make_rc(bot, world, UnitType.SOLDIER, center, blocked_towards=center)
+    target = center
+    defaults = {name: getattr(bot.state, name) for name in NAV_STATE}
+
+    def call():
+        reset_state(bot, defaults)
+        bot.Pathfinding.bug1(rc, target)
+        return bot.Pathfinding.bug1(rc, target)
+    return call
+
+
+def bench_map_info_encode(bot, world, center):
+    rc = make_rc(bot, world, UnitType.SOLDIER, center)
+    tiles = rc.sense_nearby_map_infos()
+    encode = bot.MapInfoCodec.encode
+    return lambda: [encode(tile) for tile in tiles]
+
+
+def bench_map_info_decode(bot, world, center):
+    rc = make_rc(bot, world, UnitType.SOLDIER, center)
+    messages = [bot.MapInfoCodec.encode(tile) for tile in rc.sense_nearby_map_infos()]
+    decode = bot.MapInfoCodec.decode
+    return lambda: [decode(message) for message in messages]
+
+
+def bench_resource_pattern_type(bot, world, center):
+    rc = make_rc(bot, world, UnitType.SOLDIER, center)
+    locations = [tile.get_map_location() for tile in rc.sense_nearby_map_infos()]
+    resource_pattern_type = bot.Helper.resource_pattern_type
+    return lambda: [resource_pattern_type(rc, loc) for loc in locations]
+
+
+# State that better_explore and bug1 read and write, put back before every call
+NAV_STATE = ('intermediate_target', 'prev_intermediate', 'stuck_turn_count', 'closest_path', 'in_bug_nav',
+             'in_astar_nav', 'across_wall', 'astar_path', 'astar_target', 'astar_wall_version', 'is_tracing',
+             'smallest_distance', 'closest_location', 'tracing_dir', 'bug1_turns')
+
+# Codec and pattern benchmarks process every tile in vision per call
+BENCHMARKS = {
+    "Sensing.score_splasher_tiles": bench_score_splasher_tiles,
+    "Sensing.score_tile": bench_score_tile,
+    "Pathfinding.better_explore": bench_better_explore,
+    "Pathfinding.bug1": bench_bug1,
+    "MapInfoCodec.encode (vision)": bench_map_info_encode,
+    "MapInfoCodec.decode (vision)": bench_map_info_decode,
+    "Helper.resource_pattern_type (vision)": bench_resource_pattern_type,
+}
+
+
+def run_benchmarks(names, sizes, repeats, seed):
+    """Returns {"name@WxH": nanoseconds per call}"""
+    bot = load_player(PLAYER_DIR)
+    timings = {}
+    for size in sizes:
+        world = SyntheticMap(size, size, seed)
+        center = MapLocation(size // 2, size // 2)
+        for name in names:
+            # The Constants.rng draws of better_explore are the same in every run
+            bot.rng.seed(seed)
+            call = BENCHMARKS[name](bot, world, center)
+            timer = timeit.Timer(call)
+            number, _ = timer.autorange()
+            timings[f"{name}@{size}x{size}"] = min(timer.repeat(repeats, number)) / number * 1e9
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the java_bot hot helpers on synthetic maps")
+    parser.add_argument("--save", action="store_true", help="Record the timings as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Fail if a helper is slower than its baseline by more than this fraction")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of timings per helper, the best one counts")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic maps")
+    parser.add_argument("--only", type=str, default=None,
+                        help="Only run the benchmarks whose name contains one of these strings, separated by commas")
+    parser.add_argument("--baseline", type=str, default=str(BASELINE_FILE), help="Baseline file")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.only is None or any(part in name for part in args.only.split(","))]
+    timings = run_benchmarks(names, SIZES, args.repeats, args.seed)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'benchmark':<52}{'ns/call':>12}{'baseline':>12}{'change':>9}")
+    for key, ns in timings.items():
+        if key in baseline:
+            change = ns / baseline[key] - 1
+            if change > args.threshold:
+                regressions.append(key)
+            print(f"{key:<52}{ns:>12.0f}{baseline[key]:>12.0f}{100 * change:>+8.1f}%{' !' if key in regressions else ''}")
+        else:
+            print(f"{key:<52}{ns:>12.0f}{'-':>12}{'-':>9}")
+
+    if args.save:
+        # Keep the baselines of the benchmarks that did not run
+        baseline.update(timings)
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} benchmarks are more than {100 * args.threshold:.0f}% slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,30 @@
+import io
 import os
+import ast
+import re
 import sys
+import csv
 import json
+import math
+import sqlite3
 import stat
+import random
+import time
+import tempfile
 import urllib
 import shutil
 import zipfile
 import argparse
 import platform
+import hashlib
+import itertools
+import threading
+import contextlib
 import subprocess
 import urllib.request
 from pathlib import Path
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 
 # Check python version
@@ -35,7 +50,10 @@ properties = {
     "skip_version_check": False,
     "compatibility_client": False,
     "on_saturn": False,
-    "gcloud_token": None
+    "gcloud_token": None,
+    "version_cache_ttl": 6 * 60 * 60,
+    "release_base_url": "https://releases.battlecode.org",
+    "download_workers": 4
 }
 
 
@@ -74,21 +92,99 @@ class ZipFileWithPermissions(zipfile.ZipFile):
 
         return targetpath
 
+    def _target_path(self, member, path):
+        """Where member is extracted to, with the same sanitizing as ZipFile.extract."""
+        arcname = member.filename.replace('/', os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        invalid_path_parts = ('', os.path.curdir, os.path.pardir)
+        arcname = os.path.sep.join(x for x in arcname.split(os.path.sep) if x not in invalid_path_parts)
+        if os.path.sep == '\\':
+            arcname = self._sanitize_windows_name(arcname, os.path.sep)
+        return os.path.normpath(os.path.join(path, arcname))
+
+    def extractall(self, path=None, members=None, pwd=None, workers=None):
+        """
+        Extract members on a thread pool, each worker with its own handle on the archive.
+        Every file is preallocated to its final size and streamed in, symlinks and permissions
+        are applied in a final pass once all contents are written.
+        """
+        if self.filename is None or not os.path.isfile(self.filename):
+            # Opened from a file object, which the workers cannot reopen
+            return super().extractall(path, members, pwd)
+
+        path = os.fspath(path) if path is not None else os.getcwd()
+        infos = [m if isinstance(m, zipfile.ZipInfo) else self.getinfo(m) for m in (members or self.infolist())]
+        directories = []
+        files = []
+        links = []
+        for member in infos:
+            target = self._target_path(member, path)
+            if member.is_dir():
+                directories.append((member, target))
+            elif stat.S_ISLNK(member.external_attr >> 16):
+                links.append((member, target))
+            else:
+                files.append((member, target))
+
+        # Create every folder up front, so the workers never race on makedirs
+        for _, target in directories:
+            os.makedirs(target, exist_ok=True)
+        for _, target in files + links:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        local = threading.local()
+
+        def extract_file(member, target):
+            if not hasattr(local, "archive"):
+                local.archive = zipfile.ZipFile(self.filename)
+                handles.append(local.archive)
+            with local.archive.open(member, pwd=pwd) as source, open(target, "wb") as out_file:
+                out_file.truncate(member.file_size)
+                shutil.copyfileobj(source, out_file, 1024 * 1024)
+
+        handles = []
+        try:
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+                # Biggest members first, so one large file does not end up last on a single thread
+                files.sort(key=lambda item: -item[0].file_size)
+                for future in [executor.submit(extract_file, member, target) for member, target in files]:
+                    future.result()
+        finally:
+            for handle in handles:
+                handle.close()
+
+        # Final pass: symlinks, then file permissions, then folder permissions from the deepest up
+        for member, target in links:
+            link_target = self.read(member, pwd).decode('utf-8')
+            if os.path.lexists(target):
+                os.unlink(target)
+            os.symlink(link_target, target)
+        for member, target in files:
+            attr = member.external_attr >> 16
+            if attr != 0:
+                os.chmod(target, attr)
+        for member, target in sorted(directories, key=lambda item: -len(item[1])):
+            attr = member.external_attr >> 16
+            if attr != 0:
+                os.chmod(target, attr)
+
 
-def install_engine(ver_data, version):
+def install_engine(ver_data, version, target_dir):
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", f".temp/{ver_data['get_filename'](version)}"])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--target", str(target_dir / "site-packages"),
+                               "--no-warn-script-location", f".temp/{ver_data['get_filename'](version)}"])
         return True
     except Exception as e:
         print(f"Failed to install package: {e}")
         return False
 
 
-def install_client(ver_data, version):
+def install_client(ver_data, version, target_dir):
     try:
-        shutil.rmtree('client', ignore_errors=True)
         with ZipFileWithPermissions(f".temp/{ver_data['get_filename'](version)}", 'r') as zip_ref:
-            zip_ref.extractall("client")
+            zip_ref.extractall(target_dir)
         if properties["compatibility_client"]:
             print("COMPATIBILITY CLIENT INSTALLED")
         return True
@@ -97,16 +193,96 @@ def install_client(ver_data, version):
         return False
 
 
+def activate_engine(entry):
+    """Put the engine of a store entry first on the import path of this process and its children."""
+    site_packages = str((entry / "site-packages").resolve())
+    if site_packages not in sys.path:
+        sys.path.insert(0, site_packages)
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [site_packages, os.environ.get("PYTHONPATH")]))
+
+
+def activate_client(entry):
+    """Point the client folder at a store entry, by swapping a symlink, or by copying if symlinks are unavailable."""
+    client = Path("client")
+    tmp_link = Path("client.tmp-link")
+    if tmp_link.is_symlink() or tmp_link.exists():
+        tmp_link.unlink()
+    try:
+        os.symlink(os.path.relpath(entry), tmp_link, target_is_directory=True)
+    except OSError:
+        # e.g. Windows without developer mode
+        if client.is_symlink():
+            client.unlink()
+        shutil.rmtree(client, ignore_errors=True)
+        shutil.copytree(entry, client, symlinks=True, ignore=shutil.ignore_patterns(".installed"))
+        return
+    if client.is_dir() and not client.is_symlink():
+        # A client extracted before the store existed
+        shutil.rmtree(client)
+    os.replace(tmp_link, client)
+
+
 # Constants
 SOURCE_DIR = Path("src")
 TEST_DIR = Path("test")
+BENCH_SCRIPT = Path("bench/bench_java_bot.py")
+SIM_MAP = Path("sim/maps/Square24.txt")
+MAP_DIR = Path("maps")
+SUBMISSION_FILE = Path("submission.zip")
+# Size, mtime and hash of every file in the last submission.zip, to reuse its compressed entries
+SUBMISSION_MANIFEST = Path(".temp/submission_manifest.json")
+# SQLite index of every match played, kept next to the replays
+RESULTS_DB_NAME = "results.db"
+# Source tree hash of every player that passed verify, so unchanged players are not compiled again
+VERIFY_CACHE = Path(".temp/verify_cache.json")
+
+# TrueSkill defaults of the ladder task: new bots start at MU +- 3 SIGMA, BETA is the skill gap that wins 76% of
+# matches, and TAU keeps sigma from shrinking to nothing so ratings can follow bots that change
+LADDER_MU = 25.0
+LADDER_SIGMA = LADDER_MU / 3
+LADDER_BETA = LADDER_SIGMA / 2
+LADDER_TAU = LADDER_SIGMA / 100
+
+TUNE_DIR = Path(".temp/variants")
+TUNE_RESULTS_NAME = "tune.json"
+# Constants of constants.py the tune task searches over, with their (low, high) range.
+# Integer bounds give integer values
+TUNE_SPACE = {
+    "PERCENT_PAINT": (0.4, 0.9),
+    "LOW_PAINT_THRESHOLD": (5, 50),
+    "RANDOM_STEP_PROBABILITY": (0.2, 0.8),
+    "DEVELOP_BOT_PROBABILITY_CAP": (0.3, 0.9),
+    "DEVELOP_BOT_PROB_SCALING": (50, 400),
+    "DEFENSE_RANGE": (0.1, 0.6),
+    "SPLASHER_CUTOFF": (2, 16),
+    "SPLASHER_SOLDIER_SPLIT": (0.2, 0.8),
+    "DEV_SRP_BOT_SPLIT": (0.5, 0.95),
+    "DEV_LIFE_CYCLE_TURNS": (10, 60),
+    "SRP_LIFE_CYCLE_TURNS": (10, 60),
+    "MIN_PAINT_GIVE": (20, 100),
+}
+# Installed versions, one folder per version and artifact hash: .temp/store/<name>/<version>-<sha1>
+STORE_DIR = Path(".temp/store")
+# Downloads are split into ranges of this size, fetched in parallel and resumable one range at a time
+DOWNLOAD_RANGE_SIZE = 4 * 1024 * 1024
+DOWNLOAD_READ_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = 30
+# Episode metadata from the server, with the time it was fetched. Lives next to engine_version.txt
+VERSION_CACHE_FILE = Path("version_cache.json")
+VERSION_SERVER_URL = "https://api.battlecode.org/api/episode/e/bc25python/?format=json"
+#VERSION_SERVER_URL = "https://api.battlecode.org/api/episode/e/bc24/?format=json"
+VERSION_SERVER_TIMEOUT = 5
+# The engine reports the outcome of a match as e.g. "[server] java_bot (A) wins (round 1532)",
+# test/test_match_result.py checks the pattern against a recorded engine log
+MATCH_RESULT_PATTERN = re.compile(r"(\S+) \(([AB])\) wins \(round (\d+)\)")
 ENGINE_VER_DATA = {
     "name": "engine",
     "file": "engine_version.txt",
     "get_property": lambda: "release_version_saturn" if properties["on_saturn"] else "release_version_public",
     "get_url": lambda version: f"maven/org/battlecode/battlecode25-python/{version}/battlecode.tar.gz",
     "get_filename": lambda version: "battlecode.tar.gz",
-    "install": install_engine
+    "install": install_engine,
+    "activate": activate_engine
 }
 CLIENT_VER_DATA = {
     "name": "client",
@@ -114,7 +290,8 @@ CLIENT_VER_DATA = {
     "get_property": lambda: "release_version_client",
     "get_url": lambda version: f"maven/org/battlecode/battlecode25-client-{client_platform}-{'electron' if properties['compatibility_client'] else 'tauri'}/{version}/battlecode25-client-{client_platform}-{'electron' if properties['compatibility_client'] else 'tauri'}-{version}.zip",
     "get_filename": lambda version: "battlecode25-client.zip",
-    "install": install_client
+    "install": install_client,
+    "activate": activate_client
 }
 
 
@@ -130,6 +307,111 @@ def load_properties():
         pass
 
 
+def open_release_url(url, headers=None, method=None):
+    """Open a URL relative to the release server, with the gcloud token if there is one."""
+    req = urllib.request.Request(f"{properties['release_base_url'].rstrip('/')}/{url}", method=method)
+    for k, v in (headers or {}).items():
+        req.add_header(k, v)
+    if properties["gcloud_token"] is not None:
+        req.add_header("Authorization", f"Bearer {properties['gcloud_token']}")
+    return urllib.request.urlopen(req, timeout=DOWNLOAD_TIMEOUT)
+
+
+def print_progress(downloaded, total_size):
+    if total_size > 0:
+        percent = downloaded / total_size * 100
+        bar_length = 40
+        filled_length = int(bar_length * downloaded // total_size)
+        bar = '=' * filled_length + '-' * (bar_length - filled_length)
+        sys.stdout.write(f'\r[{bar}] {percent:.2f}%')
+        sys.stdout.flush()
+    else:
+        # Total size unknown
+        sys.stdout.write(f'\rDownloaded {downloaded / (1024 ** 2):.2f} MB')
+        sys.stdout.flush()
+
+
+def load_manifest(manifest_path, url, total_size, etag):
+    """Return the ranges already downloaded to the .part file, if it belongs to the same artifact."""
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest["url"] == url and manifest["size"] == total_size and manifest["etag"] == etag:
+            return set(manifest["done"])
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def save_manifest(manifest_path, url, total_size, etag, done):
+    write_json_atomic(manifest_path, {"url": url, "size": total_size, "etag": etag, "done": sorted(done)}, indent=None)
+
+
+def download_range(url, part_path, start, end, progress):
+    """Download bytes start..end (inclusive) of url into the same bytes of part_path."""
+    with open_release_url(url, {"Range": f"bytes={start}-{end}"}) as response, open(part_path, "r+b") as out_file:
+        if response.status != 206:
+            raise IOError(f"server ignored the range request (HTTP {response.status})")
+        out_file.seek(start)
+        while chunk := response.read(DOWNLOAD_READ_SIZE):
+            out_file.write(chunk)
+            progress(len(chunk))
+    return start
+
+
+def download_ranges(url, part_path, manifest_path, total_size, etag):
+    """Download url into part_path in parallel ranges, skipping the ranges a previous attempt finished."""
+    done = load_manifest(manifest_path, url, total_size, etag)
+    if done is None or not os.path.exists(part_path) or os.path.getsize(part_path) != total_size:
+        done = set()
+        with open(part_path, "wb") as f:
+            f.truncate(total_size)
+        save_manifest(manifest_path, url, total_size, etag, done)
+    elif done:
+        print(f"Resuming download, {len(done)} ranges already done")
+
+    starts = [start for start in range(0, total_size, DOWNLOAD_RANGE_SIZE) if start not in done]
+    lock = threading.Lock()
+    downloaded = [sum(min(DOWNLOAD_RANGE_SIZE, total_size - start) for start in done)]
+
+    def progress(n):
+        with lock:
+            downloaded[0] += n
+            print_progress(downloaded[0], total_size)
+
+    with ThreadPoolExecutor(max_workers=max(1, properties["download_workers"])) as executor:
+        futures = [executor.submit(download_range, url, part_path, start,
+                                   min(start + DOWNLOAD_RANGE_SIZE, total_size) - 1, progress)
+                   for start in starts]
+        error = None
+        try:
+            for future in as_completed(futures):
+                # Record every finished range, so a failed or interrupted download resumes from here
+                try:
+                    done.add(future.result())
+                except Exception as e:
+                    error = error or e
+                    continue
+                save_manifest(manifest_path, url, total_size, etag, done)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    if error is not None:
+        raise error
+
+
+def download_stream(url, part_path):
+    """Download url into part_path over a single connection, for servers without range support."""
+    with open_release_url(url) as response, open(part_path, 'wb') as out_file:
+        total_size = int(response.getheader('Content-Length', 0))
+        downloaded = 0
+        while chunk := response.read(DOWNLOAD_READ_SIZE):
+            out_file.write(chunk)
+            downloaded += len(chunk)
+            print_progress(downloaded, total_size)
+
+
 def download_file(url, output_name):
     # Create temp directory
     output_path = f".temp/{output_name}"
@@ -150,41 +432,66 @@ def download_file(url, output_name):
 
         print(f"File downloaded with GCS to {output_path}")
     else:
-        # Standard HTTP download
-
-        url = f"https://releases.battlecode.org/{url}"
-
-        def reporthook(downloaded, total_size):
-            if total_size > 0:
-                percent = downloaded / total_size * 100
-                bar_length = 40
-                filled_length = int(bar_length * downloaded // total_size)
-                bar = '=' * filled_length + '-' * (bar_length - filled_length)
-                sys.stdout.write(f'\r[{bar}] {percent:.2f}%')
-                sys.stdout.flush()
-            else:
-                # Total size unknown
-                sys.stdout.write(f'\rDownloaded {downloaded / (1024 ** 2):.2f} MB')
-                sys.stdout.flush()
-
-        req = urllib.request.Request(url)
-        if properties["gcloud_token"] is not None:
-            req.add_header("Authorization", f"Bearer {properties['gcloud_token']}")
+        # Standard HTTP download, into a .part file that is only renamed once complete
+        part_path = f"{output_path}.part"
+        manifest_path = f"{output_path}.part.json"
 
         print(f"Downloading {output_name}...")
-        with urllib.request.urlopen(req) as response, open(output_path, 'wb') as out_file:
-            total_size = int(response.getheader('Content-Length', 0))
-            downloaded = 0
-            chunk_size = 8192 * 2
-            while chunk := response.read(chunk_size):
-                out_file.write(chunk)
-                downloaded += len(chunk)
-                reporthook(downloaded, total_size)
+        try:
+            with open_release_url(url, method="HEAD") as response:
+                total_size = int(response.getheader('Content-Length', 0))
+                accepts_ranges = response.getheader('Accept-Ranges', '') == 'bytes'
+                etag = response.getheader('ETag', '')
+        except urllib.error.HTTPError as e:
+            if e.code not in (405, 501):
+                raise
+            # The server does not answer HEAD requests, so it gets a plain download
+            total_size, accepts_ranges, etag = 0, False, ''
+        if accepts_ranges and total_size > 0:
+            download_ranges(url, part_path, manifest_path, total_size, etag)
+        else:
+            download_stream(url, part_path)
 
+        os.replace(part_path, output_path)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
         sys.stdout.write('\n')
         sys.stdout.flush()
 
 
+def file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def verify_download(url, output_name):
+    """
+    Compare the downloaded file with the .sha1 checksum the release server publishes next to it.
+    A mismatching file is deleted. Returns False only on a mismatch, a missing checksum is just a warning.
+    """
+    if properties["on_saturn"]:
+        # GCS checks the integrity of its own downloads
+        return True
+    output_path = f".temp/{output_name}"
+    try:
+        with open_release_url(f"{url}.sha1") as response:
+            expected = response.read().decode().split()[0].lower()
+    except Exception as e:
+        print(f"WARNING: no checksum for {output_name}, skipping verification ({e})")
+        return True
+
+    actual = file_sha1(output_path)
+    if actual != expected:
+        print(f"Checksum mismatch for {output_name}: expected {expected}, got {actual}")
+        os.remove(output_path)
+        return False
+    print(f"Checksum of {output_name} verified")
+    return True
+
+
 def get_local_version(ver_data) -> str:
     version_file = Path(ver_data["file"])
     if version_file.is_file():
@@ -201,27 +508,75 @@ def set_local_version(ver_data, new_version: str):
         vf.write(new_version)
 
 
-def get_server_version(ver_data) -> str | None:
-    """Fetch the latest version from the server"""
-    url = "https://api.battlecode.org/api/episode/e/bc25python/?format=json"
-    #url = "https://api.battlecode.org/api/episode/e/bc24/?format=json"
+def fetch_episode_data() -> dict | None:
+    """Fetch the episode metadata from the server and store it in the version cache."""
     try:
-        with urllib.request.urlopen(url) as response:
-            parsed = json.loads(response.read())
-            version = parsed[ver_data["get_property"]()]
-            if version == "":
-                return None
-            return version
+        with urllib.request.urlopen(VERSION_SERVER_URL, timeout=VERSION_SERVER_TIMEOUT) as response:
+            episode = json.loads(response.read())
     except Exception as e:
         print(f"Failed to fetch server version: {e}")
         return None
 
+    # Several run.py processes may refresh the cache at once, each writes its own temporary file
+    try:
+        write_json_atomic(VERSION_CACHE_FILE, {"checked_at": time.time(), "episode": episode}, indent=None)
+    except OSError as e:
+        print(f"Failed to write {VERSION_CACHE_FILE}: {e}")
+    return episode
+
+
+def load_version_cache() -> dict | None:
+    try:
+        with open(VERSION_CACHE_FILE, "r") as f:
+            cache = json.load(f)
+        if isinstance(cache.get("checked_at"), (int, float)) and isinstance(cache.get("episode"), dict):
+            return cache
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+version_refresh_thread = None
+
+
+def refresh_version_cache_in_background():
+    """Refresh the version cache on a daemon thread, at most once per process."""
+    global version_refresh_thread
+    if version_refresh_thread is None:
+        version_refresh_thread = threading.Thread(target=fetch_episode_data, name="version-refresh", daemon=True)
+        version_refresh_thread.start()
+
+
+def get_server_version(ver_data, max_age=None) -> str | None:
+    """
+    Fetch the latest version from the server.
+    With max_age (seconds), the cached metadata is used instead and never blocks: if it is older than
+    max_age it is refreshed in the background, for the next run. Returns None if no version is known.
+    """
+    if max_age is None:
+        episode = fetch_episode_data()
+    else:
+        cache = load_version_cache()
+        if cache is None or time.time() - cache["checked_at"] > max_age:
+            refresh_version_cache_in_background()
+        episode = cache["episode"] if cache is not None else None
+
+    if episode is None:
+        return None
+    version = episode.get(ver_data["get_property"](), "")
+    if version == "":
+        return None
+    return version
+
 
-def check_new_version(ver_data) -> str | None:
+def check_new_version(ver_data, max_age=None) -> str | None:
     """Check for a newer version."""
-    latest_version = get_server_version(ver_data)
+    latest_version = get_server_version(ver_data, max_age)
     if latest_version is None:
-        print("WARNING: unable to get the latest version from the server")
+        if max_age is None:
+            print("WARNING: unable to get the latest version from the server")
+        else:
+            print(f"WARNING: no cached {ver_data['name']} version yet, checking the server in the background")
         return None
     current_version = get_local_version(ver_data)
     if current_version != latest_version:
@@ -229,6 +584,90 @@ def check_new_version(ver_data) -> str | None:
     return None
 
 
+def load_store_index(ver_data) -> dict:
+    """Return the installed versions of a package, as version -> store entry name."""
+    try:
+        with open(STORE_DIR / ver_data["name"] / "versions.json", "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json_atomic(path, data, indent=4):
+    """
+    Write data as JSON to path through a temporary file next to it, so readers never see half a file.
+    The temporary file has a unique name, so concurrent writers each replace path with a whole file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                     delete=False) as f:
+        tmp_path = f.name
+        try:
+            json.dump(data, f, indent=indent)
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+
+def store_entry(ver_data, version) -> Path | None:
+    """Return the store folder of an installed version, or None if it is not installed."""
+    name = load_store_index(ver_data).get(version)
+    if name is None:
+        return None
+    entry = STORE_DIR / ver_data["name"] / name
+    return entry if (entry / ".installed").is_file() else None
+
+
+def install_into_store(ver_data, version) -> Path | None:
+    """Install the downloaded archive of version into its own store folder, reusing it if the content is already there."""
+    archive = f".temp/{ver_data['get_filename'](version)}"
+    entry = STORE_DIR / ver_data["name"] / f"{version}-{file_sha1(archive)[:12]}"
+    if not (entry / ".installed").is_file():
+        # Install next to the entry and rename it into place, so a failed install never looks complete
+        staging = entry.with_name(f"{entry.name}.staging")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        if not ver_data["install"](ver_data, version, staging):
+            shutil.rmtree(staging, ignore_errors=True)
+            return None
+        (staging / ".installed").touch()
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+
+    index = load_store_index(ver_data)
+    index[version] = entry.name
+    write_json_atomic(STORE_DIR / ver_data["name"] / "versions.json", index)
+    return entry
+
+
+def switch_version(ver_data, version) -> bool:
+    """Make an installed version the current one. Returns False if it is not in the store."""
+    entry = store_entry(ver_data, version)
+    if entry is None:
+        return False
+    write_json_atomic(STORE_DIR / ver_data["name"] / "current.json", {"version": version, "entry": entry.name})
+    ver_data["activate"](entry)
+    set_local_version(ver_data, version)
+    return True
+
+
+def use_current_engine():
+    """Import the engine from the store if one is installed there, instead of site-packages."""
+    try:
+        with open(STORE_DIR / ENGINE_VER_DATA["name"] / "current.json", "r") as f:
+            entry = STORE_DIR / ENGINE_VER_DATA["name"] / json.load(f)["entry"]
+    except (OSError, ValueError, KeyError):
+        return
+    if (entry / ".installed").is_file():
+        activate_engine(entry)
+
+
 def run_update(ver_data):
     """Update the version."""
     new_version = check_new_version(ver_data)
@@ -236,6 +675,11 @@ def run_update(ver_data):
         print(f"{ver_data['name']} is up to date.")
         return
 
+    # Versions we had before are switched back to without downloading anything
+    if switch_version(ver_data, new_version):
+        print(f"Switched {ver_data['name']} to installed version {new_version}")
+        return
+
     print(f"Updating {ver_data['name']}...")
 
     # Download package
@@ -244,43 +688,131 @@ def run_update(ver_data):
         url = ver_data['get_url'](new_version)
         download_file(url, filename)
     except Exception as e:
-        print(f"Failed to download package: {e}")
+        print(f"\nFailed to download package: {e}")
+        print("Run the update again to resume the download.")
+        return
+
+    if not verify_download(url, filename):
         return
 
-    if not ver_data["install"](ver_data, new_version):
+    if install_into_store(ver_data, new_version) is None:
         return
 
     # Update version file
-    set_local_version(ver_data, new_version)
+    switch_version(ver_data, new_version)
 
     print(f"Successfully updated {ver_data['name']} version to {new_version}")
 
 
-def verify_package(player_dir):
+def has_turn_function(tree):
+    """Check that a parsed bot.py defines turn() without parameters at module level."""
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "turn":
+            arguments = node.args
+            return not (arguments.posonlyargs or arguments.args or arguments.vararg or
+                        arguments.kwonlyargs or arguments.kwarg)
+    return False
+
+
+def check_package(player_dir) -> str | None:
+    """Return why the player in player_dir would be rejected, or None if it is valid."""
     if not os.path.exists(player_dir):
-        print(f"Player dir {player_dir} missing!")
-        return False
+        return f"Player dir {player_dir} missing!"
 
     bot_path = os.path.join(player_dir, "bot.py")
     if not os.path.exists(bot_path):
-        print(f"Missing bot.py in {player_dir}!")
-        return False
+        return f"Missing bot.py in {player_dir}!"
 
     with open(bot_path, "r") as f:
         source = f.read()
-    if "def turn():" not in source:
-        print("Missing 'def turn()' main function in bot.py!")
-        return False
+    try:
+        tree = ast.parse(source, bot_path)
+    except SyntaxError as e:
+        return f"Compile failed! {e}"
+    if not has_turn_function(tree):
+        return "Missing 'def turn()' main function in bot.py!"
 
     try:
         # Try compiling the bot
         from battlecode25 import CodeContainer
         container = CodeContainer.from_directory(player_dir)
     except Exception as e:
-        print(f"Compile failed! {e}")
-        return False
+        return f"Compile failed! {e}"
 
-    return True
+    return None
+
+
+def source_tree_hash(player_dir):
+    """Hash every .py file of a player together with the engine version that compiles it."""
+    sha1 = hashlib.sha1()
+    version_file = Path(ENGINE_VER_DATA["file"])
+    if version_file.is_file():
+        sha1.update(version_file.read_bytes().strip())
+    for path in sorted(Path(player_dir).rglob("*.py")):
+        sha1.update(b"\0" + path.relative_to(player_dir).as_posix().encode() + b"\0")
+        sha1.update(path.read_bytes())
+    return sha1.hexdigest()
+
+
+def load_verify_cache() -> dict:
+    """Return the players that passed verification, as player dir -> source tree hash."""
+    try:
+        with open(VERIFY_CACHE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_verify_cache(cache):
+    os.makedirs(VERIFY_CACHE.parent, exist_ok=True)
+    write_json_atomic(VERIFY_CACHE, cache)
+
+
+def resolve_module(player_dir, base_dir, dotted_name):
+    """Return the .py files of player_dir that importing dotted_name from base_dir loads, package __init__ files included."""
+    parts = dotted_name.split(".")
+    if base_dir == player_dir and parts[0] == player_dir.name:
+        # Absolute import of the player package itself, e.g. "import java_bot.constants"
+        parts = parts[1:]
+    files = []
+    path = base_dir
+    for part in parts:
+        path = path / part
+        if (path / "__init__.py").is_file():
+            files.append(path / "__init__.py")
+    if path.with_suffix(".py").is_file():
+        files.append(path.with_suffix(".py"))
+    return files
+
+
+def import_closure(player_dir):
+    """Return the .py files of player_dir that bot.py imports, directly or indirectly, bot.py included."""
+    player_dir = Path(player_dir)
+    todo = [player_dir / "bot.py"]
+    closure = set()
+    while todo:
+        path = todo.pop()
+        if path in closure or not path.is_file():
+            continue
+        closure.add(path)
+        # ast.walk also finds imports inside functions
+        for node in ast.walk(ast.parse(path.read_text(), str(path))):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    todo.extend(resolve_module(player_dir, player_dir, alias.name))
+            elif isinstance(node, ast.ImportFrom):
+                base_dir = player_dir
+                if node.level:
+                    base_dir = path.parent
+                    for _ in range(node.level - 1):
+                        base_dir = base_dir.parent
+                prefix = f"{node.module}." if node.module else ""
+                if node.module:
+                    todo.extend(resolve_module(player_dir, base_dir, node.module))
+                # "from . import constants" imports a module, not a name
+                for alias in node.names:
+                    todo.extend(resolve_module(player_dir, base_dir, prefix + alias.name))
+    return sorted(closure)
 
 
 def list_python_files(directory):
@@ -296,6 +828,51 @@ def run_script(script_path, args=None):
     subprocess.run(command, check=True)
 
 
+class TeeWriter(io.TextIOBase):
+    """Text stream that writes everything to several streams."""
+
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
+    def fileno(self):
+        # The first stream is the one a terminal would be attached to
+        return self.streams[0].fileno()
+
+    def isatty(self):
+        return self.streams[0].isatty()
+
+
+def run_test_script(script_path, timeout=None):
+    """Run one test script in its own interpreter, capturing its output. Never raises on failure."""
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run([sys.executable, str(script_path)], capture_output=True, text=True, timeout=timeout)
+        passed = completed.returncode == 0
+        output = completed.stdout + completed.stderr
+        status = "PASS" if passed else f"FAIL (exit code {completed.returncode})"
+    except subprocess.TimeoutExpired as e:
+        passed = False
+        output = "".join(part.decode(errors="replace") if isinstance(part, bytes) else part
+                         for part in (e.stdout, e.stderr) if part)
+        status = f"TIMEOUT after {timeout}s"
+    return {
+        "script": script_path,
+        "passed": passed,
+        "status": status,
+        "output": output,
+        "seconds": time.perf_counter() - start
+    }
+
+
 def run_game(args):
     """Run a battlecode game"""
     # Import at run time so that we can ensure the package is installed first
@@ -321,6 +898,168 @@ def run_game(args):
     run_game(game_args)
 
 
+def list_players(player_dir=SOURCE_DIR):
+    """List every player package (a directory with a bot.py) in player_dir."""
+    return sorted(p.name for p in Path(player_dir).iterdir() if (p / "bot.py").is_file())
+
+
+def list_maps(maps):
+    """Split a comma separated list of maps, 'all' selects every map in maps/."""
+    if maps == "all":
+        return sorted(p.stem for p in MAP_DIR.glob("*.map25"))
+    return [m for m in maps.split(",") if m]
+
+
+def make_match_job(args, p1, p2, map_name, **extra):
+    """Describe a single match so that it can be played in a worker process."""
+    job = {
+        "p1": p1,
+        "p2": p2,
+        "p1_dir": args.p1_dir,
+        "p2_dir": args.p2_dir,
+        "map": map_name,
+        "out_dir": args.out_file_dir,
+        "out_name": f"{p1}-vs-{p2}-on-{map_name}",
+        "debug": args.debug,
+        "instrument": args.instrument,
+    }
+    job.update(extra)
+    return job
+
+
+def parse_match_results(output):
+    """Return the (team, round) of the winner of every match reported in the engine output, in order."""
+    return [(match.group(2), int(match.group(3))) for match in MATCH_RESULT_PATTERN.finditer(output)]
+
+
+def unparsed_output_error(output):
+    """Describe engine output without a match result, with its last line so a format change is easy to spot."""
+    lines = output.strip().splitlines()
+    last_line = lines[-1] if lines else "no output"
+    return f"could not find the match result in the engine output (last line: {last_line!r})"
+
+
+def play_match(job):
+    """Play the match described by job and return its outcome. Runs inside a worker process."""
+    from battlecode25 import run_game, RunGameArgs
+
+    result = {"p1": job["p1"], "p2": job["p2"], "map": job["map"], "winner": None, "rounds": None, "error": None}
+    game_args = RunGameArgs(
+        player1_dir=Path(job["p1_dir"]) / job["p1"],
+        player2_dir=Path(job["p2_dir"]) / job["p2"],
+        player1_name=job["p1"],
+        player2_name=job["p2"],
+        map_dir=str(MAP_DIR),
+        map_names=job["map"],
+        out_dir=job["out_dir"],
+        out_name=job["out_name"],
+        show_indicators=False,
+        debug=job["debug"],
+        instrument=job["instrument"]
+    )
+
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            run_game(game_args)
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+
+    outcomes = parse_match_results(output.getvalue())
+    if outcomes:
+        team, rounds = outcomes[0]
+        result["winner"] = job["p1"] if team == "A" else job["p2"]
+        result["rounds"] = rounds
+    elif result["error"] is None:
+        result["error"] = unparsed_output_error(output.getvalue())
+    result["replay"] = os.path.join(job["out_dir"], job["out_name"])
+    return result
+
+
+def open_results_db(out_dir):
+    """Open (and create if needed) the match results database in out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    db = sqlite3.connect(os.path.join(out_dir, RESULTS_DB_NAME))
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS matches (
+            id INTEGER PRIMARY KEY,
+            played_at REAL NOT NULL,
+            p1 TEXT NOT NULL,
+            p2 TEXT NOT NULL,
+            map TEXT NOT NULL,
+            winner TEXT,
+            rounds INTEGER,
+            engine_version TEXT,
+            seconds REAL,
+            replay TEXT,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS matches_by_players ON matches (p1, p2, map);
+        CREATE INDEX IF NOT EXISTS matches_by_map ON matches (map, winner);
+        CREATE INDEX IF NOT EXISTS matches_by_engine ON matches (engine_version);
+        CREATE TABLE IF NOT EXISTS ratings (
+            bot TEXT PRIMARY KEY,
+            mu REAL NOT NULL,
+            sigma REAL NOT NULL,
+            games INTEGER NOT NULL,
+            updated_at REAL NOT NULL,
+            source_hash TEXT,
+            engine_version TEXT
+        );
+    """)
+    # Ratings tables created before ratings were tied to a source tree get the new columns, their rows then never match
+    columns = {row[1] for row in db.execute("PRAGMA table_info(ratings)")}
+    for column in ("source_hash", "engine_version"):
+        if column not in columns:
+            db.execute(f"ALTER TABLE ratings ADD COLUMN {column} TEXT")
+    return db
+
+
+def record_match(db, result, engine_version):
+    """Add one match result (as returned by play_match) to the results database."""
+    db.execute(
+        "INSERT INTO matches (played_at, p1, p2, map, winner, rounds, engine_version, seconds, replay, error) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (time.time(), result["p1"], result["p2"], result["map"], result["winner"], result["rounds"],
+         engine_version, result.get("seconds"), result.get("replay"), result["error"]))
+    db.commit()
+
+
+def run_matches(jobs, workers=None, in_order=False):
+    """
+    Play jobs on a pool of worker processes, yielding each result as soon as its match finishes.
+    With in_order the results come in the order of jobs instead, while the matches still run in parallel.
+    """
+    if not jobs:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    # A fresh process per match keeps module level bot state from leaking between games
+    executor = ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1)
+    try:
+        futures = [executor.submit(play_match, job) for job in jobs]
+        for future in (futures if in_order else as_completed(futures)):
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def engine_version_ok(args):
+    """Check the engine version unless skipped, returning False if an update is required."""
+    if not properties["skip_version_check"] and not args.skip_check:
+        # Use the cached server version, so starting a match never waits on the network
+        ver = check_new_version(ENGINE_VER_DATA, properties["version_cache_ttl"])
+        if ver is not None:
+            print(f"!!! New engine version available: {ver}. Run 'python run.py update' to update, or use --skip-check to skip the version check.")
+            return False
+        print("engine is up to date.")
+    else:
+        print("Skipped version check")
+    return True
+
+
 # ====== TASKS =======
 
 
@@ -330,15 +1069,37 @@ def task_tasks(args):
 
 
 def task_test(args):
-    """Run all test scripts."""
-    test_files = list_python_files(TEST_DIR)
+    """Run all test scripts in parallel and summarize the results."""
+    test_files = sorted(list_python_files(TEST_DIR))
     if not test_files:
         print("No tests found.")
         return
-    print(f"Running tests in: {TEST_DIR}")
-    for test in test_files:
-        print(f"Running test: {test}")
-        run_script(test)
+    workers = args.workers or os.cpu_count()
+    print(f"Running {len(test_files)} tests in {TEST_DIR} on {workers} workers")
+
+    # Each test is its own subprocess, so threads are enough to keep every core busy
+    results = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_test_script, test, args.test_timeout) for test in test_files]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            print(f"[{done}/{len(test_files)}] {result['status']} {result['script']} ({result['seconds']:.2f}s)")
+            if not result["passed"] and result["output"]:
+                print(result["output"].rstrip())
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if not result["passed"]]
+    print(f"\n{len(results) - len(failed)} passed, {len(failed)} failed in {elapsed:.2f}s "
+          f"({sum(result['seconds'] for result in results):.2f}s of test time)")
+    print("Slowest tests:")
+    for result in sorted(results, key=lambda result: -result["seconds"])[:5]:
+        print(f"  {result['seconds']:8.2f}s  {result['script']}")
+    if failed:
+        for result in failed:
+            print(f"FAILED {result['script']}: {result['status']}")
+        raise RuntimeError(f"{len(failed)} of {len(results)} tests failed")
 
 
 def task_version(args):
@@ -365,40 +1126,613 @@ def task_update(args):
         run_update(CLIENT_VER_DATA)
 
 
+def task_switch(args):
+    """Switch the engine and/or client to a version that is already installed, or list the installed versions."""
+    requested = [(ENGINE_VER_DATA, args.engine_version), (CLIENT_VER_DATA, args.client_version)]
+    if all(version is None for _, version in requested):
+        for ver_data, _ in requested:
+            current = get_local_version(ver_data)
+            versions = sorted(load_store_index(ver_data))
+            listed = ", ".join(f"{v} (current)" if v == current else v for v in versions) or "none"
+            print(f"Installed {ver_data['name']} versions: {listed}")
+        return
+
+    for ver_data, version in requested:
+        if version is None:
+            continue
+        if switch_version(ver_data, version):
+            print(f"Switched {ver_data['name']} to {version}")
+        else:
+            print(f"{ver_data['name']} {version} is not installed. Installed versions: {', '.join(sorted(load_store_index(ver_data))) or 'none'}")
+
+
+def task_bench(args):
+    """Benchmark the java_bot hot helpers on synthetic maps, failing on regressions against the saved baseline."""
+    command = [sys.executable, str(BENCH_SCRIPT), "--threshold", str(args.bench_threshold)]
+    if args.save_baseline:
+        command.append("--save")
+    # The engine is found through PYTHONPATH when it is installed in the store
+    completed = subprocess.run(command)
+    if completed.returncode != 0:
+        raise RuntimeError("Benchmarks regressed against the baseline")
+
+
+def task_simulate(args):
+    """Play a match between two players with the offline simulator instead of the engine."""
+    command = [sys.executable, "-m", "sim", "--p1", f"{args.p1_dir}/{args.p1}", "--p2", f"{args.p2_dir}/{args.p2}",
+               "--map", args.sim_map, "--seed", str(args.seed), "--rounds", str(args.sim_rounds)]
+    completed = subprocess.run(command)
+    if completed.returncode != 0:
+        raise RuntimeError("Simulation failed")
+
+
 def task_verify(args):
-    """Verify a player is ready to submit."""
-    player_dir = f"src/{args.p1}"
-    if verify_package(player_dir):
-        print("Player is valid!")
-    else:
-        raise RuntimeError("Player is not valid!")
+    """Verify a player (or every player with --all) is ready to submit."""
+    players = list_players() if args.all else [args.p1]
+    cache = load_verify_cache()
+    hashes = {}
+    pending = []
+    for player in players:
+        player_dir = f"src/{player}"
+        if os.path.isdir(player_dir):
+            hashes[player_dir] = source_tree_hash(player_dir)
+            if cache.get(player_dir) == hashes[player_dir]:
+                print(f"{player}: valid (unchanged since last verified)")
+                continue
+        pending.append(player_dir)
+
+    # Compiling is CPU bound, so each player gets its own process
+    errors = {}
+    if len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            errors = dict(zip(pending, executor.map(check_package, pending)))
+    elif pending:
+        errors = {pending[0]: check_package(pending[0])}
+
+    for player_dir, error in errors.items():
+        player = os.path.basename(player_dir)
+        if error is None:
+            print(f"{player}: valid")
+            cache[player_dir] = hashes[player_dir]
+        else:
+            print(f"{player}: {error}")
+            cache.pop(player_dir, None)
+    save_verify_cache(cache)
+
+    invalid = [os.path.basename(d) for d, error in errors.items() if error is not None]
+    if invalid:
+        raise RuntimeError(f"Not valid: {', '.join(invalid)}")
+    print("Player is valid!" if len(players) == 1 else f"All {len(players)} players are valid!")
 
 
 def task_zip_submission(args):
-    """Zip your code into a zipfile to be submitted online."""
-    with zipfile.ZipFile("submission.zip", 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk("src"):
-            relative_root = os.path.relpath(root, "src")
-            for file in files:
-                if not file.endswith(".py"):
-                    continue
-                file_path = os.path.join(root, file)
-                arcname = os.path.join(relative_root, file) if relative_root != '.' else file
-                zipf.write(file_path, arcname)
+    """Zip player --p1 and the modules it imports into a zipfile to be submitted online."""
+    player_dir = SOURCE_DIR / args.p1
+    if not (player_dir / "bot.py").is_file():
+        print(f"Missing bot.py in {player_dir}!")
+        return
+    files = import_closure(player_dir)
+
+    try:
+        with open(SUBMISSION_MANIFEST, "r") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    if not SUBMISSION_FILE.is_file():
+        previous = {}
+
+    # A file is unchanged when it has the same size and mtime, or failing that the same content hash
+    entries = {}
+    unchanged = set()
+    for path in files:
+        arcname = path.relative_to(SOURCE_DIR).as_posix()
+        st = path.stat()
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        old = previous.get(arcname)
+        if old is not None and old["size"] == entry["size"] and old["mtime_ns"] == entry["mtime_ns"]:
+            entry["sha1"] = old["sha1"]
+        else:
+            entry["sha1"] = file_sha1(path)
+        if old is not None and old["sha1"] == entry["sha1"]:
+            unchanged.add(arcname)
+        entries[arcname] = (path, entry)
+
+    if unchanged == set(entries) == set(previous):
+        # Still record new mtimes, so touched files are not hashed again next time
+        write_json_atomic(SUBMISSION_MANIFEST, {arcname: entry for arcname, (_, entry) in entries.items()})
+        print(f"{SUBMISSION_FILE} is up to date ({len(entries)} files)")
+        return
+
+    tmp_path = SUBMISSION_FILE.with_suffix(".zip.tmp")
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for arcname, (path, _) in entries.items():
+            zipf.write(path, arcname)
+    os.replace(tmp_path, SUBMISSION_FILE)
+
+    os.makedirs(SUBMISSION_MANIFEST.parent, exist_ok=True)
+    write_json_atomic(SUBMISSION_MANIFEST, {arcname: entry for arcname, (_, entry) in entries.items()})
+    print(f"Wrote {SUBMISSION_FILE} with {len(entries)} files from {player_dir} "
+          f"({len(entries) - len(unchanged)} changed)")
 
 
 def task_run(args):
     """Run a match between two players."""
-    if not properties["skip_version_check"] and not args.skip_check:
-        ver = check_new_version(ENGINE_VER_DATA)
-        if ver is not None:
-            print(f"!!! New engine version available: {ver}. Run 'python run.py update' to update, or use --skip-check to skip the version check.")
-            return
-        print("engine is up to date.")
+    if not engine_version_ok(args):
+        return
+
+    # Show the engine output as usual, and keep a copy to find the results in
+    output = io.StringIO()
+    with contextlib.redirect_stdout(TeeWriter(sys.stdout, output)):
+        run_game(args)
+
+    # The engine plays the maps in order and reports one result per map
+    outcomes = parse_match_results(output.getvalue())
+    maps = list_maps(args.maps)
+    if len(outcomes) != len(maps):
+        print(f"Found {len(outcomes)} results for {len(maps)} maps in the engine output, not recording them")
+        if not outcomes:
+            print(unparsed_output_error(output.getvalue()))
+        return
+    db = open_results_db(args.out_file_dir)
+    engine_version = get_local_version(ENGINE_VER_DATA)
+    for map_name, (team, rounds) in zip(maps, outcomes):
+        record_match(db, {
+            "p1": args.p1,
+            "p2": args.p2,
+            "map": map_name,
+            "winner": args.p1 if team == "A" else args.p2,
+            "rounds": rounds,
+            "error": None,
+            # The engine plays all maps in one run, so there is no time per map
+            "seconds": None,
+            "replay": os.path.join(args.out_file_dir, args.out_file_name) if args.out_file_name else None
+        }, engine_version)
+    db.close()
+
+
+def task_tournament(args):
+    """Run every player against every other player on every map, in parallel."""
+    if not engine_version_ok(args):
+        return
+
+    bots = args.bots.split(",") if args.bots else list_players(args.p1_dir)
+    maps = list_maps(args.maps)
+    jobs = [make_match_job(args, p1, p2, map_name)
+            for p1, p2 in itertools.permutations(bots, 2)
+            for map_name in maps]
+    print(f"Playing {len(jobs)} matches between {', '.join(bots)} on {len(maps)} maps")
+
+    # standings[(bot, opponent)] = [wins, losses, unknown]
+    standings = {pair: [0, 0, 0] for pair in itertools.permutations(bots, 2)}
+    db = open_results_db(args.out_file_dir)
+    engine_version = get_local_version(ENGINE_VER_DATA)
+    start = time.perf_counter()
+    for done, result in enumerate(run_matches(jobs, args.workers), 1):
+        record_match(db, result, engine_version)
+        p1, p2, winner = result["p1"], result["p2"], result["winner"]
+        if winner is None:
+            standings[(p1, p2)][2] += 1
+            standings[(p2, p1)][2] += 1
+            print(f"[{done}/{len(jobs)}] {p1} vs {p2} on {result['map']}: no result ({result['error']})")
+            continue
+        loser = p2 if winner == p1 else p1
+        standings[(winner, loser)][0] += 1
+        standings[(loser, winner)][1] += 1
+        print(f"[{done}/{len(jobs)}] {p1} vs {p2} on {result['map']}: {winner} wins (round {result['rounds']})")
+    print(f"Finished {len(jobs)} matches in {time.perf_counter() - start:.1f}s")
+    db.close()
+
+    os.makedirs(args.out_file_dir, exist_ok=True)
+    table_path = os.path.join(args.out_file_dir, "tournament.csv")
+    with open(table_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["bot", "opponent", "wins", "losses", "unknown", "win_rate"])
+        for (bot, opponent), (wins, losses, unknown) in sorted(standings.items()):
+            decided = wins + losses
+            writer.writerow([bot, opponent, wins, losses, unknown, f"{wins / decided:.3f}" if decided else ""])
+
+    print(f"{'bot':<24}{'wins':>8}{'losses':>8}{'win %':>8}")
+    for bot in bots:
+        wins = sum(standings[(bot, o)][0] for o in bots if o != bot)
+        losses = sum(standings[(bot, o)][1] for o in bots if o != bot)
+        rate = f"{100 * wins / (wins + losses):.1f}" if wins + losses else "-"
+        print(f"{bot:<24}{wins:>8}{losses:>8}{rate:>8}")
+    print(f"Results written to {table_path}")
+
+
+def wilson_interval(wins, games, alpha):
+    """Return the Wilson score interval of the win rate, at confidence 1 - alpha."""
+    if games == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    rate = wins / games
+    center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+    spread = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / (1 + z * z / games)
+    return center - spread, center + spread
+
+
+def sprt_llr(wins, losses, margin):
+    """
+    Log likelihood ratio of "the win rate is 0.5 + margin" against "the win rate is 0.5 - margin".
+    Wins push it up and losses down by the same amount, so it is a random walk that drifts towards the better bot.
+    """
+    p0 = 0.5 - margin
+    p1 = 0.5 + margin
+    return wins * math.log(p1 / p0) + losses * math.log((1 - p1) / (1 - p0))
+
+
+def task_ab(args):
+    """Play --p1 against the baseline --p2 until the better bot is known."""
+    if not engine_version_ok(args):
+        return
+
+    maps = list_maps(args.maps)
+    # Sides alternate with every round over the maps, so no bot keeps the side advantage of a map
+    jobs = []
+    for k in range(args.games):
+        map_name = maps[k % len(maps)]
+        p1, p2 = (args.p1, args.p2) if k // len(maps) % 2 == 0 else (args.p2, args.p1)
+        jobs.append(make_match_job(args, p1, p2, map_name, out_name=f"ab-{p1}-vs-{p2}-on-{map_name}-game-{k}"))
+
+    # Wald's sequential test stops as soon as the outcome is unlikely to change, with both error rates at --alpha
+    upper = math.log((1 - args.alpha) / args.alpha)
+    lower = -upper
+    print(f"Playing up to {len(jobs)} matches of {args.p1} against {args.p2} on {len(maps)} maps, "
+          f"stopping once the win rate is known to be above {0.5 + args.margin:.2f} or below {0.5 - args.margin:.2f}")
+
+    # per_map[map] = [wins, losses] of --p1
+    per_map = {map_name: [0, 0] for map_name in maps}
+    wins = losses = failed = 0
+    verdict = None
+    db = open_results_db(args.out_file_dir)
+    engine_version = get_local_version(ENGINE_VER_DATA)
+    start = time.perf_counter()
+    # Results are tested in job order, stopping on whichever matches happen to finish first would favor short games
+    matches = run_matches(jobs, args.workers, in_order=True)
+    for result in matches:
+        record_match(db, result, engine_version)
+        if result["winner"] is None:
+            failed += 1
+            print(f"{result['p1']} vs {result['p2']} on {result['map']}: no result ({result['error']})")
+            continue
+        if result["winner"] == args.p1:
+            wins += 1
+            per_map[result["map"]][0] += 1
+        else:
+            losses += 1
+            per_map[result["map"]][1] += 1
+        llr = sprt_llr(wins, losses, args.margin)
+        low, high = wilson_interval(wins, wins + losses, args.alpha)
+        print(f"[{wins + losses + failed}/{len(jobs)}] {result['winner']} wins on {result['map']}, "
+              f"{args.p1} {wins}-{losses} ({100 * low:.1f}% - {100 * high:.1f}%), LLR {llr:.2f} in [{lower:.2f}, {upper:.2f}]")
+        if llr >= upper:
+            verdict = f"{args.p1} is better than {args.p2}"
+        elif llr <= lower:
+            verdict = f"{args.p1} is not better than {args.p2}"
+        if verdict is not None:
+            # Closing the generator cancels the matches that have not started yet
+            matches.close()
+            break
+    db.close()
+
+    games = wins + losses
+    print(f"Finished {games + failed} matches in {time.perf_counter() - start:.1f}s, {failed} without a result")
+    print(f"{'map':<28}{'wins':>8}{'losses':>8}{'win %':>8}")
+    for map_name, (map_wins, map_losses) in per_map.items():
+        rate = f"{100 * map_wins / (map_wins + map_losses):.1f}" if map_wins + map_losses else "-"
+        print(f"{map_name:<28}{map_wins:>8}{map_losses:>8}{rate:>8}")
+    if games:
+        low, high = wilson_interval(wins, games, args.alpha)
+        print(f"{args.p1} won {wins} of {games} matches against {args.p2}: {100 * wins / games:.1f}%, "
+              f"{100 * (1 - args.alpha):.0f}% confidence interval {100 * low:.1f}% - {100 * high:.1f}%")
+    print(verdict if verdict is not None else f"No verdict after {len(jobs)} matches, increase --games to tell the bots apart")
+
+
+def constant_pattern(name):
+    """Match the value of a top level NAME = value line of constants.py, leaving a trailing comment alone."""
+    return re.compile(rf"^({re.escape(name)} = )([^#\n]*?)([ \t]*(#.*)?)$", re.MULTILINE)
+
+
+def read_constants(source, names):
+    """Return the current values of the given constants in the source of constants.py."""
+    values = {}
+    for name in names:
+        match = constant_pattern(name).search(source)
+        if match is None:
+            raise ValueError(f"constants.py has no '{name} = ...' line")
+        values[name] = ast.literal_eval(match.group(2))
+    return values
+
+
+def make_variant(player_dir, variant_dir, config):
+    """Copy a player to variant_dir with the constants in config rewritten in its constants.py."""
+    shutil.copytree(player_dir, variant_dir, ignore=shutil.ignore_patterns("__pycache__"))
+    constants_path = Path(variant_dir) / "constants.py"
+    source = constants_path.read_text()
+    for name, value in config.items():
+        source, count = constant_pattern(name).subn(lambda m: f"{m.group(1)}{value!r}{m.group(3)}", source, count=1)
+        if count == 0:
+            raise ValueError(f"{constants_path} has no '{name} = ...' line")
+    constants_path.write_text(source)
+
+
+def sample_config(rng, space):
+    """Draw a configuration uniformly from the (low, high) range of every constant."""
+    config = {}
+    for name, (low, high) in space.items():
+        if isinstance(low, int) and isinstance(high, int):
+            config[name] = rng.randint(low, high)
+        else:
+            config[name] = round(rng.uniform(low, high), 3)
+    return config
+
+
+def tune_job(args, variant, k, opponents, maps):
+    """Describe the k-th match of a variant. Every variant plays the same opponents, maps and sides."""
+    opponent = opponents[k % len(opponents)]
+    map_name = maps[k // len(opponents) % len(maps)]
+    if k // (len(opponents) * len(maps)) % 2 == 0:
+        p1, p2, p1_dir, p2_dir = variant, opponent, str(TUNE_DIR), args.p2_dir
     else:
-        print("Skipped version check")
+        p1, p2, p1_dir, p2_dir = opponent, variant, args.p2_dir, str(TUNE_DIR)
+    return make_match_job(args, p1, p2, map_name, p1_dir=p1_dir, p2_dir=p2_dir,
+                          out_name=f"tune-{p1}-vs-{p2}-on-{map_name}-game-{k}")
+
+
+def task_tune(args):
+    """Search the java_bot constants of --p1 for the configuration that beats the opponents most often."""
+    if not engine_version_ok(args):
+        return
+
+    names = args.tune_params.split(",") if args.tune_params else list(TUNE_SPACE)
+    unknown = [name for name in names if name not in TUNE_SPACE]
+    if unknown:
+        raise ValueError(f"Unknown tune parameters {', '.join(unknown)}, choose from {', '.join(TUNE_SPACE)}")
+    if args.eta < 2:
+        raise ValueError("--eta must be at least 2")
+    space = {name: TUNE_SPACE[name] for name in names}
+    player_dir = Path(args.p1_dir) / args.p1
+    opponents = args.bots.split(",") if args.bots else [args.p2]
+    maps = list_maps(args.maps)
+
+    # The first candidate is the current configuration, so the search can tell if it found anything better
+    rng = random.Random(args.seed)
+    defaults = read_constants((player_dir / "constants.py").read_text(), names)
+    configs = [defaults] + [sample_config(rng, space) for _ in range(args.candidates - 1)]
+    if TUNE_DIR.exists():
+        shutil.rmtree(TUNE_DIR)
+    candidates = []
+    for index, config in enumerate(configs):
+        variant = f"{args.p1}_v{index:02d}"
+        make_variant(player_dir, TUNE_DIR / variant, config)
+        candidates.append({"name": variant, "config": config, "wins": 0, "losses": 0, "failed": 0, "rung": 0})
+    by_name = {candidate["name"]: candidate for candidate in candidates}
+
+    # Successive halving: every rung plays the survivors up to the rung budget, then keeps the best 1 / eta of them.
+    # Each rung multiplies the budget by eta, so most matches go to the few candidates that keep winning
+    def win_rate(candidate):
+        decided = candidate["wins"] + candidate["losses"]
+        return candidate["wins"] / decided if decided else 0.0
+
+    print(f"Tuning {len(names)} constants of {args.p1} with {len(candidates)} candidates against "
+          f"{', '.join(opponents)} on {len(maps)} maps")
+    survivors = candidates
+    budget = args.tune_games
+    played = 0
+    rung = 0
+    start = time.perf_counter()
+    while True:
+        jobs = [tune_job(args, candidate["name"], k, opponents, maps)
+                for candidate in survivors
+                for k in range(candidate["wins"] + candidate["losses"] + candidate["failed"], budget)]
+        for result in run_matches(jobs, args.workers):
+            played += 1
+            variant = result["p1"] if result["p1"] in by_name else result["p2"]
+            candidate = by_name[variant]
+            if result["winner"] is None:
+                candidate["failed"] += 1
+                print(f"{result['p1']} vs {result['p2']} on {result['map']}: no result ({result['error']})")
+            elif result["winner"] == variant:
+                candidate["wins"] += 1
+            else:
+                candidate["losses"] += 1
+        survivors.sort(key=win_rate, reverse=True)
+        print(f"Rung {rung}: {len(survivors)} candidates after {budget} matches each, best "
+              + ", ".join(f"{c['name']} {100 * win_rate(c):.0f}%" for c in survivors[:3])
+              + f" ({played} matches in {time.perf_counter() - start:.1f}s)")
+        survivors = survivors[:max(1, len(survivors) // args.eta)]
+        rung += 1
+        for candidate in survivors:
+            candidate["rung"] = rung
+        # The last candidate standing wins without playing the next rung
+        if len(survivors) == 1:
+            break
+        budget *= args.eta
+
+    # Candidates that went further were measured on more matches, so they rank first
+    ranking = sorted(candidates, key=lambda c: (c["rung"], win_rate(c)), reverse=True)
+    best = ranking[0]
+    print(f"{'candidate':<24}{'rung':>6}{'wins':>8}{'losses':>8}{'win %':>8}")
+    for candidate in ranking[:10]:
+        print(f"{candidate['name']:<24}{candidate['rung']:>6}{candidate['wins']:>8}{candidate['losses']:>8}"
+              f"{100 * win_rate(candidate):>8.1f}")
+    print(f"Best configuration ({best['name']}):")
+    for name, value in best["config"].items():
+        change = "" if value == defaults[name] else f" (was {defaults[name]!r})"
+        print(f"    {name} = {value!r}{change}")
+
+    os.makedirs(args.out_file_dir, exist_ok=True)
+    results_path = os.path.join(args.out_file_dir, TUNE_RESULTS_NAME)
+    write_json_atomic(results_path, {
+        "player": args.p1,
+        "opponents": opponents,
+        "maps": maps,
+        "seed": args.seed,
+        "space": space,
+        "defaults": defaults,
+        "best": best["config"],
+        "candidates": [dict(candidate, win_rate=win_rate(candidate)) for candidate in ranking],
+    })
+    print(f"Results written to {results_path}, the variants are in {TUNE_DIR}")
+
+
+def load_ratings(db, versions):
+    """
+    Return {bot: [mu, sigma, games]} from the ratings table for the bots of versions, {bot: (source hash, engine version)}.
+    Bots that are unrated, or were rated with other code or another engine, get the default rating.
+    """
+    ratings = {bot: [LADDER_MU, LADDER_SIGMA, 0] for bot in versions}
+    for bot, mu, sigma, games, source_hash, engine_version in db.execute(
+            "SELECT bot, mu, sigma, games, source_hash, engine_version FROM ratings"):
+        if bot not in ratings:
+            continue
+        if versions[bot] == (source_hash, engine_version):
+            ratings[bot] = [mu, sigma, games]
+        else:
+            print(f"{bot} changed since it was rated, starting from the default rating")
+    return ratings
+
+
+def save_rating(db, bot, rating, version):
+    db.execute("INSERT OR REPLACE INTO ratings (bot, mu, sigma, games, updated_at, source_hash, engine_version) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?)", (bot, rating[0], rating[1], rating[2], time.time(), *version))
+
+
+def update_ratings(winner, loser):
+    """Apply the TrueSkill update of a two player match without draws to the [mu, sigma, games] of both bots."""
+    normal = NormalDist()
+    for rating in (winner, loser):
+        rating[1] = math.sqrt(rating[1] ** 2 + LADDER_TAU ** 2)
+    c = math.sqrt(2 * LADDER_BETA ** 2 + winner[1] ** 2 + loser[1] ** 2)
+    t = (winner[0] - loser[0]) / c
+    v = normal.pdf(t) / max(normal.cdf(t), 1e-12)
+    w = v * (v + t)
+    winner[0] += winner[1] ** 2 / c * v
+    loser[0] -= loser[1] ** 2 / c * v
+    for rating in (winner, loser):
+        rating[1] = math.sqrt(rating[1] ** 2 * max(1 - rating[1] ** 2 / (c * c) * w, 1e-6))
+        rating[2] += 1
+
+
+def pairing_value(a, b):
+    """
+    How much a match between two ratings is expected to teach: the uncertainty of both, weighted by the
+    TrueSkill match quality, so that close matches between uncertain bots come first.
+    """
+    c2 = 2 * LADDER_BETA ** 2 + a[1] ** 2 + b[1] ** 2
+    quality = math.sqrt(2 * LADDER_BETA ** 2 / c2) * math.exp(-(a[0] - b[0]) ** 2 / (2 * c2))
+    return quality * (a[1] ** 2 + b[1] ** 2)
+
+
+def print_ratings(ratings):
+    print(f"{'bot':<24}{'rating':>8}{'mu':>8}{'sigma':>8}{'games':>8}")
+    # Ranked by the conservative estimate mu - 3 sigma, which a bot only beats by winning enough matches
+    for bot, (mu, sigma, games) in sorted(ratings.items(), key=lambda item: item[1][0] - 3 * item[1][1], reverse=True):
+        print(f"{bot:<24}{mu - 3 * sigma:>8.1f}{mu:>8.1f}{sigma:>8.2f}{games:>8}")
+
+
+def task_ladder(args):
+    """Rate players with TrueSkill, playing the most informative pairings until the ratings are certain enough."""
+    if not engine_version_ok(args):
+        return
 
-    run_game(args)
+    bots = args.bots.split(",") if args.bots else list_players(args.p1_dir)
+    if len(bots) < 2:
+        raise ValueError("The ladder needs at least two players")
+    maps = list_maps(args.maps)
+    db = open_results_db(args.out_file_dir)
+    engine_version = get_local_version(ENGINE_VER_DATA)
+    versions = {bot: (source_tree_hash(os.path.join(args.p1_dir, bot)), engine_version) for bot in bots}
+    ratings = load_ratings(db, versions)
+    # pair_games[pair] counts the matches of each pairing in this run, to rotate maps and sides
+    pair_games = {pair: 0 for pair in itertools.combinations(bots, 2)}
+    batch_size = args.workers or os.cpu_count() or 1
+
+    print(f"Rating {', '.join(bots)} on {len(maps)} maps, for up to {args.ladder_games} matches "
+          f"or until every sigma is below {args.ladder_sigma}")
+    played = 0
+    start = time.perf_counter()
+    while played < args.ladder_games and max(ratings[bot][1] for bot in bots) >= args.ladder_sigma:
+        # A batch fills the workers with the most informative pairings under the current ratings.
+        # Ratings are updated after each match, and the next batch is chosen from the updated ratings
+        ranked = sorted(pair_games, key=lambda pair: pairing_value(ratings[pair[0]], ratings[pair[1]]), reverse=True)
+        count = min(batch_size, args.ladder_games - played)
+        jobs = []
+        for pair in itertools.islice(itertools.cycle(ranked), count):
+            k = pair_games[pair]
+            pair_games[pair] += 1
+            p1, p2 = pair if k % 2 == 0 else pair[::-1]
+            map_name = maps[k // 2 % len(maps)]
+            jobs.append(make_match_job(args, p1, p2, map_name,
+                                       out_name=f"ladder-{p1}-vs-{p2}-on-{map_name}-{k}"))
+        for result in run_matches(jobs, args.workers):
+            played += 1
+            record_match(db, result, engine_version)
+            if result["winner"] is None:
+                print(f"{result['p1']} vs {result['p2']} on {result['map']}: no result ({result['error']})")
+                continue
+            winner = result["winner"]
+            loser = result["p2"] if winner == result["p1"] else result["p1"]
+            update_ratings(ratings[winner], ratings[loser])
+            save_rating(db, winner, ratings[winner], versions[winner])
+            save_rating(db, loser, ratings[loser], versions[loser])
+            db.commit()
+            print(f"[{played}] {winner} beats {loser} on {result['map']}: "
+                  f"{winner} {ratings[winner][0]:.1f} +- {ratings[winner][1]:.1f}, "
+                  f"{loser} {ratings[loser][0]:.1f} +- {ratings[loser][1]:.1f}")
+    db.close()
+
+    print(f"Finished {played} matches in {time.perf_counter() - start:.1f}s")
+    print_ratings(ratings)
+
+
+def print_win_rates(db, group_by, label, where, params):
+    """Print wins, losses and win rate of every bot, grouped by the given column of the sides view."""
+    rows = db.execute(f"""
+        WITH sides AS (
+            SELECT p1 AS bot, p2 AS opponent, map, winner = p1 AS won, rounds, engine_version
+            FROM matches WHERE winner IS NOT NULL
+            UNION ALL
+            -- A bot playing itself wins as p1 and loses as p2, so self-play counts as one win and one loss
+            SELECT p2 AS bot, p1 AS opponent, map, winner = p2 AND p1 != p2 AS won, rounds, engine_version
+            FROM matches WHERE winner IS NOT NULL
+        )
+        SELECT bot, {group_by}, SUM(won), SUM(NOT won), AVG(rounds)
+        FROM sides {where}
+        GROUP BY bot, {group_by}
+        ORDER BY bot, {group_by}
+    """, params).fetchall()
+    print(f"{'bot':<24}{label:<28}{'wins':>8}{'losses':>8}{'win %':>8}{'rounds':>8}")
+    for bot, group, wins, losses, rounds in rows:
+        print(f"{bot:<24}{str(group):<28}{wins:>8}{losses:>8}{100 * wins / (wins + losses):>8.1f}{rounds:>8.0f}")
+    print()
+
+
+def task_results(args):
+    """Summarize the recorded match results: win rates per map and per opponent."""
+    db_path = os.path.join(args.out_file_dir, RESULTS_DB_NAME)
+    if not os.path.exists(db_path):
+        print(f"No results recorded yet in {db_path}")
+        return
+    db = open_results_db(args.out_file_dir)
+
+    conditions = []
+    params = []
+    if args.bots:
+        bots = args.bots.split(",")
+        conditions.append(f"bot IN ({', '.join('?' * len(bots))})")
+        params += bots
+    if args.engine_version:
+        conditions.append("engine_version = ?")
+        params.append(args.engine_version)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    total, failed = db.execute("SELECT COUNT(*), SUM(winner IS NULL) FROM matches").fetchone()
+    print(f"{total} matches recorded in {db_path}, {failed or 0} without a result\n")
+    print_win_rates(db, "'all'", "overall", where, params)
+    print_win_rates(db, "map", "map", where, params)
+    print_win_rates(db, "opponent", "opponent", where, params)
+    db.close()
 
 
 # Command-line interface
@@ -409,12 +1743,21 @@ if __name__ == "__main__":
         "version": task_version,
         "check_version": task_check_version,
         "update": task_update,
+        "switch": task_switch,
         "verify": task_verify,
         "zip_submission": task_zip_submission,
-        "run": task_run
+        "run": task_run,
+        "tournament": task_tournament,
+        "ab": task_ab,
+        "tune": task_tune,
+        "ladder": task_ladder,
+        "bench": task_bench,
+        "simulate": task_simulate,
+        "results": task_results
     }
 
     load_properties()
+    use_current_engine()
 
     parser = argparse.ArgumentParser(description="Run a Python script with specific arguments and settings.")
     parser.add_argument(
@@ -462,7 +1805,131 @@ if __name__ == "__main__":
         "--maps",
         type=str,
         default="DefaultSmall",
-        help="Name of the maps to run, separated by commas"
+        help="Name of the maps to run, separated by commas. The tournament task also accepts 'all' for every map in maps/"
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=200,
+        help="Maximum number of matches the ab task plays"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the simulate task and of the tune task's candidates"
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=0.1,
+        help="The ab task stops once --p1 is known to win more than 0.5 + margin or less than 0.5 - margin of the matches"
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="Error rate of the ab task, for both its verdict and its confidence intervals"
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=27,
+        help="Number of configurations the tune task starts with, including the current one"
+    )
+    parser.add_argument(
+        "--eta",
+        type=int,
+        default=3,
+        help="The tune task keeps 1 / eta of the candidates after every rung, and plays eta times more matches with them"
+    )
+    parser.add_argument(
+        "--tune-games",
+        type=int,
+        default=6,
+        help="Matches every candidate of the tune task plays in the first rung"
+    )
+    parser.add_argument(
+        "--tune-params",
+        type=str,
+        default=None,
+        help="Constants the tune task searches over, separated by commas. Defaults to every constant of TUNE_SPACE"
+    )
+    parser.add_argument(
+        "--ladder-games",
+        type=int,
+        default=40,
+        help="Maximum number of matches the ladder task plays"
+    )
+    parser.add_argument(
+        "--ladder-sigma",
+        type=float,
+        default=2.0,
+        help="The ladder task stops once the rating uncertainty (sigma) of every player is below this"
+    )
+    parser.add_argument(
+        "--bots",
+        type=str,
+        default=None,
+        help="Players for the tournament and ladder tasks (defaults to every player in --p1-dir), the opponents of the tune task (defaults to --p2), or to only show these players in the results task. Separated by commas"
+    )
+    parser.add_argument(
+        "--all",
+        type=str_to_bool,
+        nargs="?",
+        const=True,
+        default=False,
+        help="Verify every player in src/ instead of --p1"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of matches, players to verify or test scripts to run in parallel. Defaults to the number of CPUs"
+    )
+    parser.add_argument(
+        "--engine-version",
+        type=str,
+        default=None,
+        help="Engine version for the switch task, or to only count matches played on it in the results task"
+    )
+    parser.add_argument(
+        "--client-version",
+        type=str,
+        default=None,
+        help="Client version for the switch task"
+    )
+    parser.add_argument(
+        "--test-timeout",
+        type=float,
+        default=None,
+        help="Seconds after which a test script is stopped and counted as failed. No limit by default"
+    )
+    parser.add_argument(
+        "--sim-map",
+        type=str,
+        default=str(SIM_MAP),
+        help="Text map of the simulate task"
+    )
+    parser.add_argument(
+        "--sim-rounds",
+        type=int,
+        default=2000,
+        help="Maximum number of rounds of the simulate task"
+    )
+    parser.add_argument(
+        "--bench-threshold",
+        type=float,
+        default=0.2,
+        help="The bench task fails if a helper is slower than its baseline by more than this fraction"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=str_to_bool,
+        nargs="?",
+        const=True,
+        default=False,
+        help="Record the timings of the bench task as the new baseline"
     )
     parser.add_argument(
         "--debug",
@@ -0,0 +1,11 @@
+"""
+Offline tools to run player code without the battlecode25 engine
+load_player loads a player package the way the engine does, World holds a map (a text map from load_map,
+or a random SyntheticMap) and its robots, FakeRC is the controller of one robot, and Match plays two
+players against each other with simplified game rules.
+"""
+
+from .loader import load_player
+from .world import World, SimRobot, SyntheticMap, load_map
+from .fake_rc import FakeRC
+from .match import Match
@@ -0,0 +1,44 @@
+"""
+Plays one match between two players with the offline simulator and prints the result
+Run from the python directory: python -m sim --p1 src/java_bot --p2 src/java_bot, or python run.py simulate
+"""
+
+import time
+import argparse
+from collections import Counter
+from battlecode25.stubs import *
+from . import Match, load_map
+
+DEFAULT_MAP = "sim/maps/Square24.txt"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a match with the offline simulator")
+    parser.add_argument("--p1", type=str, required=True, help="Directory of the player of team A")
+    parser.add_argument("--p2", type=str, required=True, help="Directory of the player of team B")
+    parser.add_argument("--map", type=str, default=DEFAULT_MAP, help="Text map to play on")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random module of the players")
+    parser.add_argument("--rounds", type=int, default=2000, help="Maximum number of rounds")
+    parser.add_argument("--verbose", action="store_true", help="Show what the players print")
+    parser.add_argument("--errors", type=int, default=3, help="Number of robot tracebacks to show")
+    args = parser.parse_args()
+
+    world = load_map(args.map)
+    match = Match(world, args.p1, args.p2, seed=args.seed, max_rounds=args.rounds, quiet=not args.verbose)
+    start = time.perf_counter()
+    winner = match.run()
+    elapsed = time.perf_counter() - start
+
+    outcome = f"{winner.name} wins" if winner is not None else "Draw"
+    print(f"{outcome} after {world.round_num} rounds ({match.turns} turns, {match.turns / elapsed:.0f} turns/s)")
+    for team in (Team.A, Team.B):
+        types = Counter(robot.type.name for robot in world.robots.values() if robot.team == team)
+        print(f"{team.name}: {world.painted_tiles(team)} painted tiles, {world.money[team.value]} money, {dict(types)}")
+    for round_num, robot_id, trace in match.errors[:args.errors]:
+        print(f"Robot {robot_id} exploded in round {round_num}:\n{trace}")
+    if len(match.errors) > args.errors:
+        print(f"{len(match.errors) - args.errors} more robots exploded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+from battlecode25.stubs import *
+from .world import *
+
+
+class FakeRC:
+    """
+    Stand-in for the RobotController of one robot of a World
+    Covers the controller surface the bots use, with the simplified rules of world.py: every robot can
+    move once and act once per round, and there is no bytecode limit.
+    """
+
+    def __init__(self, world, robot):
+        self.world = world
+        self.robot = robot
+        # Offsets of the tiles in vision, closest first
+        radius = int(VISION_RADIUS_SQUARED ** 0.5)
+        self.vision_offsets = sorted(((dx, dy) for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1)
+                                      if dx * dx + dy * dy <= VISION_RADIUS_SQUARED), key=lambda d: d[0] ** 2 + d[1] ** 2)
+
+    def fail(self, exception_type, message):
+        raise GameActionException(exception_type, message)
+
+    # Robot info
+
+    def get_id(self):
+        return self.robot.id
+
+    def get_team(self):
+        return self.robot.team
+
+    def get_type(self):
+        return self.robot.type
+
+    def get_location(self):
+        return self.robot.location
+
+    def get_health(self):
+        return self.robot.health
+
+    def get_paint(self):
+        return self.robot.paint
+
+    def get_money(self):
+        return self.world.money[self.robot.team.value]
+
+    def get_chips(self):
+        return self.get_money()
+
+    def get_round_num(self):
+        return self.world.round_num
+
+    def get_map_width(self):
+        return self.world.width
+
+    def get_map_height(self):
+        return self.world.height
+
+    def get_number_towers(self):
+        return self.world.tower_count(self.robot.team)
+
+    def is_action_ready(self):
+        return self.robot.action_ready
+
+    def is_movement_ready(self):
+        return self.robot.movement_ready
+
+    def get_action_cooldown_turns(self):
+        return 0 if self.robot.action_ready else 10
+
+    def get_movement_cooldown_turns(self):
+        return 0 if self.robot.movement_ready else 10
+
+    def set_indicator_string(self, text):
+        pass
+
+    def set_indicator_dot(self, loc, red, green, blue):
+        pass
+
+    def set_indicator_line(self, start, end, red, green, blue):
+        pass
+
+    def set_timeline_marker(self, text, red, green, blue):
+        pass
+
+    def resign(self):
+        self.world.winner = self.robot.team.opponent()
+
+    # Sensing
+
+    def on_the_map(self, loc):
+        return self.world.on_the_map(loc)
+
+    def can_sense_location(self, loc):
+        return self.world.on_the_map(loc) and self.robot.location.distance_squared_to(loc) <= VISION_RADIUS_SQUARED
+
+    def sense_map_info(self, loc):
+        if not self.can_sense_location(loc):
+            self.fail(GameActionExceptionType.CANT_SENSE_THAT, f"{loc} is out of vision")
+        return self.world.map_info(self.world.index(loc), self.robot.team)
+
+    def sense_nearby_map_infos(self, center=None, radius_squared=VISION_RADIUS_SQUARED):
+        location = self.robot.location
+        center = center if center is not None else location
+        if radius_squared < 0 or radius_squared > VISION_RADIUS_SQUARED:
+            radius_squared = VISION_RADIUS_SQUARED
+        world = self.world
+        infos = []
+        for dx, dy in self.vision_offsets:
+            loc = MapLocation(center.x + dx, center.y + dy)
+            if (dx * dx + dy * dy <= radius_squared and world.on_the_map(loc) and
+                    location.distance_squared_to(loc) <= VISION_RADIUS_SQUARED):
+                infos.append(world.map_info(world.index(loc), self.robot.team))
+        return infos
+
+    def sense_nearby_robots(self, *args):
+        """Accepts (), (radius_squared), (radius_squared, team) and (center, radius_squared, team) like the bots use it"""
+        center = self.robot.location
+        radius_squared = -1
+        team = None
+        if args and isinstance(args[0], MapLocation):
+            center, *args = args
+        if args:
+            radius_squared = args[0]
+        if len(args) > 1:
+            team = args[1]
+        if radius_squared < 0:
+            radius_squared = VISION_RADIUS_SQUARED
+        location = self.robot.location
+        return [robot.info() for robot in self.world.robots.values()
+                if robot is not self.robot and (team is None or robot.team == team) and
+                center.distance_squared_to(robot.location) <= radius_squared and
+                location.distance_squared_to(robot.location) <= VISION_RADIUS_SQUARED]
+
+    def can_sense_robot_at_location(self, loc):
+        return self.can_sense_location(loc) and self.world.index(loc) in self.world.robots
+
+    def sense_robot_at_location(self, loc):
+        if not self.can_sense_location(loc):
+            self.fail(GameActionExceptionType.CANT_SENSE_THAT, f"{loc} is out of vision")
+        robot = self.world.robot_at(loc)
+        return robot.info() if robot is not None else None
+
+    def can_sense_robot(self, robot_id):
+        robot = self.world.robots_by_id.get(robot_id)
+        return robot is not None and self.can_sense_location(robot.location)
+
+    def sense_robot(self, robot_id):
+        if not self.can_sense_robot(robot_id):
+            self.fail(GameActionExceptionType.CANT_SENSE_THAT, f"robot {robot_id} is out of vision")
+        return self.world.robots_by_id[robot_id].info()
+
+    # Movement
+
+    def can_move(self, dir):
+        if not self.robot.movement_ready:
+            return False
+        loc = self.robot.location.add(dir)
+        if not self.world.on_the_map(loc):
+            return False
+        i = self.world.index(loc)
+        return self.world.is_passable(i) and i not in self.world.robots
+
+    def move(self, dir):
+        if not self.can_move(dir):
+            self.fail(GameActionExceptionType.CANT_MOVE_THERE, f"cannot move {dir}")
+        del self.world.robots[self.world.index(self.robot.location)]
+        self.robot.location = self.robot.location.add(dir)
+        self.world.robots[self.world.index(self.robot.location)] = self.robot
+        self.robot.movement_ready = False
+
+    # Painting and attacking
+
+    def can_paint(self, loc):
+        """Tiles can be painted unless they are walls, ruins or painted by the enemy"""
+        if not self.world.on_the_map(loc):
+            return False
+        i = self.world.index(loc)
+        return self.world.is_passable(i) and not self.world.paint_for(i, self.robot.team).is_enemy()
+
+    def can_attack(self, loc):
+        robot = self.robot
+        if not robot.action_ready or not self.world.on_the_map(loc):
+            return False
+        if robot.location.distance_squared_to(loc) > robot.type.action_radius_squared:
+            return False
+        if robot.type.is_tower_type():
+            target = self.world.robot_at(loc)
+            return target is not None and target.team != robot.team
+        return robot.paint >= ATTACK_PAINT_COST[robot.type]
+
+    def attack(self, loc, use_secondary_color=False):
+        if not self.can_attack(loc):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot attack {loc}")
+        robot = self.robot
+        world = self.world
+        robot.action_ready = False
+        paint = PaintType.ALLY_SECONDARY if use_secondary_color else PaintType.ALLY_PRIMARY
+        if robot.type.is_tower_type():
+            world.damage(world.robot_at(loc), TOWER_DAMAGE)
+            return
+        robot.paint -= ATTACK_PAINT_COST[robot.type]
+        if robot.type == UnitType.SOLDIER:
+            target = world.robot_at(loc)
+            if target is not None and target.team != robot.team and target.type.is_tower_type():
+                world.damage(target, ATTACK_DAMAGE[UnitType.SOLDIER])
+            elif self.can_paint(loc):
+                world.set_paint_for(world.index(loc), robot.team, paint)
+        elif robot.type == UnitType.SPLASHER:
+            # Paints everything within 2 of loc, but only takes over enemy paint next to loc
+            for dx in range(-2, 3):
+                for dy in range(-2, 3):
+                    tile = loc.translate(dx, dy)
+                    if dx * dx + dy * dy > 4 or not world.on_the_map(tile):
+                        continue
+                    i = world.index(tile)
+                    target = world.robots.get(i)
+                    if target is not None and target.team != robot.team and target.type.is_tower_type():
+                        world.damage(target, ATTACK_DAMAGE[UnitType.SPLASHER])
+                    elif world.is_passable(i) and (dx * dx + dy * dy <= 2 or not world.paint_for(i, robot.team).is_enemy()):
+                        world.set_paint_for(i, robot.team, paint)
+        else:
+            # Moppers clean enemy paint and drain the paint of enemy robots
+            i = world.index(loc)
+            if world.paint_for(i, robot.team).is_enemy():
+                world.paint[i] = PaintType.EMPTY
+            target = world.robots.get(i)
+            if target is not None and target.team != robot.team and target.type.is_robot_type():
+                stolen = min(target.paint, MOP_PAINT_STEAL)
+                target.paint -= stolen
+                robot.paint = min(robot.type.paint_capacity, robot.paint + stolen // 2)
+
+    def can_mop_swing(self, dir):
+        return self.robot.type == UnitType.MOPPER and self.robot.action_ready and dir in (
+            Direction.NORTH, Direction.SOUTH, Direction.EAST, Direction.WEST)
+
+    def mop_swing(self, dir):
+        if not self.can_mop_swing(dir):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot swing {dir}")
+        self.robot.action_ready = False
+        # The swing covers the 3 tiles in front of the mopper and the 3 behind those
+        front = self.robot.location.add(dir)
+        side = dir.rotate_left().rotate_left()
+        for step in (front, front.add(dir)):
+            for loc in (step.add(side), step, step.subtract(side)):
+                target = self.world.robot_at(loc)
+                if target is not None and target.team != self.robot.team and target.type.is_robot_type():
+                    target.paint = max(0, target.paint - MOP_SWING_PAINT)
+
+    def can_mark(self, loc):
+        return (self.world.on_the_map(loc) and self.robot.location.distance_squared_to(loc) <= MARK_RADIUS_SQUARED and
+                self.world.is_passable(self.world.index(loc)))
+
+    def mark(self, loc, secondary):
+        if not self.can_mark(loc):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot mark {loc}")
+        marks = self.world.marks[self.robot.team.value]
+        marks[self.world.index(loc)] = PaintType.ALLY_SECONDARY if secondary else PaintType.ALLY_PRIMARY
+
+    def can_remove_mark(self, loc):
+        return self.can_mark(loc)
+
+    def remove_mark(self, loc):
+        if not self.can_remove_mark(loc):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot remove the mark at {loc}")
+        self.world.marks[self.robot.team.value][self.world.index(loc)] = PaintType.EMPTY
+
+    # Paint transfers
+
+    def can_transfer_paint(self, loc, amount):
+        robot = self.robot
+        if not robot.action_ready or robot.location.distance_squared_to(loc) > TRANSFER_RADIUS_SQUARED:
+            return False
+        target = self.world.robot_at(loc)
+        if target is None or target is robot or target.team != robot.team:
+            return False
+        if amount >= 0:
+            return amount <= robot.paint and target.paint + amount <= target.type.paint_capacity
+        # Only towers give paint away
+        return target.type.is_tower_type() and -amount <= target.paint and robot.paint - amount <= robot.type.paint_capacity
+
+    def transfer_paint(self, loc, amount):
+        if not self.can_transfer_paint(loc, amount):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot transfer {amount} paint to {loc}")
+        target = self.world.robot_at(loc)
+        self.robot.paint -= amount
+        target.paint += amount
+        self.robot.action_ready = False
+
+    # Building
+
+    def can_build_robot(self, unit_type, loc):
+        robot = self.robot
+        if not robot.type.is_tower_type() or not robot.action_ready or unit_type not in ROBOT_COSTS:
+            return False
+        if not self.world.on_the_map(loc) or robot.location.distance_squared_to(loc) > BUILD_RADIUS_SQUARED:
+            return False
+        i = self.world.index(loc)
+        money, paint = ROBOT_COSTS[unit_type]
+        return (self.world.is_passable(i) and i not in self.world.robots and
+                self.get_money() >= money and robot.paint >= paint)
+
+    def build_robot(self, unit_type, loc):
+        if not self.can_build_robot(unit_type, loc):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot build {unit_type} at {loc}")
+        money, paint = ROBOT_COSTS[unit_type]
+        self.world.money[self.robot.team.value] -= money
+        self.robot.paint -= paint
+        self.robot.action_ready = False
+        self.world.spawn(self.robot.team, unit_type, loc)
+
+    def can_complete_tower_pattern(self, tower_type, loc):
+        world = self.world
+        return (self.robot.type.is_robot_type() and tower_type in TOWER_PATTERNS and world.on_the_map(loc) and
+                self.robot.location.distance_squared_to(loc) <= TOWER_PATTERN_RADIUS_SQUARED and
+                world.ruins[world.index(loc)] and world.robot_at(loc) is None and
+                self.get_money() >= TOWER_MONEY_COST and world.tower_count(self.robot.team) < MAX_TOWERS and
+                world.matches_tower_pattern(loc, self.robot.team, tower_type))
+
+    def complete_tower_pattern(self, tower_type, loc):
+        if not self.can_complete_tower_pattern(tower_type, loc):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot build {tower_type} at {loc}")
+        self.world.money[self.robot.team.value] -= TOWER_MONEY_COST
+        self.world.spawn(self.robot.team, tower_type, loc)
+
+    def can_complete_resource_pattern(self, loc):
+        world = self.world
+        return (self.robot.type.is_robot_type() and world.on_the_map(loc) and
+                self.robot.location.distance_squared_to(loc) <= TOWER_PATTERN_RADIUS_SQUARED and
+                loc not in world.resource_patterns[self.robot.team.value] and
+                world.matches_resource_pattern(loc, self.robot.team))
+
+    def complete_resource_pattern(self, loc):
+        if not self.can_complete_resource_pattern(loc):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot complete a resource pattern at {loc}")
+        self.world.resource_patterns[self.robot.team.value].append(loc)
+
+    def can_upgrade_tower(self, loc):
+        return False
+
+    # Messages
+
+    def can_send_message(self, loc, message_content=None):
+        """Robots send to ally towers and towers to ally robots, within the message radius"""
+        target = self.world.robot_at(loc)
+        return (target is not None and target.team == self.robot.team and
+                target.type.is_tower_type() != self.robot.type.is_tower_type() and
+                self.robot.location.distance_squared_to(loc) <= MESSAGE_RADIUS_SQUARED)
+
+    def send_message(self, loc, message_content):
+        if not self.can_send_message(loc, message_content):
+            self.fail(GameActionExceptionType.CANT_DO_THAT, f"cannot send a message to {loc}")
+        self.world.robot_at(loc).inbox.append(Message(message_content, self.robot.id, self.world.round_num))
+
+    def can_broadcast_message(self):
+        return self.robot.type.is_tower_type()
+
+    def broadcast_message(self, message_content):
+        if not self.can_broadcast_message():
+            self.fail(GameActionExceptionType.CANT_DO_THAT, "only towers broadcast")
+        for robot in self.world.robots.values():
+            if robot.team == self.robot.team and robot.type.is_tower_type() and robot is not self.robot:
+                robot.inbox.append(Message(message_content, self.robot.id, self.world.round_num))
+
+    def read_messages(self, round_num=-1):
+        """Returns the messages received in round_num, or in the last MESSAGE_ROUNDS rounds for -1"""
+        if round_num == -1:
+            oldest = self.world.round_num - MESSAGE_ROUNDS
+            return [message for message in self.robot.inbox if message.get_round() > oldest]
+        return [message for message in self.robot.inbox if message.get_round() == round_num]
@@ -0,0 +1,41 @@
+import builtins
+import types
+from pathlib import Path
+
+
+def load_player(player_dir, entry="bot"):
+    """
+    Load the player package in player_dir and return it as a module.
+    Like the engine, every file of the package runs in one shared namespace, so the globals() of
+    one module are the globals() of all of them. Relative imports load a file into that namespace the
+    first time it is imported, and return the package module itself. Absolute imports are left alone.
+    """
+    player_dir = Path(player_dir)
+    module = types.ModuleType(player_dir.name)
+    namespace = module.__dict__
+    loaded = set()
+
+    def load(name):
+        if name in loaded:
+            return
+        # Mark first, so that circular imports find the (partially loaded) namespace
+        loaded.add(name)
+        path = player_dir / f"{name.replace('.', '/')}.py"
+        exec(compile(path.read_text(), str(path), "exec"), namespace)
+
+    def player_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0:
+            return builtins.__import__(name, globals, locals, fromlist, level)
+        if name:
+            load(name)
+        else:
+            # from . import constants as Constants: the submodule is the shared namespace too
+            for submodule in fromlist:
+                load(submodule)
+                namespace.setdefault(submodule, module)
+        return module
+
+    namespace["__builtins__"] = {**vars(builtins), "__import__": player_import}
+    namespace["__package__"] = player_dir.name
+    load(entry)
+    return module
@@ -0,0 +1,107 @@
+import io
+import random
+import contextlib
+import traceback
+from battlecode25.stubs import *
+from .loader import load_player
+from .fake_rc import FakeRC
+from .world import *
+
+
+class Match:
+    """
+    Plays two players against each other on a World, without the engine
+    Players need a turn(rc) function (and optionally start(rc)) instead of the endless run(rc) loop. A player
+    with a RobotState class is loaded once per team, and every robot gets its own RobotState that is swapped
+    into the shared state before its turn. Other players are loaded again for every robot, like the engine does.
+    """
+
+    def __init__(self, world, player_a, player_b, seed=0, max_rounds=2000, quiet=True):
+        self.world = world
+        self.player_dirs = (player_a, player_b)
+        self.max_rounds = max_rounds
+        self.quiet = quiet
+        # Robots that raised out of their turn, as (round, robot id, traceback)
+        self.errors = []
+        self.turns = 0
+        random.seed(seed)
+        self.players = [load_player(player_dir) for player_dir in self.player_dirs]
+        for player in self.players:
+            if not hasattr(player, "turn"):
+                raise ValueError(f"{player.__name__} has no turn(rc) function, the simulator cannot run it")
+
+    def attach(self, robot):
+        """Gives a newly spawned robot its controller and its own copy of the player state"""
+        player = self.players[robot.team.value]
+        if hasattr(player, "RobotState"):
+            robot.player = player
+            robot.state = player.RobotState()
+        else:
+            robot.player = load_player(self.player_dirs[robot.team.value])
+        robot.rc = FakeRC(self.world, robot)
+
+    def play_turn(self, robot):
+        player = robot.player
+        if robot.state is not None:
+            player.state = robot.state
+        try:
+            if not robot.started:
+                robot.started = True
+                if hasattr(player, "start"):
+                    player.start(robot.rc)
+            player.turn(robot.rc)
+        except Exception:
+            # Uncaught exceptions make the robot explode
+            self.errors.append((self.world.round_num, robot.id, traceback.format_exc()))
+            if robot.alive:
+                self.world.destroy(robot)
+        self.turns += 1
+
+    def step(self):
+        """Plays one round: income, then one turn for every robot in spawn order"""
+        world = self.world
+        world.round_num += 1
+        for team in (Team.A, Team.B):
+            world.money[team.value] += RESOURCE_PATTERN_INCOME * len(world.resource_patterns[team.value])
+        for robot in world.spawn_order:
+            if not robot.alive:
+                continue
+            if robot.type in (UnitType.LEVEL_ONE_MONEY_TOWER, UnitType.LEVEL_TWO_MONEY_TOWER, UnitType.LEVEL_THREE_MONEY_TOWER):
+                world.money[robot.team.value] += MONEY_TOWER_INCOME
+            elif robot.type in (UnitType.LEVEL_ONE_PAINT_TOWER, UnitType.LEVEL_TWO_PAINT_TOWER, UnitType.LEVEL_THREE_PAINT_TOWER):
+                robot.paint += PAINT_TOWER_INCOME
+            robot.action_ready = True
+            robot.movement_ready = robot.type.is_robot_type()
+            # Messages older than read_messages can see are dropped
+            robot.inbox = [message for message in robot.inbox if message.get_round() > world.round_num - MESSAGE_ROUNDS]
+
+        # Robots spawned during the round take their first turn in the next one
+        for robot in list(world.spawn_order):
+            if not robot.alive or world.winner is not None:
+                continue
+            if robot.rc is None:
+                self.attach(robot)
+            self.play_turn(robot)
+        world.spawn_order = [robot for robot in world.spawn_order if robot.alive]
+
+        if world.winner is None:
+            for team in (Team.A, Team.B):
+                if not any(robot.team == team for robot in world.robots.values()):
+                    world.winner = team.opponent()
+
+    def run(self):
+        """
+        Plays until a team wins or max_rounds is reached, then breaks ties on painted tiles and money
+        Returns the winning team, or None for a draw when both teams have as many tiles and as much money.
+        """
+        output = io.StringIO() if self.quiet else None
+        with contextlib.redirect_stdout(output) if self.quiet else contextlib.nullcontext():
+            while self.world.winner is None and self.world.round_num < self.max_rounds:
+                self.step()
+        world = self.world
+        if world.winner is None:
+            score_a = (world.painted_tiles(Team.A), world.money[Team.A.value])
+            score_b = (world.painted_tiles(Team.B), world.money[Team.B.value])
+            if score_a != score_b:
+                world.winner = Team.A if score_a > score_b else Team.B
+        return world.winner
@@ -0,0 +1,299 @@
+import random
+from pathlib import Path
+from battlecode25.stubs import *
+
+# Simplified game rules, close enough to the engine for the bots to play a sensible game
+VISION_RADIUS_SQUARED = 20
+MESSAGE_RADIUS_SQUARED = 20
+MARK_RADIUS_SQUARED = 2
+TRANSFER_RADIUS_SQUARED = 2
+BUILD_RADIUS_SQUARED = 4
+TOWER_PATTERN_RADIUS_SQUARED = 8
+MESSAGE_ROUNDS = 5  # read_messages() returns the messages of the last rounds
+INITIAL_MONEY = 2500
+TOWER_MONEY_COST = 1000
+MAX_TOWERS = 25
+TOWER_START_PAINT = 500
+MONEY_TOWER_INCOME = 20
+PAINT_TOWER_INCOME = 5
+RESOURCE_PATTERN_INCOME = 3
+# money, paint
+ROBOT_COSTS = {
+    UnitType.SOLDIER: (250, 200),
+    UnitType.MOPPER: (300, 100),
+    UnitType.SPLASHER: (400, 300),
+}
+ATTACK_PAINT_COST = {UnitType.SOLDIER: 5, UnitType.SPLASHER: 50, UnitType.MOPPER: 0}
+ATTACK_DAMAGE = {UnitType.SOLDIER: 20, UnitType.SPLASHER: 50}
+TOWER_DAMAGE = 20
+MOP_PAINT_STEAL = 10
+MOP_SWING_PAINT = 5
+
+# The map stores paint from the point of view of team A, team B sees ally and enemy swapped
+SWAP_TEAM = {
+    PaintType.EMPTY: PaintType.EMPTY,
+    PaintType.ALLY_PRIMARY: PaintType.ENEMY_PRIMARY,
+    PaintType.ALLY_SECONDARY: PaintType.ENEMY_SECONDARY,
+    PaintType.ENEMY_PRIMARY: PaintType.ALLY_PRIMARY,
+    PaintType.ENEMY_SECONDARY: PaintType.ALLY_SECONDARY
+}
+PAINT_CHOICES = (PaintType.EMPTY, PaintType.EMPTY, PaintType.ALLY_PRIMARY, PaintType.ALLY_SECONDARY,
+                 PaintType.ENEMY_PRIMARY, PaintType.ENEMY_SECONDARY)
+MOBILE_TYPES = (UnitType.SOLDIER, UnitType.SOLDIER, UnitType.MOPPER, UnitType.SPLASHER)
+
+# Tile characters of the text map format, see World.from_text
+TOWER_CHARS = {
+    'P': (Team.A, UnitType.LEVEL_ONE_PAINT_TOWER), 'p': (Team.B, UnitType.LEVEL_ONE_PAINT_TOWER),
+    'M': (Team.A, UnitType.LEVEL_ONE_MONEY_TOWER), 'm': (Team.B, UnitType.LEVEL_ONE_MONEY_TOWER),
+    'D': (Team.A, UnitType.LEVEL_ONE_DEFENSE_TOWER), 'd': (Team.B, UnitType.LEVEL_ONE_DEFENSE_TOWER),
+}
+PAINT_CHARS = {'+': PaintType.ALLY_PRIMARY, '-': PaintType.ENEMY_PRIMARY}
+
+# Offsets of the primary paint of a resource pattern, the other tiles of the 5x5 take secondary paint
+RESOURCE_PATTERN_PRIMARY = {(0, -2), (-1, -1), (0, -1), (1, -1), (-2, 0), (-1, 0), (1, 0), (2, 0),
+                            (-1, 1), (0, 1), (1, 1), (0, 2)}
+# Tower patterns as pattern[dx + 2][dy + 2], True for primary paint
+TOWER_PATTERNS = {
+    UnitType.LEVEL_ONE_PAINT_TOWER: ("SPPPS", "PSPSP", "PP.PP", "PSPSP", "SPPPS"),
+    UnitType.LEVEL_ONE_MONEY_TOWER: ("PSSSP", "SSPSS", "SP.PS", "SSPSS", "PSSSP"),
+    UnitType.LEVEL_ONE_DEFENSE_TOWER: ("PPSPP", "PSSSP", "SS.SS", "PSSSP", "PPSPP"),
+}
+
+
+class SimRobot:
+    """A robot or tower of the simulated world"""
+    __slots__ = ('id', 'team', 'type', 'location', 'health', 'paint', 'action_ready', 'movement_ready',
+                 'alive', 'started', 'inbox', 'player', 'state', 'rc')
+
+    def __init__(self, robot_id, team, unit_type, location, paint=None):
+        self.id = robot_id
+        self.team = team
+        self.type = unit_type
+        self.location = location
+        self.health = unit_type.health
+        self.paint = paint if paint is not None else unit_type.paint_capacity
+        self.action_ready = True
+        self.movement_ready = unit_type.is_robot_type()
+        self.alive = True
+        self.started = False
+        self.inbox = []
+        # Set by the match that controls the robot
+        self.player = None
+        self.state = None
+        self.rc = None
+
+    def info(self):
+        return RobotInfo(self.id, self.team, self.type, self.health, self.location, self.paint)
+
+
+class World:
+    """
+    Map and robots of a simulated game
+    Tiles are stored at index x * height + y, like the world map of java_bot.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.walls = [False] * size
+        self.ruins = [False] * size
+        self.paint = [PaintType.EMPTY] * size
+        # Marks are private to each team, indexed by Team value
+        self.marks = ([PaintType.EMPTY] * size, [PaintType.EMPTY] * size)
+        self.resource_patterns = ([], [])
+        self.money = [INITIAL_MONEY, INITIAL_MONEY]
+        self.robots = {}  # tile index -> SimRobot
+        self.robots_by_id = {}
+        self.spawn_order = []
+        self.next_id = 1
+        self.round_num = 0
+        self.winner = None
+
+    @staticmethod
+    def from_text(text):
+        """
+        Builds a world from a text map, one character per tile and one line per row, the top line is the highest y
+        . empty   # wall   R ruin   + team A paint   - team B paint
+        P/p, M/m, D/d paint, money and defense tower of team A/B, standing on a ruin
+        Lines starting with // are comments.
+        """
+        rows = [line.rstrip("\n") for line in text.splitlines() if line.strip() and not line.startswith("//")]
+        height = len(rows)
+        width = max(len(row) for row in rows)
+        world = World(width, height)
+        for row_num, row in enumerate(rows):
+            y = height - 1 - row_num
+            for x, char in enumerate(row.ljust(width, ".")):
+                i = x * height + y
+                if char == "#":
+                    world.walls[i] = True
+                elif char == "R":
+                    world.ruins[i] = True
+                elif char in PAINT_CHARS:
+                    world.paint[i] = PAINT_CHARS[char]
+                elif char in TOWER_CHARS:
+                    world.ruins[i] = True
+                    team, unit_type = TOWER_CHARS[char]
+                    world.spawn(team, unit_type, world.location(i))
+                elif char != ".":
+                    raise ValueError(f"Unknown tile '{char}' at line {row_num + 1}, column {x + 1}")
+        return world
+
+    # Tiles
+
+    def location(self, i):
+        return MapLocation(i // self.height, i % self.height)
+
+    def index(self, loc):
+        return loc.x * self.height + loc.y
+
+    def on_the_map(self, loc):
+        return 0 <= loc.x < self.width and 0 <= loc.y < self.height
+
+    def is_passable(self, i):
+        return not self.walls[i] and not self.ruins[i]
+
+    def paint_for(self, i, team):
+        """Returns the paint of tile i from the point of view of team"""
+        return self.paint[i] if team == Team.A else SWAP_TEAM[self.paint[i]]
+
+    def set_paint_for(self, i, team, paint):
+        self.paint[i] = paint if team == Team.A else SWAP_TEAM[paint]
+
+    def map_info(self, i, team):
+        return MapInfo(self.location(i), self.is_passable(i), self.walls[i], self.paint_for(i, team),
+                       self.marks[team.value][i], self.ruins[i], self.location(i) in self.resource_patterns[team.value])
+
+    def find_location(self, near, blocked_towards=None):
+        """
+        Returns the free tile closest to near
+        With blocked_towards, only tiles whose next step towards that location is a wall count, if there are any
+        """
+        best = None
+        best_distance = None
+        for i in range(self.width * self.height):
+            if not self.is_passable(i) or i in self.robots:
+                continue
+            loc = self.location(i)
+            if blocked_towards is not None:
+                step = loc.add(loc.direction_to(blocked_towards))
+                if not self.on_the_map(step) or not self.walls[self.index(step)]:
+                    continue
+            distance = loc.distance_squared_to(near)
+            if best is None or distance < best_distance:
+                best = loc
+                best_distance = distance
+        if best is None and blocked_towards is not None:
+            return self.find_location(near)
+        return best
+
+    # Robots
+
+    def spawn(self, team, unit_type, loc):
+        """Adds a robot of team at loc, it takes its first turn in the next round"""
+        paint = TOWER_START_PAINT if unit_type.is_tower_type() else None
+        robot = SimRobot(self.next_id, team, unit_type, loc, paint)
+        self.next_id += 1
+        self.robots[self.index(loc)] = robot
+        self.robots_by_id[robot.id] = robot
+        self.spawn_order.append(robot)
+        return robot
+
+    def robot_at(self, loc):
+        return self.robots.get(self.index(loc)) if self.on_the_map(loc) else None
+
+    def damage(self, robot, amount):
+        """Removes health from robot and destroys it once it has none left"""
+        robot.health -= amount
+        if robot.health <= 0:
+            self.destroy(robot)
+
+    def destroy(self, robot):
+        robot.alive = False
+        del self.robots[self.index(robot.location)]
+        del self.robots_by_id[robot.id]
+
+    def tower_count(self, team):
+        return sum(1 for robot in self.robots.values() if robot.team == team and robot.type.is_tower_type())
+
+    def matches_tower_pattern(self, ruin, team, tower_type):
+        """Returns True if the 5x5 area around the ruin is painted in the pattern of tower_type"""
+        pattern = TOWER_PATTERNS[tower_type]
+        return self.matches_pattern(ruin, team, lambda dx, dy: pattern[dx + 2][dy + 2] == "P", skip_center=True)
+
+    def matches_resource_pattern(self, center, team):
+        return self.matches_pattern(center, team, lambda dx, dy: (dx, dy) in RESOURCE_PATTERN_PRIMARY)
+
+    def matches_pattern(self, center, team, is_primary, skip_center=False):
+        for dx in range(-2, 3):
+            for dy in range(-2, 3):
+                if skip_center and dx == 0 and dy == 0:
+                    continue
+                loc = center.translate(dx, dy)
+                if not self.on_the_map(loc):
+                    return False
+                expected = PaintType.ALLY_PRIMARY if is_primary(dx, dy) else PaintType.ALLY_SECONDARY
+                if self.paint_for(self.index(loc), team) != expected:
+                    return False
+        return True
+
+    def painted_tiles(self, team):
+        return sum(1 for i in range(len(self.paint)) if self.paint_for(i, team).is_ally())
+
+
+class SyntheticMap(World):
+    """
+    Random rotationally symmetric world with walls, ruins, paint and robots, the same for the same size and seed
+    """
+
+    def __init__(self, width, height, seed=0):
+        super().__init__(width, height)
+        rng = random.Random(f"{width}x{height}/{seed}")
+        size = width * height
+
+        # Short wall segments, generated on one half and mirrored
+        for _ in range(size // 60):
+            x = rng.randrange(width)
+            y = rng.randrange(height)
+            dx, dy = rng.choice(((1, 0), (0, 1)))
+            for step in range(rng.randint(2, 6)):
+                if x + dx * step < width and y + dy * step < height:
+                    self.set_symmetric(self.walls, (x + dx * step) * height + y + dy * step, True)
+
+        # Ruins need the 5x5 area around them free of walls to be buildable
+        for _ in range(max(2, size // 200)):
+            x = rng.randrange(2, width - 2)
+            y = rng.randrange(2, height - 2)
+            for i in range(x - 2, x + 3):
+                for j in range(y - 2, y + 3):
+                    self.set_symmetric(self.walls, i * height + j, False)
+            self.set_symmetric(self.ruins, x * height + y, True)
+
+        for i in range(size):
+            if not self.walls[i] and not self.ruins[i] and i < self.mirror(i):
+                self.paint[i] = rng.choice(PAINT_CHOICES)
+                self.paint[self.mirror(i)] = SWAP_TEAM[self.paint[i]]
+
+        # Towers on half of the ruins, and a few robots of both teams on free tiles
+        for i in range(size):
+            if self.ruins[i] and rng.random() < 0.5:
+                self.spawn(Team.A if i < self.mirror(i) else Team.B, UnitType.LEVEL_ONE_PAINT_TOWER, self.location(i))
+        for _ in range(size // 100):
+            i = rng.randrange(size)
+            if self.is_passable(i) and i not in self.robots:
+                robot = self.spawn(rng.choice((Team.A, Team.B)), rng.choice(MOBILE_TYPES), self.location(i))
+                robot.paint //= 2
+
+    def mirror(self, i):
+        """Returns the index of the rotational mirror of tile i"""
+        return self.width * self.height - 1 - i
+
+    def set_symmetric(self, grid, i, value):
+        grid[i] = value
+        grid[self.mirror(i)] = value
+
+
+def load_map(path):
+    """Loads a text map, see World.from_text"""
+    return World.from_text(Path(path).read_text())
@@ -1,3 +1,5 @@
+import heapq
+
 from battlecode25.stubs import *
 
 directions = [
@@ -45,3 +47,47 @@ def greedy_best_first(start, goal, walls_set, occupied_set):
         current = best_neighbor
 
     return path
+
+def a_star(start, goal, walls_set, occupied_set, max_nodes=500):
+    # Real A*: every move costs 1 and Chebyshev distance never overestimates it
+    counter = 0  # tie breaker so the heap never compares MapLocations
+    open_heap = [(heuristic(start, goal), counter, start)]
+    came_from = {start: None}
+    cost = {start: 0}
+    best = start
+    best_h = heuristic(start, goal)
+    expanded = 0
+
+    while open_heap and expanded < max_nodes:
+        _, _, current = heapq.heappop(open_heap)
+        if current == goal:
+            best = current
+            break
+        expanded += 1
+
+        for d in directions:
+            neighbor = current.add(d)
+
+            if (not on_the_map(neighbor) or
+                neighbor in walls_set or
+                neighbor in occupied_set):
+                continue
+
+            new_cost = cost[current] + 1
+            if neighbor not in cost or new_cost < cost[neighbor]:
+                cost[neighbor] = new_cost
+                came_from[neighbor] = current
+                h = heuristic(neighbor, goal)
+                if h < best_h:
+                    best_h = h
+                    best = neighbor
+                counter += 1
+                heapq.heappush(open_heap, (new_cost + h, counter, neighbor))
+
+    # Walk back from the goal, or from the closest tile reached if the goal was not found in time
+    path = []
+    while best != start:
+        path.append(best)
+        best = came_from[best]
+    path.reverse()
+    return path
@@ -1,6 +1,8 @@
 from battlecode25.stubs import *
 from .robot_info_codec import RobotInfoCodec
 from .map_info_codec import MapInfoCodec
+from .message_frame import MessageFrame
+from .state import state
 
 class Communication:
     @staticmethod
@@ -19,7 +21,67 @@ class Communication:
         if rc.can_send_message(target_loc, encoded_info):
             rc.send_message(target_loc, encoded_info)
 
+    @staticmethod
+    def send_tile_reports(rc, tiles, target_loc):
+        """
+        Sends a list of MapInfo to targetLoc, packed into as few frames as possible
+        Returns the number of tiles that were sent, frames are sent in order until the message limit is hit
+        """
+        sent = 0
+        for msg, count in MessageFrame.pack_tiles(tiles):
+            if not rc.can_send_message(target_loc, msg):
+                break
+            rc.send_message(target_loc, msg)
+            sent += count
+        return sent
+
+    @staticmethod
+    def send_home(rc, target_loc):
+        """Tells the robot or tower at targetLoc where our initial tower is, returns True if the message went out"""
+        msg = MessageFrame.pack_home(state.home_location)
+        if rc.can_send_message(target_loc, msg):
+            rc.send_message(target_loc, msg)
+            return True
+        return False
+
+    @staticmethod
+    def read_home(msg):
+        """Stores the location of a home frame as our base and returns True, returns False for any other message"""
+        if MessageFrame.is_frame(msg) and MessageFrame.frame_type(msg) == MessageFrame.HOME:
+            state.home_location = MessageFrame.unpack_home(msg)
+            return True
+        return False
+
+    @staticmethod
+    def decode_map_reports(msg):
+        """Returns the list of MapInfo held by a message, which is a single MapInfo or a tile frame"""
+        if MessageFrame.is_frame(msg):
+            if MessageFrame.frame_type(msg) == MessageFrame.TILES:
+                return MessageFrame.unpack(msg)
+            return []
+        if Communication.is_robot_info(msg):
+            return []
+        return [MapInfoCodec.decode(msg)]
+
+    @staticmethod
+    def decode_map_batch(messages):
+        """
+        Decodes a whole read_messages batch into (sender id, list of MapInfo) pairs, skipping messages without tile reports
+        Identical messages, e.g. several robots reporting the same tile, are decoded once and share their MapInfo
+        """
+        decoded = {}
+        batch = []
+        for message in messages:
+            msg = message.get_bytes()
+            reports = decoded.get(msg)
+            if reports is None:
+                reports = Communication.decode_map_reports(msg)
+                decoded[msg] = reports
+            if reports:
+                batch.append((message.get_sender_id(), reports))
+        return batch
+
     @staticmethod
     def is_robot_info(msg):
         """Checks to see if input message is a robot info or map info"""
-        return msg >> 21 > 0
+        return not MessageFrame.is_frame(msg) and msg >> 21 > 0
@@ -1,6 +1,5 @@
 import random
 from battlecode25.stubs import *
-from .hashable_coords import HashableCoords
 
 # Directions
 directions = [
@@ -47,14 +46,32 @@ MIN_PAINT_GIVE = 50
 SRP_MAP_WIDTH = 95
 SRP_MAP_HEIGHT = 95
 
-# Primary SRP coordinates
-primary_srp = {
-    HashableCoords(2, 0),
-    HashableCoords(1, 1), HashableCoords(2, 1), HashableCoords(3, 1),
-    HashableCoords(0, 2), HashableCoords(1, 2), HashableCoords(3, 2),
-    HashableCoords(1, 3), HashableCoords(2, 3), HashableCoords(3, 3),
-    HashableCoords(2, 4), HashableCoords(4, 2)
-}
+ASTAR_NODE_LIMIT = 400  # max nodes an A* search expands before settling for the closest node found
+DISTANCE_FIELD_CACHE_SIZE = 4  # number of BFS distance fields kept in memory
+
+SCHEDULER_RESERVE = 1500  # bytecodes kept free at the end of a turn when running optional tasks
+SCHEDULER_STEPS_PER_TURN = 64  # optional task steps per turn when the engine has no bytecode counter
+
+PROFILE = False  # record the cost of every subsystem call, see profiler.py
+PROFILE_DUMP_ROUND = 1999  # round on which each robot prints its final profile (last round of the match)
+PROFILE_CHECKPOINT_ROUNDS = 250  # robots also print their profile so far every this many rounds
+PROFILE_MAX_STACKS = 40  # number of call stacks printed in the profile
+
+# Primary SRP coordinates, as offsets within the 5x5 pattern
+primary_srp = (
+    (2, 0),
+    (1, 1), (2, 1), (3, 1),
+    (0, 2), (1, 2), (3, 2),
+    (1, 3), (2, 3), (3, 3),
+    (2, 4), (4, 2)
+)
+
+# The map is predivided into 4x4 grids, primary_srp_grid[(x % 4) * 4 + y % 4] is True if (x, y) takes primary paint
+primary_srp_grid = tuple((x, y) in primary_srp for x in range(4) for y in range(4))
+srp_paint_grid = tuple(PaintType.ALLY_PRIMARY if primary else PaintType.ALLY_SECONDARY for primary in primary_srp_grid)
+
+# primary_srp_pattern[i * 5 + j] is True if offset (i, j) of the 5x5 SRP takes primary paint
+primary_srp_pattern = tuple((i, j) in primary_srp for i in range(5) for j in range(5))
 
 # Tower patterns
 paint_tower_pattern = [
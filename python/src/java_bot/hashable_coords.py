@@ -1,5 +1,14 @@
+from battlecode25.stubs import *
+
 class HashableCoords:
-    """A hashable version of MapLocation"""
+    """
+    A hashable version of MapLocation
+    For sets and dicts prefer the int key of a location (x << 6 | y), which hashes and compares without
+    allocating, and location(key) to get back the single interned MapLocation of that key.
+    """
+    # Interned MapLocation per key, created on first use. Maps are at most 60x60, so a key fits in 12 bits
+    locations = [None] * (1 << 12)
+
     def __init__(self, x: int, y: int):
         self.x = x
         self.y = y
@@ -11,3 +20,17 @@ class HashableCoords:
 
     def __hash__(self):
         return 31 * self.x + self.y
+
+    @staticmethod
+    def key(loc):
+        """Returns the int key of a MapLocation"""
+        return loc.x << 6 | loc.y
+
+    @staticmethod
+    def location(key):
+        """Returns the interned MapLocation of an int key"""
+        loc = HashableCoords.locations[key]
+        if loc is None:
+            loc = MapLocation(key >> 6, key & 0b111111)
+            HashableCoords.locations[key] = loc
+        return loc
@@ -1,11 +1,14 @@
 from battlecode25.stubs import *
+from .hashable_coords import HashableCoords
+from .world_map import PAINT_BY_VALUE
 
 class MapInfoCodec:
     """
     MapInfoCodec encodes and decodes a MapInfo to/from an int so that it can be sent in a message.
     Coding uses the bottom 21 of the available 32 bits: ________ ___Rmmmp ppWPyyyy yyxxxxxx
+    Besides full decoding, the view methods (x, y, location, is_passable, ...) read a single field
+    straight from the int, so a message can be filtered before any object is built.
     """
-    
     @staticmethod
     def encode(map_info):
         """
@@ -29,17 +32,50 @@ class MapInfoCodec:
     def decode(i):
         """
         Decode the given integer into a MapInfo.
-        Approx 62 bytecode.
+        Builds the MapInfo only, the location and the paint types come from tables.
         """
-        mask = (1 << 6) - 1
-        x = i & mask
-        y = (i >> 6) & mask
-        is_passable = (i & (1 << 12)) != 0
-        is_wall = (i & (1 << 13)) != 0
-        paint = PaintType(((i >> 14) & ((1 << 3) - 1)))
-        mark = PaintType(((i >> 17) & ((1 << 3) - 1)))
-        has_ruin = (i & (1 << 20)) != 0
-        return MapInfo(MapLocation(x, y), is_passable, is_wall, paint, mark, has_ruin, False)
+        return MapInfo(MapInfoCodec.location(i), (i & (1 << 12)) != 0, (i & (1 << 13)) != 0,
+                       PAINT_BY_VALUE[(i >> 14) & 0b111], PAINT_BY_VALUE[(i >> 17) & 0b111], (i & (1 << 20)) != 0, False)
+
+    @staticmethod
+    def x(i):
+        """Returns the x coordinate of the message"""
+        return i & 0b111111
+
+    @staticmethod
+    def y(i):
+        """Returns the y coordinate of the message"""
+        return (i >> 6) & 0b111111
+
+    @staticmethod
+    def location(i):
+        """Returns the interned MapLocation of the message"""
+        return HashableCoords.location((i & 0b111111) << 6 | (i >> 6) & 0b111111)
+
+    @staticmethod
+    def is_passable(i):
+        """Returns True if the message reports a passable tile"""
+        return (i & (1 << 12)) != 0
+
+    @staticmethod
+    def is_wall(i):
+        """Returns True if the message reports a wall"""
+        return (i & (1 << 13)) != 0
+
+    @staticmethod
+    def paint(i):
+        """Returns the PaintType of the message"""
+        return PAINT_BY_VALUE[(i >> 14) & 0b111]
+
+    @staticmethod
+    def mark(i):
+        """Returns the mark of the message"""
+        return PAINT_BY_VALUE[(i >> 17) & 0b111]
+
+    @staticmethod
+    def has_ruin(i):
+        """Returns True if the message reports a ruin"""
+        return (i & (1 << 20)) != 0
 
     @staticmethod
     def equals(a, b):
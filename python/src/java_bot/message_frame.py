@@ -0,0 +1,107 @@
+from battlecode25.stubs import *
+from .hashable_coords import HashableCoords
+
+class MessageFrame:
+    """
+    MessageFrame packs several tile reports into one message, so that one trip to a tower delivers them all.
+    Coding uses all 32 bits: 1TTCCddd dddddddd dddddddd dddddddd
+    The top bit marks a frame (MapInfoCodec, RobotInfoCodec and robot type messages never set it), TT is the
+    type tag, CC is the number of reports minus one and d holds the reports, first report in the lowest bits.
+    The first report has absolute coordinates, every following report stores its coordinates as a delta
+    from the previous report, with dx and dy in [-4, 3].
+    Tile reports:  xxxxxx yyyyyy k, then dx dy k (3 + 3 + 1 bits), up to 3 reports. k = 1 for an enemy tower
+    Home reports:  xxxxxx yyyyyy, a single report of the location of the team's initial tower
+    """
+    TILES = 0
+    HOME = 1
+    MAX_TILES = 3
+
+    @staticmethod
+    def to_message(value):
+        """Converts an unsigned 32 bit frame into the signed int that a message holds"""
+        return value - (1 << 32) if value >= 1 << 31 else value
+
+    @staticmethod
+    def is_frame(msg):
+        """Checks to see if the message is a frame, whether the engine hands it back signed or unsigned"""
+        return (msg & 0xFFFFFFFF) >> 31 == 1
+
+    @staticmethod
+    def frame_type(msg):
+        """Returns the type tag of a frame"""
+        return (msg & 0xFFFFFFFF) >> 29 & 0b11
+
+    @staticmethod
+    def fits(prev_loc, loc):
+        """Returns True if loc can follow prev_loc in the same frame"""
+        dx = loc.x - prev_loc.x
+        dy = loc.y - prev_loc.y
+        return -4 <= dx <= 3 and -4 <= dy <= 3
+
+    @staticmethod
+    def pack_tiles(tiles):
+        """
+        Encodes a list of MapInfo (enemy paint or enemy towers) into frames, keeping their order
+        Returns a list of [message, number of tiles in it]
+        """
+        frames = []
+        value = count = shift = 0
+        prev_loc = None
+        for tile in tiles:
+            loc = tile.get_map_location()
+            kind = 1 if tile.has_ruin() else 0
+            if count == 0 or count == MessageFrame.MAX_TILES or not MessageFrame.fits(prev_loc, loc):
+                if count:
+                    frames.append([MessageFrame.pack_header(MessageFrame.TILES, count, value), count])
+                value = loc.x | loc.y << 6 | kind << 12
+                count = 1
+                shift = 13
+            else:
+                value |= ((loc.x - prev_loc.x) & 0b111 | ((loc.y - prev_loc.y) & 0b111) << 3 | kind << 6) << shift
+                count += 1
+                shift += 7
+            prev_loc = loc
+        if count:
+            frames.append([MessageFrame.pack_header(MessageFrame.TILES, count, value), count])
+        return frames
+
+    @staticmethod
+    def pack_home(loc):
+        """Encodes the location of the team's initial tower into a home frame"""
+        return MessageFrame.pack_header(MessageFrame.HOME, 1, loc.x | loc.y << 6)
+
+    @staticmethod
+    def unpack_home(msg):
+        """Decodes a home frame into the location it reports"""
+        return HashableCoords.location((msg & 0b111111) << 6 | msg >> 6 & 0b111111)
+
+    @staticmethod
+    def pack_header(frame_type, count, value):
+        """Adds the frame marker, type tag and report count to the packed reports"""
+        return MessageFrame.to_message(1 << 31 | frame_type << 29 | (count - 1) << 27 | value)
+
+    @staticmethod
+    def delta(bits):
+        """Sign extends a 3 bit delta"""
+        return bits - 8 if bits >= 4 else bits
+
+    @staticmethod
+    def unpack(msg):
+        """Decodes a tile frame into the list of MapInfo it reports"""
+        msg &= 0xFFFFFFFF
+        count = (msg >> 27 & 0b11) + 1
+        x = msg & 0b111111
+        y = msg >> 6 & 0b111111
+        kind = msg >> 12 & 1
+        shift = 13
+        reports = []
+        for i in range(count):
+            if i:
+                entry = msg >> shift
+                x += MessageFrame.delta(entry & 0b111)
+                y += MessageFrame.delta(entry >> 3 & 0b111)
+                kind = entry >> 6 & 1
+                shift += 7
+            paint = PaintType.EMPTY if kind else PaintType.ENEMY_PRIMARY
+            reports.append(MapInfo(HashableCoords.location(x << 6 | y), not kind, False, paint, PaintType.EMPTY, kind == 1, False))
+        return reports
@@ -1,9 +1,8 @@
 from battlecode25.stubs import *
 from .tower import Tower
 from .communication import Communication
-from .robot_info_codec import RobotInfoCodec
-from .map_info_codec import MapInfoCodec
 from .sensing import Sensing
+from .state import state
 
 class MoneyTower(Tower):
     """Class for money tower specific functionality"""
@@ -11,26 +10,35 @@ class MoneyTower(Tower):
     @staticmethod
     def read_new_messages(rc):
         """Reads new messages and does stuff"""
-        # Looks at all incoming messages
-        for message in rc.read_messages(rc.get_round_num() - 1):
-            bytes_msg = message.get_bytes()
-            if Communication.is_robot_info(bytes_msg):
-                msg = RobotInfoCodec.decode(bytes_msg)
-            else:
-                msg = MapInfoCodec.decode(bytes_msg)
-                # Check if message is enemy tower
-                if msg.has_ruin():
-                    globals()['rounds_without_enemy'] = 0
-                    globals()['alert_robots'] = True
-                    globals()['enemy_target'] = msg
-                    globals()['enemy_tower'] = msg
-                # Check if message is enemy paint
-                elif msg.get_paint().is_enemy():
-                    globals()['rounds_without_enemy'] = 0
-                    if Sensing.is_robot(rc, message.get_sender_id()):
-                        globals()['broadcast'] = True
-                        globals()['num_enemy_visits'] += 1  # Increases probability of spawning a splasher
-                    # If tower receives message from tower, just alert the surrounding bots
-                    globals()['alert_robots'] = True
-                    # Update enemy tile regardless
-                    globals()['enemy_target'] = msg
+        # Looks at all incoming messages, a single message can hold several tile reports
+        messages = rc.read_messages(rc.get_round_num() - 1)
+        for message in messages:
+            Communication.read_home(message.get_bytes())
+        for sender_id, reports in Communication.decode_map_batch(messages):
+            MoneyTower.handle_map_reports(rc, reports, sender_id)
+
+    @staticmethod
+    def handle_map_reports(rc, reports, sender_id):
+        """Updates the enemy targets from the tile reports of one message, money towers never spawn in response"""
+        found_tower = False
+        found_paint = False
+        for msg in reports:
+            # Check if message is enemy tower
+            if msg.has_ruin():
+                found_tower = True
+                state.enemy_target = msg
+                state.enemy_tower = msg
+            # Check if message is enemy paint
+            elif msg.get_paint().is_enemy():
+                found_paint = True
+                if not found_tower:
+                    state.enemy_target = msg
+
+        if not found_tower and not found_paint:
+            return
+        state.rounds_without_enemy = 0
+        # If tower receives message from tower, just alert the surrounding bots
+        state.alert_robots = True
+        if found_paint and Sensing.is_robot(rc, sender_id):
+            state.broadcast = True
+            state.num_enemy_visits += 1  # Increases probability of spawning a splasher
@@ -1,9 +1,11 @@
 from battlecode25.stubs import *
 from .robot import Robot
 from .communication import Communication
-from .robot_info_codec import RobotInfoCodec
 from .map_info_codec import MapInfoCodec
 from .pathfinding import Pathfinding
+from .world_map import WorldMap
+from .hashable_coords import HashableCoords
+from .state import state
 import random
 
 class Mopper(Robot):
@@ -14,28 +16,31 @@ class Mopper(Robot):
         """Process the last received message for the mopper"""
         for msg in rc.read_messages(-1):
             bytes = msg.get_bytes()
+            if Communication.read_home(bytes):
+                continue
             # Receives what type of mopper the bot is
             if bytes == 3:
                 continue
                 
+            # Robot reports are not used, and tiles are only decoded if they are worth chasing
             if Communication.is_robot_info(bytes):
-                message = RobotInfoCodec.decode(bytes)
-            else:
+                continue
+            if MapInfoCodec.paint(bytes).is_enemy() or MapInfoCodec.has_ruin(bytes):
                 message = MapInfoCodec.decode(bytes)
                 if message.get_paint().is_enemy():
                     robot_loc = rc.get_location()
-                    if (globals()['remove_paint'] is None or 
+                    if (state.remove_paint is None or 
                         robot_loc.distance_squared_to(message.get_map_location()) < 
-                        robot_loc.distance_squared_to(globals()['remove_paint'].get_map_location())):
-                        globals()['remove_paint'] = message
+                        robot_loc.distance_squared_to(state.remove_paint.get_map_location())):
+                        state.remove_paint = message
                         Robot.reset_variables()
                 # If enemy tower, then go to enemy tower location
                 elif message.has_ruin():
                     robot_loc = rc.get_location()
-                    if (globals()['remove_paint'] is None or 
+                    if (state.remove_paint is None or 
                         robot_loc.distance_squared_to(message.get_map_location()) < 
-                        robot_loc.distance_squared_to(globals()['remove_paint'].get_map_location())):
-                        globals()['remove_paint'] = message
+                        robot_loc.distance_squared_to(state.remove_paint.get_map_location())):
+                        state.remove_paint = message
                         Robot.reset_variables()
 
     @staticmethod
@@ -44,7 +49,8 @@ class Mopper(Robot):
         enemy_loc = enemy_paint.get_map_location()
         if rc.can_attack(enemy_loc) and enemy_paint.get_paint().is_enemy():
             rc.attack(enemy_loc)
-            globals()['remove_paint'] = None
+            WorldMap.invalidate()
+            state.remove_paint = None
             Robot.reset_variables()
         else:
             move_dir = Pathfinding.pathfind(rc, enemy_loc)
@@ -54,7 +60,7 @@ class Mopper(Robot):
     @staticmethod
     def mopper_scoring(rc):
         """Score nearby tiles for mopper movement"""
-        nearby_tiles = rc.sense_nearby_map_infos()
+        nearby_tiles = WorldMap.refresh(rc)
         best = None
         best_score = float('-inf')
         for map_info in nearby_tiles:
@@ -123,8 +129,8 @@ class Mopper(Robot):
     def mopper_walk(rc):
         """Random walk for mopper on safe tiles"""
         safe = []
-        for map_info in rc.sense_nearby_map_infos(2):
-            if map_info.get_paint().is_ally() and map_info.get_map_location() not in globals()['last8']:
+        for map_info in WorldMap.tiles_within(rc, rc.get_location(), 2):
+            if map_info.get_paint().is_ally() and HashableCoords.key(map_info.get_map_location()) not in state.last8:
                 safe.append(map_info)
                 
         if not safe:
@@ -0,0 +1,315 @@
+from battlecode25.stubs import *
+from .constants import *
+from .world_map import *
+from .state import state
+from collections import deque
+from array import array
+import heapq
+
+class PathPlanner:
+    """
+    A* and BFS distance fields over the world map
+    Tiles that have never been seen are assumed to be passable, so plans are optimistic. The world map logs
+    every tile that becomes blocked or passable in wall_changes, and plans only pay for the changes that
+    touch them: A* paths are redone when a new wall lands on the path, and distance fields are repaired
+    around the changed tiles instead of being recomputed.
+    """
+    # Offsets of the 8 neighbours of a tile
+    neighbours = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+    @staticmethod
+    def a_star(start, target):
+        """
+        Returns the list of MapLocations leading from start (excluded) to target (included)
+        Every move costs 1 and the heuristic is the Chebyshev distance, so the path is a shortest path on the known map.
+        If the search runs out of nodes the path to the node closest to target is returned, and None if there is no move at all
+        """
+        width = state.map_width
+        height = state.map_height
+        tiles = state.map_tiles
+        start_index = start.x * height + start.y
+        tx = target.x
+        ty = target.y
+        # An off-map target has no index, so the search ends at the reachable tile closest to it
+        target_index = tx * height + ty if 0 <= tx < width and 0 <= ty < height else -1
+
+        came_from = {start_index: -1}
+        cost = {start_index: 0}
+        heap = [(max(abs(start.x - tx), abs(start.y - ty)), 0, start_index)]
+        best_index = start_index
+        best_h = heap[0][0]
+        expansions = 0
+        while heap and expansions < ASTAR_NODE_LIMIT:
+            _, g, index = heapq.heappop(heap)
+            if index == target_index:
+                best_index = index
+                break
+            if g > cost[index]:
+                continue
+            expansions += 1
+            x = index // height
+            y = index % height
+            for dx, dy in PathPlanner.neighbours:
+                nx = x + dx
+                ny = y + dy
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+                neighbour = nx * height + ny
+                # The target itself may be blocked, e.g. a tower
+                if tiles[neighbour] & BLOCKED_BITS and neighbour != target_index:
+                    continue
+                new_cost = g + 1
+                if neighbour not in cost or new_cost < cost[neighbour]:
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = index
+                    h = max(abs(nx - tx), abs(ny - ty))
+                    if h < best_h:
+                        best_h = h
+                        best_index = neighbour
+                    heapq.heappush(heap, (new_cost + h, new_cost, neighbour))
+
+        if best_index == start_index:
+            return None
+        path = []
+        index = best_index
+        while index != start_index:
+            path.append(MapLocation(index // height, index % height))
+            index = came_from[index]
+        path.reverse()
+        return path
+
+    @staticmethod
+    def a_star_step(rc, target):
+        """
+        Returns a Direction along an A* path to target, reusing the stored path while it stays valid
+        Returns None if there is no path or the next tile is temporarily occupied
+        """
+        WorldMap.refresh(rc)
+        cur_location = rc.get_location()
+        path = state.astar_path
+        if path is None or state.astar_target != target or PathPlanner.path_blocked(path, state.astar_wall_version):
+            path = None
+        else:
+            # Drop the steps we have already taken, and replan if we got pushed off the path
+            while path and path[0] == cur_location:
+                path.pop(0)
+            if not path or not cur_location.is_adjacent_to(path[0]):
+                path = None
+
+        state.astar_wall_version = state.wall_version
+        if path is None:
+            path = PathPlanner.a_star(cur_location, target)
+            state.astar_path = path
+            state.astar_target = target
+            if path is None:
+                return None
+
+        dir = cur_location.direction_to(path[0])
+        if rc.can_move(dir):
+            return dir
+        return None
+
+    @staticmethod
+    def path_blocked(path, version):
+        """Returns True if a tile of path became blocked since the given wall_version"""
+        changes = state.wall_changes
+        if version == len(changes):
+            return False
+        tiles = state.map_tiles
+        height = state.map_height
+        path_indices = {loc.x * height + loc.y for loc in path}
+        for i in range(version, len(changes)):
+            index = changes[i]
+            if index in path_indices and tiles[index] & BLOCKED_BITS:
+                return True
+        return False
+
+    @staticmethod
+    def distance_field(target):
+        """
+        Returns an array with the number of moves from every tile to target (-1 if unreachable), indexed like map_tiles
+        Fields are computed once with a BFS from target, then repaired around every tile that changed since
+        """
+        height = state.map_height
+        target_index = target.x * height + target.y
+        fields = state.distance_fields
+        cached = fields.get(target_index)
+        if cached is not None:
+            version, field = cached
+            changes = state.wall_changes
+            if version != len(changes):
+                tiles = state.map_tiles
+                for i in range(version, len(changes)):
+                    index = changes[i]
+                    # The target itself may be blocked, e.g. a tower
+                    if index == target_index:
+                        continue
+                    if tiles[index] & BLOCKED_BITS:
+                        PathPlanner.remove_from_field(field, index)
+                    else:
+                        PathPlanner.add_to_field(field, index)
+                fields[target_index] = (len(changes), field)
+            return field
+
+        width = state.map_width
+        tiles = state.map_tiles
+        field = array('h', [-1]) * (width * height)
+        field[target_index] = 0
+        queue = deque([target_index])
+        while queue:
+            index = queue.popleft()
+            distance = field[index] + 1
+            x = index // height
+            y = index % height
+            for dx, dy in PathPlanner.neighbours:
+                nx = x + dx
+                ny = y + dy
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+                neighbour = nx * height + ny
+                if field[neighbour] == -1 and not tiles[neighbour] & BLOCKED_BITS:
+                    field[neighbour] = distance
+                    queue.append(neighbour)
+
+        # Only keep a few targets around, dropping the oldest one
+        if cached is None and len(fields) >= DISTANCE_FIELD_CACHE_SIZE:
+            del fields[next(iter(fields))]
+        fields[target_index] = (state.wall_version, field)
+        return field
+
+    @staticmethod
+    def remove_from_field(field, blocked_index):
+        """
+        Updates field after blocked_index became blocked, only touching the tiles whose distance goes up
+        Those are the tiles that lose every neighbour one move closer to the target, found one distance at a time,
+        and they are then refilled from the unaffected tiles around them.
+        """
+        if field[blocked_index] == -1:
+            return
+        width = state.map_width
+        height = state.map_height
+        neighbours = PathPlanner.neighbours
+        layer_distance = field[blocked_index]
+        field[blocked_index] = -1
+        affected = [blocked_index]
+        layer = [blocked_index]
+        while layer:
+            next_layer = []
+            layer_distance += 1
+            for index in layer:
+                x = index // height
+                y = index % height
+                for dx, dy in neighbours:
+                    nx = x + dx
+                    ny = y + dy
+                    if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                        continue
+                    neighbour = nx * height + ny
+                    distance = field[neighbour]
+                    if distance != layer_distance:
+                        continue
+                    # Still fine if any neighbour is one move closer
+                    supported = False
+                    for ex, ey in neighbours:
+                        mx = nx + ex
+                        my = ny + ey
+                        if 0 <= mx < width and 0 <= my < height and field[mx * height + my] == distance - 1:
+                            supported = True
+                            break
+                    if not supported:
+                        field[neighbour] = -1
+                        affected.append(neighbour)
+                        next_layer.append(neighbour)
+            layer = next_layer
+
+        # Refill the affected tiles from their unaffected neighbours, closest first
+        tiles = state.map_tiles
+        heap = []
+        for index in affected:
+            x = index // height
+            y = index % height
+            for dx, dy in neighbours:
+                nx = x + dx
+                ny = y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    distance = field[nx * height + ny]
+                    if distance != -1:
+                        heap.append((distance, nx * height + ny))
+        heapq.heapify(heap)
+        while heap:
+            distance, index = heapq.heappop(heap)
+            if field[index] != distance:
+                continue
+            distance += 1
+            x = index // height
+            y = index % height
+            for dx, dy in neighbours:
+                nx = x + dx
+                ny = y + dy
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+                neighbour = nx * height + ny
+                if tiles[neighbour] & BLOCKED_BITS:
+                    continue
+                if field[neighbour] == -1 or field[neighbour] > distance:
+                    field[neighbour] = distance
+                    heapq.heappush(heap, (distance, neighbour))
+
+    @staticmethod
+    def add_to_field(field, open_index):
+        """Updates field after open_index became passable, only touching the tiles whose distance goes down"""
+        width = state.map_width
+        height = state.map_height
+        tiles = state.map_tiles
+        neighbours = PathPlanner.neighbours
+        x = open_index // height
+        y = open_index % height
+        best = -1
+        for dx, dy in neighbours:
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                distance = field[nx * height + ny]
+                if distance != -1 and (best == -1 or distance < best):
+                    best = distance
+        if best == -1:
+            return
+        field[open_index] = best + 1
+        queue = deque([open_index])
+        while queue:
+            index = queue.popleft()
+            distance = field[index] + 1
+            x = index // height
+            y = index % height
+            for dx, dy in neighbours:
+                nx = x + dx
+                ny = y + dy
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+                neighbour = nx * height + ny
+                if tiles[neighbour] & BLOCKED_BITS:
+                    continue
+                if field[neighbour] == -1 or field[neighbour] > distance:
+                    field[neighbour] = distance
+                    queue.append(neighbour)
+
+    @staticmethod
+    def field_step(rc, target):
+        """
+        Returns the Direction that goes downhill on the distance field of target, or None if no move gets closer
+        """
+        WorldMap.refresh(rc)
+        field = PathPlanner.distance_field(target)
+        height = state.map_height
+        cur_location = rc.get_location()
+        best_distance = field[cur_location.x * height + cur_location.y]
+        best_dir = None
+        for dir in directions:
+            if not rc.can_move(dir):
+                continue
+            next_location = cur_location.add(dir)
+            distance = field[next_location.x * height + next_location.y]
+            if distance != -1 and (best_distance == -1 or distance < best_distance):
+                best_distance = distance
+                best_dir = dir
+        return best_dir
@@ -1,8 +1,13 @@
 from battlecode25.stubs import *
-from .constants import Constants
+from . import constants as Constants
 from .sensing import Sensing
 from .helper import Helper
-from .bot import *
+from .world_map import WorldMap
+from .symmetry import Symmetry
+from .hashable_coords import HashableCoords
+from .path_planner import PathPlanner
+from .scheduler import Scheduler
+from .state import state
 
 class Pathfinding:
     """
@@ -24,26 +29,26 @@ class Pathfinding:
         best_paint_type = PaintType.EMPTY
         cur_location = rc.get_location()
         best_location = None
+        WorldMap.refresh(rc)
         
         for dir in Constants.directions:
             if rc.can_move(dir):
-                adj_location = rc.sense_map_info(cur_location.add(dir))
-                distance = adj_location.get_map_location().distance_squared_to(target)
-                adj_type = adj_location.get_paint()
+                adj_location = cur_location.add(dir)
+                distance = adj_location.distance_squared_to(target)
+                adj_type = WorldMap.paint_at(adj_location)
                 
                 if distance < min_distance or min_distance == -1:
                     min_distance = distance
                     best_paint_type = adj_type
                     best_location = adj_location
                 elif distance == min_distance:
-                    adj_paint_type = adj_location.get_paint()
-                    if ((best_paint_type.is_enemy() and not adj_paint_type.is_enemy()) or
-                        (best_paint_type == PaintType.EMPTY and adj_paint_type.is_ally())):
-                        best_paint_type = adj_location.get_paint()
+                    if ((best_paint_type.is_enemy() and not adj_type.is_enemy()) or
+                        (best_paint_type == PaintType.EMPTY and adj_type.is_ally())):
+                        best_paint_type = adj_type
                         best_location = adj_location
                         
         if min_distance != -1:
-            return cur_location.direction_to(best_location.get_map_location())
+            return cur_location.direction_to(best_location)
         else:
             return None
 
@@ -68,7 +73,7 @@ class Pathfinding:
 
         all_directions = Direction.all_directions()
         for dir in all_directions:
-            if rc.can_move(dir) and rc.get_location().add(curr_dir) not in globals()['last8']:
+            if rc.can_move(dir) and HashableCoords.key(rc.get_location().add(curr_dir)) not in state.last8:
                 return dir
 
         for dir in all_directions:
@@ -88,19 +93,21 @@ class Pathfinding:
         curr_dir = rc.get_location().direction_to(target)
         left = curr_dir.rotate_left()
         right = curr_dir.rotate_right()
+        cur_location = rc.get_location()
+        WorldMap.refresh(rc)
 
-        if rc.can_move(curr_dir) and rc.sense_map_info(rc.get_location().add(curr_dir)).get_paint().is_ally():
+        if rc.can_move(curr_dir) and WorldMap.paint_at(cur_location.add(curr_dir)).is_ally():
             return curr_dir
-        elif rc.can_move(left) and rc.sense_map_info(rc.get_location().add(left)).get_paint().is_ally():
+        elif rc.can_move(left) and WorldMap.paint_at(cur_location.add(left)).is_ally():
             return left
-        elif rc.can_move(right) and rc.sense_map_info(rc.get_location().add(right)).get_paint().is_ally():
+        elif rc.can_move(right) and WorldMap.paint_at(cur_location.add(right)).is_ally():
             return right
 
         all_directions = Direction.all_directions()
         for dir in all_directions:
             if rc.can_move(dir):
-                if (rc.sense_map_info(rc.get_location().add(dir)).get_paint().is_ally() and 
-                    rc.get_location().add(curr_dir) not in globals()['last8']):
+                if (WorldMap.paint_at(cur_location.add(dir)).is_ally() and 
+                    HashableCoords.key(rc.get_location().add(curr_dir)) not in state.last8):
                     return dir
 
         for dir in all_directions:
@@ -112,9 +119,14 @@ class Pathfinding:
     @staticmethod
     def return_to_tower(rc):
         """Returns a Direction representing the direction to move to the closest tower in vision or the last one remembered"""
+        tower_location = state.last_tower.get_map_location()
         if rc.get_paint() < 6:
-            return Pathfinding.painted_pathfind(rc, globals()['last_tower'].get_map_location())
-        return Pathfinding.original_pathfind(rc, globals()['last_tower'].get_map_location())
+            return Pathfinding.painted_pathfind(rc, tower_location)
+        # Paint towers are visited over and over, so follow their cached distance field
+        dir = PathPlanner.field_step(rc, tower_location)
+        if dir is not None:
+            return dir
+        return Pathfinding.original_pathfind(rc, tower_location)
 
     @staticmethod
     def tiebreak_unpainted(rc, valid_adjacent):
@@ -183,7 +195,8 @@ class Pathfinding:
         if care_about_enemy = true, +5 for enemy paint
         """
         break_score = 0
-        if globals()['intermediate_target'] is not None:
+        # Abandoning the intermediate target early is optional, skip it when the turn is short on bytecode
+        if state.intermediate_target is not None and Scheduler.has_budget():
             potential_break = MapLocation(cur_location.x - 2, cur_location.y - 2)
             if rc.on_the_map(potential_break):
                 break_score = Sensing.score_tile(rc, potential_break, False)
@@ -201,19 +214,17 @@ class Pathfinding:
                 break_score = max(break_score, Sensing.score_tile(rc, potential_break, False))
                 
             if break_score > 45:
-                globals()['intermediate_target'] = None
-                from .soldier import Soldier
-                Soldier.reset_variables()
+                state.intermediate_target = None
+                state.reset_variables()
 
         # Only update intermediate target locations when we have reached one already or if we don't have one at all
-        if (globals()['intermediate_target'] is None or 
-            cur_location.equals(globals()['intermediate_target']) or
-            (cur_location.is_within_distance_squared(globals()['intermediate_target'], 2) and
-             not rc.sense_map_info(globals()['intermediate_target']).is_passable())):
+        if (state.intermediate_target is None or 
+            cur_location.equals(state.intermediate_target) or
+            (cur_location.is_within_distance_squared(state.intermediate_target, 2) and
+             not WorldMap.is_passable(state.intermediate_target.x, state.intermediate_target.y))):
             
-            if cur_location.equals(globals()['intermediate_target']):
-                from .soldier import Soldier
-                Soldier.reset_variables()
+            if cur_location.equals(state.intermediate_target):
+                state.reset_variables()
                 
             cum_sum = 0
             # Calculate a score for each target
@@ -253,18 +264,18 @@ class Pathfinding:
                 random_value = Constants.rng.randint(0, weighted_adjacent[7] - 1)
                 for i in range(8):
                     if random_value < weighted_adjacent[i]:
-                        globals()['intermediate_target'] = cur_location.translate(
+                        state.intermediate_target = cur_location.translate(
                             Pathfinding.directions[i][0], Pathfinding.directions[i][1])
                         break
 
-        if globals()['intermediate_target'] is None:
+        if state.intermediate_target is None:
             return None
             
-        if (globals()['prev_intermediate'] is not None and 
-            globals()['prev_intermediate'] != globals()['intermediate_target']):
-            globals()['stuck_turn_count'] = 0
+        if (state.prev_intermediate is not None and 
+            state.prev_intermediate != state.intermediate_target):
+            state.stuck_turn_count = 0
             
-        move_dir = Pathfinding.pathfind(rc, globals()['intermediate_target'])
+        move_dir = Pathfinding.pathfind(rc, state.intermediate_target)
         if move_dir is not None:
             return move_dir
             
@@ -276,24 +287,27 @@ class Pathfinding:
         all_directions = Direction.all_directions()
         for _ in range(5):
             dir = all_directions[int(Constants.rng.random() * len(all_directions))]
-            if rc.can_move(dir) and rc.get_location().add(dir) not in globals()['last8']:
+            if rc.can_move(dir) and HashableCoords.key(rc.get_location().add(dir)) not in state.last8:
                 return dir
         return None
 
     @staticmethod
     def find_own_corner(rc):
         """Find and move towards own corner"""
-        rc.set_indicator_string(f"GETTING UNSTUCK {globals()['opposite_corner']}")
+        rc.set_indicator_string(f"GETTING UNSTUCK {state.opposite_corner}")
         if Constants.rng.random() < Constants.RANDOM_STEP_PROBABILITY:
             random_dir = Pathfinding.random_walk(rc)
             if random_dir is not None:
                 return random_dir
                 
-        globals()['prev_intermediate'] = globals()['intermediate_target']
-        globals()['intermediate_target'] = None
+        state.prev_intermediate = state.intermediate_target
+        state.intermediate_target = None
         
-        if (globals()['opposite_corner'] is None or 
-            rc.get_location().distance_squared_to(globals()['opposite_corner']) <= 8):
+        if (state.opposite_corner is None or 
+            rc.get_location().distance_squared_to(state.opposite_corner) <= 8):
+            # Head for a possible enemy base first, and only pick a random corner once they are all explored
+            state.opposite_corner = Symmetry.explore_target(rc, 8)
+        if state.opposite_corner is None:
             corner = Constants.rng.random()
             x = rc.get_location().x
             y = rc.get_location().y
@@ -310,9 +324,9 @@ class Pathfinding:
                 if y < rc.get_map_height() / 2:
                     target_y = rc.get_map_height()
                     
-            globals()['opposite_corner'] = MapLocation(target_x, target_y)
+            state.opposite_corner = MapLocation(target_x, target_y)
             
-        return Pathfinding.pathfind(rc, globals()['opposite_corner'])
+        return Pathfinding.pathfind(rc, state.opposite_corner)
 
     @staticmethod
     def get_unstuck(rc):
@@ -320,25 +334,29 @@ class Pathfinding:
         if Constants.rng.random() < Constants.RANDOM_STEP_PROBABILITY:
             return Pathfinding.random_walk(rc)
         else:
-            if (globals()['opposite_corner'] is None or 
-                rc.get_location().distance_squared_to(globals()['opposite_corner']) <= 20):
+            if (state.opposite_corner is None or 
+                rc.get_location().distance_squared_to(state.opposite_corner) <= 20):
+                state.opposite_corner = Symmetry.explore_target(rc, 20)
+            if state.opposite_corner is None:
                 x = rc.get_location().x
                 y = rc.get_location().y
                 target_x = rc.get_map_width() if x < rc.get_map_width() / 2 else 0
                 target_y = rc.get_map_height() if y < rc.get_map_height() / 2 else 0
-                globals()['opposite_corner'] = MapLocation(target_x, target_y)
+                state.opposite_corner = MapLocation(target_x, target_y)
                 
-            return Pathfinding.pathfind(rc, globals()['opposite_corner'])
+            return Pathfinding.pathfind(rc, state.opposite_corner)
 
     @staticmethod
     def better_unstuck(rc):
         """Better version of getting unstuck"""
-        rc.set_indicator_string(f"GETTING UNSTUCK {globals()['opposite_corner']}")
-        globals()['prev_intermediate'] = globals()['intermediate_target']
-        globals()['intermediate_target'] = None
+        rc.set_indicator_string(f"GETTING UNSTUCK {state.opposite_corner}")
+        state.prev_intermediate = state.intermediate_target
+        state.intermediate_target = None
         
-        if (globals()['opposite_corner'] is None or 
-            rc.get_location().distance_squared_to(globals()['opposite_corner']) <= 20):
+        if (state.opposite_corner is None or 
+            rc.get_location().distance_squared_to(state.opposite_corner) <= 20):
+            state.opposite_corner = Symmetry.explore_target(rc, 20)
+        if state.opposite_corner is None:
             corner = Constants.rng.random()
             x = rc.get_location().x
             y = rc.get_location().y
@@ -355,14 +373,14 @@ class Pathfinding:
                 if y < rc.get_map_height() / 2:
                     target_y = rc.get_map_height()
                     
-            globals()['opposite_corner'] = MapLocation(target_x, target_y)
+            state.opposite_corner = MapLocation(target_x, target_y)
             
-        return Pathfinding.pathfind(rc, globals()['opposite_corner'])
+        return Pathfinding.pathfind(rc, state.opposite_corner)
 
     @staticmethod
     def bugidk(rc, target):
         """bug(?) pathfinding algorithm"""
-        if not globals()['is_tracing']:
+        if not state.is_tracing:
             # proceed as normal
             dir = rc.get_location().direction_to(target)
             if rc.can_move(dir):
@@ -372,140 +390,155 @@ class Pathfinding:
                     if Constants.rng.random() >= 0.8:
                         # treat robot as passable 20% of the time
                         return None
-                globals()['is_tracing'] = True
-                globals()['tracing_dir'] = dir
-                globals()['stopped_location'] = rc.get_location()
-                globals()['tracing_turns'] = 0
+                state.is_tracing = True
+                state.tracing_dir = dir
+                state.stopped_location = rc.get_location()
+                state.tracing_turns = 0
         else:
-            if ((Helper.is_between(rc.get_location(), globals()['stopped_location'], target) and 
-                globals()['tracing_turns'] != 0) or 
-                globals()['tracing_turns'] > 2 * (rc.get_map_width() + rc.get_map_height())):
-                from .soldier import Soldier
-                Soldier.reset_variables()
+            if ((Helper.is_between(rc.get_location(), state.stopped_location, target) and 
+                state.tracing_turns != 0) or 
+                state.tracing_turns > 2 * (rc.get_map_width() + rc.get_map_height())):
+                state.reset_variables()
             else:
                 # go along perimeter of obstacle
-                if rc.can_move(globals()['tracing_dir']):
+                if rc.can_move(state.tracing_dir):
                     # move forward and try to turn right
-                    return_dir = globals()['tracing_dir']
-                    globals()['tracing_dir'] = globals()['tracing_dir'].rotate_right()
-                    globals()['tracing_dir'] = globals()['tracing_dir'].rotate_right()
-                    globals()['tracing_turns'] += 1
+                    return_dir = state.tracing_dir
+                    state.tracing_dir = state.tracing_dir.rotate_right()
+                    state.tracing_dir = state.tracing_dir.rotate_right()
+                    state.tracing_turns += 1
                     return return_dir
                 else:
                     # turn left because we cannot proceed forward
                     # keep turning left until we can move again
                     for _ in range(8):
-                        globals()['tracing_dir'] = globals()['tracing_dir'].rotate_left()
-                        if rc.can_move(globals()['tracing_dir']):
-                            return_dir = globals()['tracing_dir']
-                            globals()['tracing_dir'] = globals()['tracing_dir'].rotate_right()
-                            globals()['tracing_dir'] = globals()['tracing_dir'].rotate_right()
-                            globals()['tracing_turns'] += 1
+                        state.tracing_dir = state.tracing_dir.rotate_left()
+                        if rc.can_move(state.tracing_dir):
+                            return_dir = state.tracing_dir
+                            state.tracing_dir = state.tracing_dir.rotate_right()
+                            state.tracing_dir = state.tracing_dir.rotate_right()
+                            state.tracing_turns += 1
                             return return_dir
         return None
 
     @staticmethod
     def bug1(rc, target):
         """bug1 pathfinding algorithm"""
-        if not globals()['is_tracing']:
+        if not state.is_tracing:
             # proceed as normal
             dir = rc.get_location().direction_to(target)
             if rc.can_move(dir):
                 return dir
             else:
-                globals()['is_tracing'] = True
-                globals()['tracing_dir'] = dir
-                globals()['bug1_turns'] = 0
+                state.is_tracing = True
+                state.tracing_dir = dir
+                state.bug1_turns = 0
         else:
             # tracing mode
             # need a stopping condition - this will be when we see the closestLocation again
-            if ((rc.get_location().equals(globals()['closest_location']) and globals()['bug1_turns'] != 0) or 
-                globals()['bug1_turns'] > 2 * (rc.get_map_width() + rc.get_map_height())):
+            if ((rc.get_location().equals(state.closest_location) and state.bug1_turns != 0) or 
+                state.bug1_turns > 2 * (rc.get_map_width() + rc.get_map_height())):
                 # returned to closest location along perimeter of the obstacle
-                from .soldier import Soldier
-                Soldier.reset_variables()
+                state.reset_variables()
             else:
                 # keep tracing
                 # update closestLocation and smallestDistance
                 dist_to_target = rc.get_location().distance_squared_to(target)
-                if dist_to_target < globals()['smallest_distance']:
-                    globals()['smallest_distance'] = dist_to_target
-                    globals()['closest_location'] = rc.get_location()
+                if dist_to_target < state.smallest_distance:
+                    state.smallest_distance = dist_to_target
+                    state.closest_location = rc.get_location()
 
                 # go along perimeter of obstacle
-                if rc.can_move(globals()['tracing_dir']):
+                if rc.can_move(state.tracing_dir):
                     # move forward and try to turn right
-                    return_dir = globals()['tracing_dir']
-                    globals()['tracing_dir'] = globals()['tracing_dir'].rotate_right()
-                    globals()['tracing_dir'] = globals()['tracing_dir'].rotate_right()
-                    globals()['bug1_turns'] += 1
+                    return_dir = state.tracing_dir
+                    state.tracing_dir = state.tracing_dir.rotate_right()
+                    state.tracing_dir = state.tracing_dir.rotate_right()
+                    state.bug1_turns += 1
                     return return_dir
                 else:
                     # turn left because we cannot proceed forward
                     # keep turning left until we can move again
                     for _ in range(8):
-                        globals()['tracing_dir'] = globals()['tracing_dir'].rotate_left()
-                        if rc.can_move(globals()['tracing_dir']):
-                            return_dir = globals()['tracing_dir']
-                            globals()['tracing_dir'] = globals()['tracing_dir'].rotate_right()
-                            globals()['tracing_dir'] = globals()['tracing_dir'].rotate_right()
-                            globals()['bug1_turns'] += 1
+                        state.tracing_dir = state.tracing_dir.rotate_left()
+                        if rc.can_move(state.tracing_dir):
+                            return_dir = state.tracing_dir
+                            state.tracing_dir = state.tracing_dir.rotate_right()
+                            state.tracing_dir = state.tracing_dir.rotate_right()
+                            state.bug1_turns += 1
                             return return_dir
         return None
 
     @staticmethod
     def pathfind(rc, target):
-        """Main pathfinding method that combines different strategies"""
+        """
+        Main pathfinding method that combines different strategies
+        Towers are reached through their cached distance field. Otherwise, move greedily and once that gets stuck,
+        follow an A* path over the known map, falling back to bug1 if the known map has no path
+        """
         cur_location = rc.get_location()
         dist = cur_location.distance_squared_to(target)
         if dist == 0:
-            from .soldier import Soldier
-            Soldier.reset_variables()
+            state.reset_variables()
+
+        WorldMap.refresh(rc)
+        # Corner targets such as (width, height) are off the map, and would index past the tile store
+        if rc.on_the_map(target) and WorldMap.has_ruin(target.x, target.y) and rc.can_sense_robot_at_location(target):
+            dir = PathPlanner.field_step(rc, target)
+            if dir is not None:
+                return dir
             
-        if globals()['stuck_turn_count'] < 5 and not globals()['in_bug_nav']:
-            if dist < globals()['closest_path']:
-                globals()['closest_path'] = dist
-            elif globals()['closest_path'] != -1:
-                globals()['stuck_turn_count'] += 1
+        if state.stuck_turn_count < 5 and not state.in_astar_nav and not state.in_bug_nav:
+            if dist < state.closest_path:
+                state.closest_path = dist
+            elif state.closest_path != -1:
+                state.stuck_turn_count += 1
             else:
-                globals()['closest_path'] = dist
+                state.closest_path = dist
             return Pathfinding.less_original_pathfind(rc, target)
             
-        elif globals()['in_bug_nav']:
+        elif state.in_bug_nav:
             # If robot has made it across the wall to the other side
             # Then, just pathfind to the place we are going to
-            if rc.get_location().distance_squared_to(globals()['across_wall']) == 0:
-                from .soldier import Soldier
-                Soldier.reset_variables()
+            if rc.get_location().distance_squared_to(state.across_wall) == 0:
+                state.reset_variables()
                 return None
             # Otherwise, just call bugnav
-            return Pathfinding.bug1(rc, globals()['across_wall'])
-            
-        else:
-            globals()['in_bug_nav'] = True
-            globals()['stuck_turn_count'] = 0
-            to_target = cur_location.direction_to(target)
-            new_loc = cur_location.add(to_target)
-            
-            if rc.can_sense_location(new_loc):
-                if rc.sense_map_info(new_loc).is_wall():
-                    new_loc = new_loc.add(to_target)
-                    if rc.can_sense_location(new_loc):
-                        if rc.sense_map_info(new_loc).is_wall():
-                            new_loc = new_loc.add(to_target)
-                            if rc.can_sense_location(new_loc):
-                                if not rc.sense_map_info(new_loc).is_wall():
-                                    globals()['across_wall'] = new_loc
-                                    return None
-                        else:
-                            globals()['across_wall'] = new_loc
-                            return None
-                else:
-                    globals()['across_wall'] = new_loc
-                    return None
-                    
-            globals()['across_wall'] = target
-            return None
+            return Pathfinding.bug1(rc, state.across_wall)
+
+        # Greedy movement is stuck, so follow an A* path over the known map
+        dir = PathPlanner.a_star_step(rc, target)
+        if dir is not None or state.astar_path is not None:
+            state.in_astar_nav = True
+            state.stuck_turn_count = 0
+            return dir
+
+        # The known map has no path at all, so trace the obstacle with bug1
+        state.in_astar_nav = False
+        state.in_bug_nav = True
+        state.stuck_turn_count = 0
+        to_target = cur_location.direction_to(target)
+        new_loc = cur_location.add(to_target)
+        
+        if rc.can_sense_location(new_loc):
+            if WorldMap.is_wall(new_loc.x, new_loc.y):
+                new_loc = new_loc.add(to_target)
+                if rc.can_sense_location(new_loc):
+                    if WorldMap.is_wall(new_loc.x, new_loc.y):
+                        new_loc = new_loc.add(to_target)
+                        if rc.can_sense_location(new_loc):
+                            if not WorldMap.is_wall(new_loc.x, new_loc.y):
+                                state.across_wall = new_loc
+                                return None
+                    else:
+                        state.across_wall = new_loc
+                        return None
+            else:
+                state.across_wall = new_loc
+                return None
+                
+        state.across_wall = target
+        return None
 
     @staticmethod
     def random_painted_walk(rc):
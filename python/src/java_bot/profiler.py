@@ -0,0 +1,119 @@
+from battlecode25.stubs import *
+from .constants import *
+from .state import state
+import time
+
+class Profiler:
+    """
+    Opt-in instrumentation of the static methods of the java_bot subsystems, enabled with PROFILE in constants.py
+    Every call records its cost in the engine bytecode counter when the engine exposes one, and in
+    perf_counter_ns nanoseconds otherwise. Costs are kept per robot as
+    - a log2 histogram of the inclusive cost of each method
+    - the self cost of each call stack, which is the folded format flame graph tools read
+    """
+
+    @staticmethod
+    def init():
+        """Picks the cost counter and resets the recorded stats"""
+        bytecode_num = getattr(Clock, 'get_bytecode_num', None)
+        if bytecode_num is not None:
+            state.profile_counter = bytecode_num
+            state.profile_unit = 'bytecode'
+        else:
+            state.profile_counter = time.perf_counter_ns
+            state.profile_unit = 'ns'
+        state.profile_stack = []
+        state.profile_child_costs = []
+        state.profile_methods = {}
+        state.profile_stacks = {}
+        state.profile_overruns = 0
+        state.profile_dumped = False
+
+    @staticmethod
+    def instrument(*classes):
+        """Replaces every static method defined on the given classes by a recording wrapper"""
+        for cls in classes:
+            for name, attr in list(vars(cls).items()):
+                if isinstance(attr, staticmethod) and not hasattr(attr.__func__, 'profiled'):
+                    setattr(cls, name, staticmethod(Profiler.wrap(f"{cls.__name__}.{name}", attr.__func__)))
+
+    @staticmethod
+    def wrap(name, func):
+        """Returns func wrapped so that each call is recorded under name"""
+        def profiled(*args, **kwargs):
+            stack = state.profile_stack
+            child_costs = state.profile_child_costs
+            counter = state.profile_counter
+            stack.append(name)
+            child_costs.append(0)
+            start = counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                cost = counter() - start
+                if cost < 0:
+                    # The bytecode counter restarted, i.e. this call ran over the turn limit.
+                    # Only the part spent in the new turn is known
+                    state.profile_overruns += 1
+                    cost += start
+                children = child_costs.pop()
+                key = tuple(stack)
+                stack.pop()
+                if child_costs:
+                    child_costs[-1] += cost
+
+                stats = state.profile_methods.get(name)
+                if stats is None:
+                    # calls, total cost, max cost, log2 histogram of the cost
+                    stats = [0, 0, 0, [0] * 64]
+                    state.profile_methods[name] = stats
+                stats[0] += 1
+                stats[1] += cost
+                if cost > stats[2]:
+                    stats[2] = cost
+                stats[3][min(cost.bit_length(), 63)] += 1
+
+                stacks = state.profile_stacks
+                stacks[key] = stacks.get(key, 0) + cost - children
+        profiled.profiled = True
+        profiled.__name__ = func.__name__
+        profiled.__doc__ = func.__doc__
+        return profiled
+
+    @staticmethod
+    def dump_if_due(rc):
+        """
+        Called at the end of every turn. Prints a checkpoint every PROFILE_CHECKPOINT_ROUNDS rounds, so matches
+        that end early still leave a profile, and the final profile once, on PROFILE_DUMP_ROUND
+        """
+        if state.profile_dumped:
+            return
+        round_num = rc.get_round_num()
+        if round_num >= PROFILE_DUMP_ROUND:
+            Profiler.dump_final(rc)
+        elif round_num % PROFILE_CHECKPOINT_ROUNDS == 0:
+            Profiler.dump(rc, f"checkpoint at round {round_num}")
+
+    @staticmethod
+    def dump_final(rc):
+        """Prints the final profile of this robot, at most once"""
+        if not state.profile_dumped:
+            state.profile_dumped = True
+            Profiler.dump(rc, f"final at round {rc.get_round_num()}")
+
+    @staticmethod
+    def dump(rc, label):
+        """Prints the per method histograms and the flame graph stacks of this robot, so far"""
+        unit = state.profile_unit
+        methods = state.profile_methods
+        print(f"=== Profile of robot {rc.get_id()} ({rc.get_type()}), {label}, costs in {unit}, "
+              f"{state.profile_overruns} calls over the turn limit ===")
+        print(f"{'method':<44}{'calls':>8}{'total':>14}{'mean':>10}{'max':>10}  histogram (log2 of cost:calls)")
+        for name, (calls, total, max_cost, buckets) in sorted(methods.items(), key=lambda item: -item[1][1]):
+            histogram = ' '.join(f"{k}:{count}" for k, count in enumerate(buckets) if count)
+            print(f"{name:<44}{calls:>8}{total:>14}{total // calls:>10}{max_cost:>10}  {histogram}")
+
+        print("--- self cost per call stack (flame graph folded format) ---")
+        stacks = sorted(state.profile_stacks.items(), key=lambda item: -item[1])
+        for key, cost in stacks[:PROFILE_MAX_STACKS]:
+            print(f"{';'.join(key)} {cost}")
@@ -1,6 +1,9 @@
 from battlecode25.stubs import *
 from .constants import *
 from .pathfinding import Pathfinding
+from .world_map import WorldMap
+from .communication import Communication
+from .state import state
 import math
 
 class Robot:
@@ -9,15 +12,16 @@ class Robot:
     @staticmethod
     def low_paint_behavior(rc):
         """Method for robot behavior when they are low on paint"""
-        globals()['is_low_paint'] = True
+        state.is_low_paint = True
         # If last tower is null, then just random walk on paint
         for enemy_robot in rc.sense_nearby_robots(-1, rc.get_team().opponent()):
             if enemy_robot.get_type().is_tower_type():
                 if rc.can_attack(enemy_robot.get_location()):
                     rc.attack(enemy_robot.get_location())
+                    WorldMap.invalidate()
                     break
 
-        if globals()['last_tower'] is None:
+        if state.last_tower is None:
             move_to = Pathfinding.random_painted_walk(rc)
             if move_to is not None and rc.can_move(move_to):
                 rc.move(move_to)
@@ -28,7 +32,7 @@ class Robot:
             rc.move(dir)
 
         # Otherwise, pathfind to the tower
-        tower_location = globals()['last_tower'].get_map_location()
+        tower_location = state.last_tower.get_map_location()
         Robot.complete_ruin_if_possible(rc, tower_location)
         amt_to_transfer = rc.get_paint() - rc.get_type().paint_capacity
         
@@ -53,20 +57,20 @@ class Robot:
         """Updates the lastTower variable to any allied paint tower currently in range"""
         min_distance = -1
         last_tower = None
-        for loc in rc.sense_nearby_map_infos():
+        for loc in WorldMap.refresh(rc):
             if Robot.check_allied_tower(rc, loc):
                 tower_type = rc.sense_robot_at_location(loc.get_map_location()).get_type()
                 if tower_type.get_base_type() == UnitType.LEVEL_ONE_PAINT_TOWER.get_base_type():
-                    globals()['seen_paint_tower'] = True
+                    state.seen_paint_tower = True
                     distance = loc.get_map_location().distance_squared_to(rc.get_location())
                     if min_distance == -1 or min_distance > distance:
                         last_tower = loc
                         min_distance = distance
 
         if min_distance != -1:
-            globals()['last_tower'] = last_tower
-        elif globals()['last_tower'] is not None and globals()['last_tower'].get_map_location().is_within_distance_squared(rc.get_location(), 20):
-            globals()['last_tower'] = None
+            state.last_tower = last_tower
+        elif state.last_tower is not None and state.last_tower.get_map_location().is_within_distance_squared(rc.get_location(), 20):
+            state.last_tower = None
 
     @staticmethod
     def has_low_paint(rc, threshold):
@@ -94,12 +98,23 @@ class Robot:
     @staticmethod
     def complete_ruin_if_possible(rc, ruin_location):
         """Completes the ruin at the given location if possible"""
+        completed = False
         if rc.can_complete_tower_pattern(UnitType.LEVEL_ONE_MONEY_TOWER, ruin_location):
             rc.complete_tower_pattern(UnitType.LEVEL_ONE_MONEY_TOWER, ruin_location)
+            WorldMap.invalidate()
+            completed = True
         if rc.can_complete_tower_pattern(UnitType.LEVEL_ONE_PAINT_TOWER, ruin_location):
             rc.complete_tower_pattern(UnitType.LEVEL_ONE_PAINT_TOWER, ruin_location)
+            WorldMap.invalidate()
+            completed = True
         if rc.can_complete_tower_pattern(UnitType.LEVEL_ONE_DEFENSE_TOWER, ruin_location):
             rc.complete_tower_pattern(UnitType.LEVEL_ONE_DEFENSE_TOWER, ruin_location)
+            WorldMap.invalidate()
+            completed = True
+        # A new tower only knows its own location, tell it where our base is. Existing towers already know,
+        # and this runs every turn next to the paint tower, so only the tower completed just now is told
+        if completed and rc.can_sense_robot_at_location(ruin_location):
+            Communication.send_home(rc, ruin_location)
 
     @staticmethod
     def reset_variables():
@@ -107,15 +122,4 @@ class Robot:
         Resets pathfinding variables
         Meant to be called when the robot has found else to do
         """
-        globals()['is_tracing'] = False
-        globals()['smallest_distance'] = 10000000
-        globals()['closest_location'] = None
-        globals()['tracing_dir'] = None
-        globals()['stuck_turn_count'] = 0
-        globals()['closest_path'] = -1
-        globals()['fill_tower_type'] = None
-        globals()['stopped_location'] = None
-        globals()['tracing_turns'] = 0
-        globals()['bug1_turns'] = 0
-        globals()['in_bug_nav'] = False
-        globals()['across_wall'] = None
+        state.reset_variables()
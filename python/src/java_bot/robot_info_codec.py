@@ -1,11 +1,27 @@
 from battlecode25.stubs import *
+from .map_info_codec import MapInfoCodec
 import math
 
+# UnitType and Team for each value, so decoding never builds an enum
+UNIT_TYPES = [None] * 16
+for unit_type in UnitType:
+    UNIT_TYPES[unit_type.value] = unit_type
+TEAMS = [Team(0), Team(1)]
+
+# Health and paint for each percentage (0-127) of every UnitType, indexed by UnitType value.
+# Same rounding as the original math.ceil decoding
+HEALTH_BY_PERCENT = [None] * 16
+PAINT_BY_PERCENT = [None] * 16
+for unit_type in UnitType:
+    HEALTH_BY_PERCENT[unit_type.value] = [math.ceil((unit_type.health / 100.0) * p) for p in range(128)]
+    PAINT_BY_PERCENT[unit_type.value] = [math.ceil((unit_type.paint_capacity / 100.0) * p) for p in range(128)]
+
 class RobotInfoCodec:
     """
     RobotInfoCodec encodes and decodes a RobotInfo to/from an int so that it can be sent in a message.
     Coding uses the bottom 31 of the available 32 bits: _ppppppp Thhhhhhh UUUUyyyy yyxxxxxx
     paint (p) and health (h) are approximate, since it won't fit otherwise. ID is not sent.
+    The view methods (location, type, health, ...) read a single field straight from the int.
     """
     
     @staticmethod
@@ -29,20 +45,37 @@ class RobotInfoCodec:
     def decode(i):
         """
         Decode the given integer into a RobotInfo.
-        Approx 71 bytecode.
+        Builds the RobotInfo only, everything else comes from tables.
         """
-        location_mask = (1 << 6) - 1
-        x = i & location_mask
-        y = (i >> 6) & location_mask
-        unit_type = UnitType((i >> 12) & ((1 << 4) - 1))
-        health_percent = (i >> 16) & ((1 << 7) - 1)
-        team = Team((i >> 23) & 1)
-        paint_percent = (i >> 24) & ((1 << 7) - 1)
-        
-        health = math.ceil((unit_type.health / 100.0) * health_percent)
-        paint = math.ceil((unit_type.paint_capacity / 100.0) * paint_percent)
-        
-        return RobotInfo(0, team, unit_type, health, MapLocation(x, y), paint)
+        type_value = (i >> 12) & 0b1111
+        return RobotInfo(0, TEAMS[(i >> 23) & 1], UNIT_TYPES[type_value],
+                         HEALTH_BY_PERCENT[type_value][(i >> 16) & 0b1111111],
+                         MapInfoCodec.location(i), PAINT_BY_PERCENT[type_value][(i >> 24) & 0b1111111])
+
+    @staticmethod
+    def location(i):
+        """Returns the interned MapLocation of the message"""
+        return MapInfoCodec.location(i)
+
+    @staticmethod
+    def type(i):
+        """Returns the UnitType of the robot"""
+        return UNIT_TYPES[(i >> 12) & 0b1111]
+
+    @staticmethod
+    def health(i):
+        """Returns the approximate health of the robot"""
+        return HEALTH_BY_PERCENT[(i >> 12) & 0b1111][(i >> 16) & 0b1111111]
+
+    @staticmethod
+    def team(i):
+        """Returns the Team of the robot"""
+        return TEAMS[(i >> 23) & 1]
+
+    @staticmethod
+    def paint(i):
+        """Returns the approximate paint of the robot"""
+        return PAINT_BY_PERCENT[(i >> 12) & 0b1111][(i >> 24) & 0b1111111]
 
     @staticmethod
     def equals(a, b):
@@ -0,0 +1,54 @@
+from battlecode25.stubs import *
+from .constants import *
+from .state import state
+
+class Scheduler:
+    """
+    Cooperative scheduler for the optional work of a turn
+    Mandatory actions (moving, attacking, transferring paint) happen first in the run method of each robot type.
+    Afterwards, optional tasks run in priority order (lowest first) for as long as the bytecode budget allows.
+    A task is a generator that yields after every unit of work, so a task that runs out of budget
+    simply resumes where it stopped on the next turn.
+    """
+
+    @staticmethod
+    def submit(name, priority, task, *args):
+        """Queues the generator task(*args) under name, unless a task with that name is still pending"""
+        pending = state.pending_tasks
+        if name not in pending:
+            pending[name] = (priority, task(*args))
+
+    @staticmethod
+    def bytecodes_left():
+        """Returns the bytecodes left this turn, or None if the engine does not tell"""
+        bytecodes_left = getattr(Clock, 'get_bytecodes_left', None)
+        if bytecodes_left is None:
+            return None
+        return bytecodes_left()
+
+    @staticmethod
+    def has_budget():
+        """Returns True if there is enough budget left this turn for optional work"""
+        left = Scheduler.bytecodes_left()
+        return left is None or left > SCHEDULER_RESERVE
+
+    @staticmethod
+    def run(rc):
+        """
+        Runs pending tasks in priority order until all are done or the budget runs low
+        Without a bytecode counter, at most SCHEDULER_STEPS_PER_TURN steps are run
+        """
+        pending = state.pending_tasks
+        steps = 0
+        for name in sorted(pending, key=lambda task_name: pending[task_name][0]):
+            task = pending[name][1]
+            while True:
+                left = Scheduler.bytecodes_left()
+                if (left is not None and left <= SCHEDULER_RESERVE) or (left is None and steps >= SCHEDULER_STEPS_PER_TURN):
+                    return
+                steps += 1
+                try:
+                    next(task)
+                except StopIteration:
+                    del pending[name]
+                    break
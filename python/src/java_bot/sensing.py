@@ -1,9 +1,17 @@
 from battlecode25.stubs import *
 from .constants import *
 from .map_info_distance_comparator import MapInfoDistanceComparator
+from .world_map import *
+from .hashable_coords import HashableCoords
+from .message_frame import MessageFrame
+from .state import state
 import random
 
 class Sensing:
+    # Offsets of the tiles hit by a splash, relative to its center
+    splash_offsets = ((0, -2), (-1, -1), (0, -1), (1, -1), (-2, 0), (-1, 0), (0, 0), (1, 0), (2, 0),
+                      (-1, 1), (0, 1), (1, 1), (0, 2))
+
     @staticmethod
     def find_nearest_lowest_hp(rc):
         """Finds the opponent robots within actionRadius with the lowest HP and returns its RobotInfo"""
@@ -24,12 +32,27 @@ class Sensing:
         Returns False if there is enemy paint, or if there is a tower already existing
         Purpose: Check if we should go to this ruin to build on it
         """
-        for pattern_tile in rc.sense_nearby_map_infos(tower_location, 8):
-            if pattern_tile.has_ruin():
-                if rc.can_sense_robot_at_location(pattern_tile.get_map_location()):
+        WorldMap.refresh(rc)
+        tiles = state.map_tiles
+        last_seen = state.map_last_seen
+        robot_grid = state.map_robot
+        width = state.map_width
+        height = state.map_height
+        # Every tile of the 5x5 pattern is within distance 8 of the ruin
+        for x in range(tower_location.x - 2, tower_location.x + 3):
+            if x < 0 or x >= width:
+                continue
+            base = x * height
+            for y in range(tower_location.y - 2, tower_location.y + 3):
+                i = base + y
+                if y < 0 or y >= height or last_seen[i] == -1:
+                    continue
+                tile = tiles[i]
+                if tile & RUIN_BIT:
+                    if robot_grid[i] != NO_ROBOT:
+                        return False
+                elif IS_ENEMY_PAINT[tile & PAINT_MASK]:
                     return False
-            elif pattern_tile.get_paint().is_enemy():
-                return False
         return True
 
     @staticmethod
@@ -81,7 +104,7 @@ class Sensing:
         Paintable: empty paint or incorrect allied paint
         If none are found, return null
         """
-        for pattern_tile in rc.sense_nearby_map_infos(location, range_squared):
+        for pattern_tile in WorldMap.tiles_within(rc, location, range_squared):
             if (rc.can_paint(pattern_tile.get_map_location()) and
                 (pattern_tile.get_paint() == PaintType.EMPTY or
                  pattern_tile.get_mark() != pattern_tile.get_paint() and pattern_tile.get_mark() != PaintType.EMPTY)):
@@ -99,7 +122,7 @@ class Sensing:
         for i in range(-2, 3):
             for j in range(-2, 3):
                 pattern_tile = ruin_location.translate(i, j)
-                if rc.can_paint(pattern_tile) and ruin_pattern[i+2][j+2] != rc.sense_map_info(pattern_tile).get_paint():
+                if rc.can_paint(pattern_tile) and ruin_pattern[i+2][j+2] != WorldMap.sensed_paint(rc, pattern_tile):
                     return [i, j]
         return None
 
@@ -112,12 +135,12 @@ class Sensing:
         3. Hasn't been at this tile in the last 8 tiles it has moved to
         Returns a list of MapInfo for these tiles
         """
-        adjacent_tiles = rc.sense_nearby_map_infos(2)
+        adjacent_tiles = WorldMap.tiles_within(rc, rc.get_location(), 2)
         valid_adjacent = []
         for adjacent_tile in adjacent_tiles:
             if (adjacent_tile.get_paint() == PaintType.EMPTY and 
                 adjacent_tile.is_passable() and
-                adjacent_tile.get_map_location() not in globals()['last8']):
+                HashableCoords.key(adjacent_tile.get_map_location()) not in state.last8):
                 valid_adjacent.append(adjacent_tile)
         return valid_adjacent
 
@@ -130,12 +153,12 @@ class Sensing:
         3. Hasn't been at this tile in the last 8 tiles it has moved to
         Returns a list of MapInfo for these tiles
         """
-        adjacent_tiles = rc.sense_nearby_map_infos(2)
+        adjacent_tiles = WorldMap.tiles_within(rc, rc.get_location(), 2)
         valid_adjacent = []
         for adjacent_tile in adjacent_tiles:
             if (adjacent_tile.get_paint().is_ally() and 
                 adjacent_tile.is_passable() and
-                adjacent_tile.get_map_location() not in globals()['last8']):
+                HashableCoords.key(adjacent_tile.get_map_location()) not in state.last8):
                 valid_adjacent.append(adjacent_tile)
         return valid_adjacent
 
@@ -166,16 +189,44 @@ class Sensing:
                 return tile
         return None
 
+    @staticmethod
+    def find_enemy_reports(rc, nearby_tiles, first_tile):
+        """
+        Returns first_tile followed by other enemy paint tiles in vision, chosen so that they all fit in a single message frame
+        """
+        reports = [first_tile]
+        first_loc = first_tile.get_map_location()
+        prev_loc = first_loc
+        for tile in nearby_tiles:
+            if len(reports) == MessageFrame.MAX_TILES:
+                break
+            loc = tile.get_map_location()
+            if tile.get_paint().is_enemy() and loc != first_loc and MessageFrame.fits(prev_loc, loc):
+                reports.append(tile)
+                prev_loc = loc
+        return reports
+
     @staticmethod
     def count_empty_around(rc, center):
         """Counts the number of empty, passable tiles in a 3x3 area centered at center, assuming it is all visible"""
-        surrounding_tiles = rc.sense_nearby_map_infos(center, 2)
+        WorldMap.refresh(rc)
+        tiles = state.map_tiles
+        last_seen = state.map_last_seen
+        robot_grid = state.map_robot
+        width = state.map_width
+        height = state.map_height
         count = 0
-        for surrounding_tile in surrounding_tiles:
-            if (surrounding_tile.get_paint() == PaintType.EMPTY and 
-                surrounding_tile.is_passable() and
-                not rc.can_sense_robot_at_location(surrounding_tile.get_map_location())):
-                count += 1
+        for x in range(center.x - 1, center.x + 2):
+            if x < 0 or x >= width:
+                continue
+            base = x * height
+            for y in range(center.y - 1, center.y + 2):
+                i = base + y
+                # Empty paint, no wall and no ruin, i.e. the whole byte is 0 apart from the mark
+                if (0 <= y < height and last_seen[i] != -1 and
+                    tiles[i] & (BLOCKED_BITS | PAINT_MASK) == EMPTY_PAINT and
+                    robot_grid[i] == NO_ROBOT):
+                    count += 1
         return count
 
     @staticmethod
@@ -198,12 +249,12 @@ class Sensing:
     def get_near_by_enemies_sorted_shuffled(rc):
         """Get nearby enemies sorted by distance"""
         nearby_enemies = []
-        enemies = list(rc.sense_nearby_map_infos())
+        enemies = WorldMap.refresh(rc)
         for enemy in enemies:
             if enemy.get_paint().is_enemy():
                 nearby_enemies.append(enemy)
             if enemy.get_paint() == PaintType.EMPTY and not enemy.has_ruin() and not enemy.is_wall():
-                globals()['fill_empty'] = enemy
+                state.fill_empty = enemy
         if not nearby_enemies:
             return None
         return max(nearby_enemies, key=lambda x: MapInfoDistanceComparator(rc)(x, x))
@@ -211,22 +262,8 @@ class Sensing:
     @staticmethod
     def score_splasher_tiles(rc):
         """Scores tiles that decides where a splasher should go"""
-        nearby_tiles = rc.sense_nearby_map_infos()
-        # hash the tiles
-        for tile in nearby_tiles:
-            loc = tile.get_map_location()
-            paint = tile.get_paint()
-            if paint is None:
-                continue
-
-            if paint == PaintType.EMPTY and tile.is_passable():
-                globals()['curr_grid'][loc.x][loc.y] = 0
-            elif paint.is_enemy():
-                globals()['curr_grid'][loc.x][loc.y] = 2
-            elif paint.is_ally():
-                globals()['curr_grid'][loc.x][loc.y] = -1
-            else:
-                globals()['curr_grid'][loc.x][loc.y] = -1
+        # score_splash reads the packed tiles recorded by the world map refresh
+        nearby_tiles = WorldMap.refresh(rc)
 
         best = None
         best_score = -1
@@ -256,19 +293,16 @@ class Sensing:
         loc = tile.get_map_location()
         x = loc.x
         y = loc.y
-        up = rc.get_map_height()
-        right = rc.get_map_width()
+        up = state.map_height
+        right = state.map_width
+        tiles = state.map_tiles
 
         # Check all tiles in splash radius
-        splash_coords = [
-            (x, y-2), (x-1, y-1), (x, y-1), (x+1, y-1),
-            (x-2, y), (x-1, y), (x, y), (x+1, y), (x+2, y),
-            (x-1, y+1), (x, y+1), (x+1, y+1), (x, y+2)
-        ]
-
-        for tx, ty in splash_coords:
+        for dx, dy in Sensing.splash_offsets:
+            tx = x + dx
+            ty = y + dy
             if 0 <= tx < right and 0 <= ty < up:
-                out += globals()['curr_grid'][tx][ty]
+                out += SPLASH_SCORE[tiles[tx * up + ty]]
 
         return out
 
@@ -286,33 +320,44 @@ class Sensing:
     @staticmethod
     def score_tile(rc, tile, care_about_enemy):
         """Score a tile based on various factors"""
-        surrounding_tiles = rc.sense_nearby_map_infos(tile, 2)
+        WorldMap.refresh(rc)
+        tiles = state.map_tiles
+        last_seen = state.map_last_seen
+        robot_grid = state.map_robot
+        width = state.map_width
+        height = state.map_height
         count = 30
-        for surrounding_tile in surrounding_tiles:
-            if surrounding_tile.get_paint().is_enemy() and care_about_enemy:
-                count += 5
-            if surrounding_tile.get_paint() == PaintType.EMPTY and surrounding_tile.is_passable():
-                count += 3
-            if not surrounding_tile.is_passable():
-                count -= 2
-            surrounding_location = surrounding_tile.get_map_location()
-            if rc.can_sense_robot_at_location(surrounding_location):
-                if rc.sense_robot_at_location(surrounding_location).get_team() == rc.get_team():
+        for x in range(tile.x - 1, tile.x + 2):
+            if x < 0 or x >= width:
+                continue
+            base = x * height
+            for y in range(tile.y - 1, tile.y + 2):
+                i = base + y
+                if y < 0 or y >= height or last_seen[i] == -1:
+                    continue
+                packed = tiles[i]
+                if care_about_enemy and IS_ENEMY_PAINT[packed & PAINT_MASK]:
+                    count += 5
+                if packed & BLOCKED_BITS:
+                    count -= 2
+                elif packed & PAINT_MASK == EMPTY_PAINT:
+                    count += 3
+                if robot_grid[i] == ALLY_ROBOT:
                     count -= 3
         return count
 
     @staticmethod
     def conflicts_srp(rc):
         """Check for SRP conflicts"""
-        all_tiles = rc.sense_nearby_map_infos()
+        all_tiles = WorldMap.refresh(rc)
         for surrounding_tile in all_tiles:
             if surrounding_tile.get_mark().is_ally():
                 south = surrounding_tile.get_map_location().add(Direction.SOUTH)
                 southwest = south.add(Direction.WEST)
                 if rc.can_sense_location(south):
-                    if not rc.sense_map_info(south).has_ruin():
+                    if not WorldMap.has_ruin(south.x, south.y):
                         if rc.can_sense_location(southwest):
-                            if not rc.sense_map_info(southwest).has_ruin():
+                            if not WorldMap.has_ruin(southwest.x, southwest.y):
                                 return True
                         else:
                             return True
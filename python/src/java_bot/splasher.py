@@ -1,8 +1,8 @@
 from battlecode25.stubs import *
 from .robot import Robot
 from .communication import Communication
-from .robot_info_codec import RobotInfoCodec
 from .map_info_codec import MapInfoCodec
+from .state import state
 
 class Splasher:
     """Class for handling splasher robot functionality"""
@@ -12,25 +12,27 @@ class Splasher:
         """Process the last received message for the splasher"""
         for msg in rc.read_messages(-1):
             bytes = msg.get_bytes()
+            if Communication.read_home(bytes):
+                continue
             # Receives message of what type of splasher it is
             if bytes == 4:
                 continue
                 
+            # Robot reports are not used, and tiles are only decoded if they are worth chasing
             if Communication.is_robot_info(bytes):
-                message = RobotInfoCodec.decode(bytes)
                 continue
-            else:
+            if MapInfoCodec.paint(bytes).is_enemy() or MapInfoCodec.has_ruin(bytes):
                 message = MapInfoCodec.decode(bytes)
                 # If enemy paint, then store enemy paint
                 if message.get_paint().is_enemy():
                     robot_loc = rc.get_location()
-                    if (globals()['remove_paint'] is None or 
+                    if (state.remove_paint is None or 
                         robot_loc.distance_squared_to(message.get_map_location()) < 
-                        robot_loc.distance_squared_to(globals()['remove_paint'].get_map_location())):
-                        globals()['remove_paint'] = message
+                        robot_loc.distance_squared_to(state.remove_paint.get_map_location())):
+                        state.remove_paint = message
                         Robot.reset_variables()
                 # If enemy tower, then go to enemy tower location
                 elif message.has_ruin():
-                    if globals()['remove_paint'] is None:
-                        globals()['remove_paint'] = message
+                    if state.remove_paint is None:
+                        state.remove_paint = message
                         Robot.reset_variables()
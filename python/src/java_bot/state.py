@@ -0,0 +1,159 @@
+from collections import deque
+from .soldier_type import SoldierType
+from .soldier_state import SoldierState
+
+class RobotState:
+    """
+    Everything a robot remembers between turns, shared by all modules through the state instance below
+    Slots make every read and write a plain attribute access, instead of a globals() call and a dict lookup.
+    """
+    __slots__ = ('turn_count', 'last8', 'last_tower', 'soldier_type', 'stuck_turn_count', 'closest_path',
+                 'in_bug_nav', 'across_wall', 'prev_location', 'in_astar_nav', 'astar_path', 'astar_target',
+                 'astar_wall_version', 'distance_fields', 'soldier_state', 'stored_state', 'fill_empty',
+                 'soldier_msg_cooldown', 'num_turns_alive', 'enemy_tile', 'enemy_reports', 'ruin_to_fill',
+                 'wander_target', 'enemy_tower', 'fill_tower_type', 'intermediate_target', 'prev_intermediate',
+                 'srp_location', 'enemy_target', 'remove_paint', 'spawn_queue', 'send_type_message',
+                 'spawn_direction', 'num_enemy_visits', 'rounds_without_enemy', 'num_soldiers_spawned',
+                 'opposite_corner', 'seen_paint_tower', 'bot_round_num', 'broadcast', 'alert_robots',
+                 'alert_attack_soldiers', 'is_tracing', 'smallest_distance', 'closest_location', 'tracing_dir',
+                 'stopped_location', 'tracing_turns', 'bug1_turns', 'is_low_paint', 'round_num',
+                 'srp_center', 'map_width', 'map_height', 'map_tiles', 'map_last_seen', 'map_robot', 'nearby_tiles',
+                 'robot_indices', 'map_refresh_round', 'map_refresh_location', 'wall_version', 'wall_changes',
+                 'new_tile_indices',
+                 'symmetry', 'predicted_indices', 'home_location', 'pending_tasks', 'profile_counter', 'profile_unit', 'profile_stack',
+                 'profile_child_costs', 'profile_methods', 'profile_stacks', 'profile_overruns',
+                 'profile_dumped')
+
+    def __init__(self):
+        # Initialization Variables
+        self.turn_count = 0
+        self.last8 = deque(maxlen=16)  # Acts as queue with max size 16, holds HashableCoords keys
+        self.last_tower = None
+        self.soldier_type = SoldierType.ADVANCE
+
+        # Pathfinding Variables
+        self.stuck_turn_count = 0
+        self.closest_path = -1
+        self.in_bug_nav = False
+        self.across_wall = None
+        self.prev_location = None
+        self.in_astar_nav = False
+        self.astar_path = None
+        self.astar_target = None
+        self.astar_wall_version = -1
+        self.distance_fields = {}
+
+        # Soldier state variables
+        self.soldier_state = SoldierState.EXPLORING
+        self.stored_state = SoldierState.EXPLORING
+
+        self.fill_empty = None
+        self.soldier_msg_cooldown = -1
+        self.num_turns_alive = 0  # Variable keeping track of how many turns alive for the soldier lifecycle
+
+        # Key Soldier Location variables
+        self.enemy_tile = None  # location of an enemy paint/tower for a develop/advance robot to report
+        self.enemy_reports = []  # enemy_tile and the enemy paint around it, sent to the tower in one message frame
+        self.ruin_to_fill = None  # location of a ruin that the soldier is filling in
+        self.wander_target = None  # target for advance robot to pathfind towards during exploration
+        self.enemy_tower = None  # location of enemy tower for attack soldiers to pathfind to
+        self.fill_tower_type = None
+        self.intermediate_target = None  # used to record short-term robot targets
+        self.prev_intermediate = None  # Copy of intermediate target
+        self.srp_location = None  # location of SRP robot before it went to get more paint
+
+        # Enemy Info variables
+        self.enemy_target = None  # location of enemy tower/tile for tower to tell
+        self.remove_paint = None
+
+        # Tower Spawning Variables
+        self.spawn_queue = []
+        self.send_type_message = False
+        self.spawn_direction = None
+        self.num_enemy_visits = 0
+        self.rounds_without_enemy = 0
+        self.num_soldiers_spawned = 0
+
+        # Navigation Variables
+        self.opposite_corner = None
+        self.seen_paint_tower = False
+        self.bot_round_num = 0
+
+        # Towers Broadcasting Variables
+        self.broadcast = False
+        self.alert_robots = False
+        self.alert_attack_soldiers = False
+
+        # BugNav Variables
+        self.is_tracing = False
+        self.smallest_distance = 10000000
+        self.closest_location = None
+        self.tracing_dir = None
+        self.stopped_location = None
+        self.tracing_turns = 0
+        self.bug1_turns = 0
+
+        # Splasher State Variables
+        self.is_low_paint = False
+
+        # Bytecode Tracker
+        self.round_num = 0
+
+        # Filling SRP State
+        self.srp_center = None
+
+        # World Map Variables, allocated by WorldMap.init
+        self.map_width = 0
+        self.map_height = 0
+        self.map_tiles = None
+        self.map_last_seen = None
+        self.map_robot = None
+        self.nearby_tiles = []
+        self.robot_indices = []
+        self.map_refresh_round = -1
+        self.map_refresh_location = None
+        self.wall_version = 0  # length of wall_changes, plans made at an older version catch up on the changes since
+        self.wall_changes = []  # map_tiles indices of the tiles that became blocked or passable, in order
+        self.new_tile_indices = []
+
+        # Symmetry Variables, set by Symmetry.init
+        self.symmetry = 0  # bitmask of the symmetries the map may still have
+        self.predicted_indices = []  # map_tiles indices of the walls and ruins written from their mirror
+        self.home_location = None
+
+        # Scheduler Variables, maps task name to (priority, generator)
+        self.pending_tasks = {}
+
+        # Profiler Variables, set by Profiler.init when Constants.PROFILE is on
+        self.profile_counter = None
+        self.profile_unit = None
+        self.profile_stack = []
+        self.profile_child_costs = []
+        self.profile_methods = {}
+        self.profile_stacks = {}
+        self.profile_overruns = 0
+        self.profile_dumped = False
+
+    def reset_variables(self):
+        """
+        Resets pathfinding variables, see Robot.reset_variables
+        Lives here so that pathfinding can reset them without importing the robot classes
+        """
+        self.is_tracing = False
+        self.smallest_distance = 10000000
+        self.closest_location = None
+        self.tracing_dir = None
+        self.stuck_turn_count = 0
+        self.closest_path = -1
+        self.fill_tower_type = None
+        self.stopped_location = None
+        self.tracing_turns = 0
+        self.bug1_turns = 0
+        self.in_bug_nav = False
+        self.across_wall = None
+        self.in_astar_nav = False
+        self.astar_path = None
+
+
+# The state of this robot
+state = RobotState()
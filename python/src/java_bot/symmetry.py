@@ -0,0 +1,176 @@
+from battlecode25.stubs import *
+from .constants import *
+from .world_map import *
+from .scheduler import Scheduler
+from .state import state
+
+# Candidate symmetries of the map, kept as a bitmask in state.symmetry
+ROTATIONAL = 1  # (x, y) mirrors to (width - 1 - x, height - 1 - y)
+HORIZONTAL = 2  # (x, y) mirrors to (x, height - 1 - y)
+VERTICAL = 4  # (x, y) mirrors to (width - 1 - x, y)
+ALL_SYMMETRIES = ROTATIONAL | HORIZONTAL | VERTICAL
+
+class Symmetry:
+    """
+    Infers the symmetry of the map from the walls and ruins seen so far
+    Every map is rotationally, horizontally or vertically symmetric. A candidate is dropped as soon as a
+    tile and its mirror have both been seen and only one of them is blocked. Once a single candidate is left,
+    the mirror of every seen wall and ruin is written into the world map, so pathfinding plans around
+    terrain that has never been seen, and the enemy base is the mirror of our own.
+    Predicted tiles keep map_last_seen at -1, so WorldMap.is_known still tells them apart, and are listed in
+    predicted_indices so they can be taken back.
+    Our base is the location of our initial tower. Towers pass it on in a home frame to the robots they spawn,
+    and soldiers to the towers they build (see Communication.send_home).
+    """
+
+    @staticmethod
+    def init(rc):
+        """
+        Starts with every symmetry possible
+        Until a home frame says otherwise, our base is the tower that spawned this robot, or this tower itself
+        """
+        state.symmetry = ALL_SYMMETRIES
+        state.predicted_indices = []
+        home = rc.get_location()
+        if rc.get_type().is_robot_type():
+            for robot in rc.sense_nearby_robots(2, rc.get_team()):
+                if robot.get_type().is_tower_type():
+                    home = robot.get_location()
+                    break
+        state.home_location = home
+
+    @staticmethod
+    def mirror_index(i, symmetry):
+        """Returns the map_tiles index of the mirror of tile i"""
+        height = state.map_height
+        if symmetry == ROTATIONAL:
+            return state.map_width * height - 1 - i
+        x = i // height
+        if symmetry == HORIZONTAL:
+            return x * height + height - 1 - (i - x * height)
+        return (state.map_width - 1 - x) * height + i - x * height
+
+    @staticmethod
+    def mirror(loc, symmetry):
+        """Returns the mirror of loc"""
+        if symmetry == ROTATIONAL:
+            return MapLocation(state.map_width - 1 - loc.x, state.map_height - 1 - loc.y)
+        if symmetry == HORIZONTAL:
+            return MapLocation(loc.x, state.map_height - 1 - loc.y)
+        return MapLocation(state.map_width - 1 - loc.x, loc.y)
+
+    @staticmethod
+    def candidates():
+        """Returns the list of symmetries that are still possible"""
+        symmetry = state.symmetry
+        return [s for s in (ROTATIONAL, HORIZONTAL, VERTICAL) if symmetry & s]
+
+    @staticmethod
+    def is_known():
+        """Returns True if exactly one symmetry is left"""
+        symmetry = state.symmetry
+        return symmetry != 0 and symmetry & (symmetry - 1) == 0
+
+    @staticmethod
+    def update(rc):
+        """
+        Checks the tiles seen for the first time since the last update against their mirrors
+        Called once per turn, after the world map is refreshed
+        """
+        new_indices = state.new_tile_indices
+        if not new_indices:
+            return
+        state.new_tile_indices = []
+        symmetry = state.symmetry
+        if symmetry == 0:
+            return
+
+        tiles = state.map_tiles
+        last_seen = state.map_last_seen
+        if not Symmetry.is_known():
+            for s in Symmetry.candidates():
+                for i in new_indices:
+                    j = Symmetry.mirror_index(i, s)
+                    if last_seen[j] != -1 and (tiles[i] ^ tiles[j]) & BLOCKED_BITS:
+                        symmetry &= ~s
+                        break
+            state.symmetry = symmetry
+            if Symmetry.is_known():
+                Scheduler.submit('mirror_map', 0, Symmetry.mirror_map_task)
+            elif symmetry == 0:
+                # Only happens if the map breaks the rules, fall back to exploring without predictions
+                Symmetry.clear_predictions()
+            return
+
+        # The mirror_map task may still be running, writing the same mirrors twice is harmless
+        wall_changes = state.wall_changes
+        predicted = state.predicted_indices
+        for i in new_indices:
+            j = Symmetry.mirror_index(i, symmetry)
+            if last_seen[j] == -1:
+                if tiles[i] & BLOCKED_BITS and not tiles[j] & BLOCKED_BITS:
+                    wall_changes.append(j)
+                    predicted.append(j)
+                tiles[j] = tiles[i] & BLOCKED_BITS
+            elif (tiles[i] ^ tiles[j]) & BLOCKED_BITS:
+                # The last candidate was wrong after all
+                state.symmetry = 0
+                Symmetry.clear_predictions()
+                return
+        state.wall_version = len(wall_changes)
+
+    @staticmethod
+    def mirror_map_task():
+        """
+        Scheduler task that writes the mirror of every seen wall and ruin into the world map, one column per step
+        """
+        width = state.map_width
+        height = state.map_height
+        for x in range(width):
+            symmetry = state.symmetry
+            if not Symmetry.is_known():
+                return
+            tiles = state.map_tiles
+            last_seen = state.map_last_seen
+            wall_changes = state.wall_changes
+            predicted = state.predicted_indices
+            for i in range(x * height, x * height + height):
+                if last_seen[i] == -1 or not tiles[i] & BLOCKED_BITS:
+                    continue
+                j = Symmetry.mirror_index(i, symmetry)
+                if last_seen[j] == -1 and not tiles[j] & BLOCKED_BITS:
+                    tiles[j] = tiles[i] & BLOCKED_BITS
+                    wall_changes.append(j)
+                    predicted.append(j)
+            state.wall_version = len(wall_changes)
+            yield
+
+    @staticmethod
+    def clear_predictions():
+        """Removes every predicted tile that has not been seen since from the world map"""
+        tiles = state.map_tiles
+        last_seen = state.map_last_seen
+        wall_changes = state.wall_changes
+        for i in state.predicted_indices:
+            if last_seen[i] == -1 and tiles[i]:
+                tiles[i] = 0
+                wall_changes.append(i)
+        state.predicted_indices = []
+        # Paths and distance fields catch up on the walls that are gone
+        state.wall_version = len(wall_changes)
+
+    @staticmethod
+    def explore_target(rc, radius_squared):
+        """
+        Returns a random possible enemy base that is further than radius_squared away from rc, or None if there is none
+        Going there either finds the enemy or rules out a symmetry on the way
+        """
+        cur_location = rc.get_location()
+        targets = []
+        for s in Symmetry.candidates():
+            target = Symmetry.mirror(state.home_location, s)
+            if cur_location.distance_squared_to(target) > radius_squared:
+                targets.append(target)
+        if not targets:
+            return None
+        return targets[int(rng.random() * len(targets))]
@@ -0,0 +1,168 @@
+from battlecode25.stubs import *
+from .state import state
+from array import array
+
+# Every tile is packed into one byte of map_tiles at index x * map_height + y: __RWmmmppp
+# ppp = PaintType value of the paint, mmm = PaintType value of the mark, W = wall, R = ruin
+PAINT_MASK = 0b111
+MARK_SHIFT = 3
+WALL_BIT = 1 << 6
+RUIN_BIT = 1 << 7
+BLOCKED_BITS = WALL_BIT | RUIN_BIT
+
+# Values of map_robot
+NO_ROBOT = 0
+ALLY_ROBOT = 1
+ENEMY_ROBOT = 2
+
+# PaintType for each paint/mark value, so decoding a tile never builds an enum
+PAINT_BY_VALUE = [PaintType.EMPTY] * 8
+for paint_type in PaintType:
+    PAINT_BY_VALUE[paint_type.value] = paint_type
+EMPTY_PAINT = PaintType.EMPTY.value
+IS_ALLY_PAINT = [paint_type.is_ally() for paint_type in PAINT_BY_VALUE]
+IS_ENEMY_PAINT = [paint_type.is_enemy() for paint_type in PAINT_BY_VALUE]
+
+# Splasher score of a packed tile, see Sensing.score_splash. Unseen tiles (0) count as empty.
+SPLASH_SCORE = [
+    -1 if tile & BLOCKED_BITS else
+    0 if tile & PAINT_MASK == EMPTY_PAINT else
+    2 if IS_ENEMY_PAINT[tile & PAINT_MASK] else
+    -1
+    for tile in range(256)
+]
+
+class WorldMap:
+    """
+    Per-robot memory of every tile the robot has seen
+    Vision is sensed at most once per round (and again only if the robot has moved or painted since), and every
+    sensing helper reads from the packed tile store instead of calling rc.sense_nearby_map_infos() itself.
+    """
+
+    @staticmethod
+    def init(rc):
+        """Allocates an empty tile store for the map that rc is playing on"""
+        width = rc.get_map_width()
+        height = rc.get_map_height()
+        state.map_width = width
+        state.map_height = height
+        state.map_tiles = bytearray(width * height)
+        state.map_last_seen = array('h', [-1]) * (width * height)
+        state.map_robot = bytearray(width * height)
+        state.nearby_tiles = []
+        state.robot_indices = []
+        state.new_tile_indices = []
+        state.map_refresh_round = -1
+        state.map_refresh_location = None
+        state.wall_version = 0
+        state.wall_changes = []
+
+    @staticmethod
+    def refresh(rc):
+        """
+        Records everything currently in vision into the tile store and returns the list of MapInfo in vision
+        Only senses if the round or the robot location changed since the last refresh
+        """
+        round_num = rc.get_round_num()
+        cur_location = rc.get_location()
+        if state.map_refresh_round == round_num and state.map_refresh_location == cur_location:
+            return state.nearby_tiles
+
+        height = state.map_height
+        tiles = state.map_tiles
+        last_seen = state.map_last_seen
+        robot_grid = state.map_robot
+
+        wall_changes = state.wall_changes
+        new_indices = state.new_tile_indices
+        nearby_tiles = rc.sense_nearby_map_infos()
+        for tile in nearby_tiles:
+            loc = tile.get_map_location()
+            i = loc.x * height + loc.y
+            packed = tile.get_paint().value | tile.get_mark().value << MARK_SHIFT
+            if tile.is_wall():
+                packed |= WALL_BIT
+            if tile.has_ruin():
+                packed |= RUIN_BIT
+            # Planned paths and distance fields are only updated for tiles that became blocked or passable,
+            # e.g. a newly seen wall, or a predicted wall that turned out to be open
+            if (packed & BLOCKED_BITS == 0) != (tiles[i] & BLOCKED_BITS == 0):
+                wall_changes.append(i)
+            tiles[i] = packed
+            # First sightings are checked against their mirror by Symmetry.update
+            if last_seen[i] == -1:
+                new_indices.append(i)
+            last_seen[i] = round_num
+
+        # Robots move every turn, so only the ones currently in vision are kept
+        for i in state.robot_indices:
+            robot_grid[i] = NO_ROBOT
+        robot_indices = []
+        team = rc.get_team()
+        for robot in rc.sense_nearby_robots():
+            i = robot.location.x * height + robot.location.y
+            robot_grid[i] = ALLY_ROBOT if robot.team == team else ENEMY_ROBOT
+            robot_indices.append(i)
+
+        state.wall_version = len(wall_changes)
+        state.nearby_tiles = nearby_tiles
+        state.robot_indices = robot_indices
+        state.map_refresh_round = round_num
+        state.map_refresh_location = cur_location
+        return nearby_tiles
+
+    @staticmethod
+    def invalidate():
+        """
+        Makes the next refresh sense again
+        Called after every action that changes paint, marks or ruins in vision, so the rest of the turn reads them
+        """
+        state.map_refresh_round = -1
+
+    @staticmethod
+    def tiles_within(rc, center, radius_squared):
+        """Returns the MapInfo in vision that are within radius_squared of center, without sensing again"""
+        return [tile for tile in WorldMap.refresh(rc)
+                if center.distance_squared_to(tile.get_map_location()) <= radius_squared]
+
+    @staticmethod
+    def is_known(x, y):
+        """Returns True if the tile at (x, y) has been seen at least once"""
+        return state.map_last_seen[x * state.map_height + y] != -1
+
+    @staticmethod
+    def paint_at(loc):
+        """Returns the last seen PaintType at loc"""
+        return PAINT_BY_VALUE[state.map_tiles[loc.x * state.map_height + loc.y] & PAINT_MASK]
+
+    @staticmethod
+    def mark_at(loc):
+        """Returns the last seen mark at loc"""
+        return PAINT_BY_VALUE[state.map_tiles[loc.x * state.map_height + loc.y] >> MARK_SHIFT & PAINT_MASK]
+
+    @staticmethod
+    def sensed_paint(rc, loc):
+        """Returns the current PaintType at loc in vision, sensing again only if an action changed vision this turn"""
+        WorldMap.refresh(rc)
+        return WorldMap.paint_at(loc)
+
+    @staticmethod
+    def sensed_mark(rc, loc):
+        """Returns the current mark at loc in vision, sensing again only if an action changed vision this turn"""
+        WorldMap.refresh(rc)
+        return WorldMap.mark_at(loc)
+
+    @staticmethod
+    def is_wall(x, y):
+        """Returns True if the tile at (x, y) is known to be a wall"""
+        return state.map_tiles[x * state.map_height + y] & WALL_BIT != 0
+
+    @staticmethod
+    def has_ruin(x, y):
+        """Returns True if the tile at (x, y) is known to be a ruin"""
+        return state.map_tiles[x * state.map_height + y] & RUIN_BIT != 0
+
+    @staticmethod
+    def is_passable(x, y):
+        """Returns True if the tile at (x, y) is not known to be a wall or a ruin"""
+        return state.map_tiles[x * state.map_height + y] & BLOCKED_BITS == 0
@@ -0,0 +1,121 @@
+"""
+Checks run.py's release downloads against a local http.server that serves byte ranges
+A range that fails on the first attempt must be the only one fetched again on the next attempt,
+and the finished file must be checked against the .sha1 file published next to it.
+"""
+
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import run
+
+RANGE_SIZE = 1000
+DATA = bytes(i * 7 % 251 for i in range(4500))
+
+
+class ReleaseHandler(BaseHTTPRequestHandler):
+    files = {}
+    # Range starts that answer with an error once, then succeed
+    fail_once = set()
+    requested = []
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def respond(self, send_body):
+        body = self.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        status = 200
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if match:
+            start, end = int(match.group(1)), int(match.group(2))
+            self.requested.append(start)
+            if start in self.fail_once:
+                self.fail_once.discard(start)
+                self.send_error(500)
+                return
+            body = body[start:end + 1]
+            status = 206
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(files):
+    ReleaseHandler.files = files
+    ReleaseHandler.fail_once = set()
+    ReleaseHandler.requested = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReleaseHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    run.properties["release_base_url"] = f"http://127.0.0.1:{server.server_port}"
+    return server
+
+
+def test_resumes_after_a_failed_range():
+    server = serve({"/release.zip": DATA})
+    try:
+        ReleaseHandler.fail_once = {2 * RANGE_SIZE}
+        try:
+            run.download_file("release.zip", "release.zip")
+        except Exception:
+            pass
+        else:
+            assert False, "the failed range should fail the first download"
+        assert not os.path.exists(".temp/release.zip")
+        assert os.path.exists(".temp/release.zip.part.json")
+
+        ReleaseHandler.requested = []
+        run.download_file("release.zip", "release.zip")
+        assert ReleaseHandler.requested == [2 * RANGE_SIZE], ReleaseHandler.requested
+        assert Path(".temp/release.zip").read_bytes() == DATA
+        assert not os.path.exists(".temp/release.zip.part")
+        assert not os.path.exists(".temp/release.zip.part.json")
+    finally:
+        server.shutdown()
+
+
+def test_verifies_the_published_checksum():
+    good = hashlib.sha1(DATA).hexdigest()
+    server = serve({"/good.zip": DATA, "/good.zip.sha1": f"{good}  good.zip\n".encode(),
+                    "/bad.zip": DATA, "/bad.zip.sha1": b"0" * 40,
+                    "/unsigned.zip": DATA})
+    try:
+        for name in ("good.zip", "bad.zip", "unsigned.zip"):
+            run.download_file(name, name)
+        assert run.verify_download("good.zip", "good.zip")
+        assert os.path.exists(".temp/good.zip")
+        assert not run.verify_download("bad.zip", "bad.zip")
+        assert not os.path.exists(".temp/bad.zip")
+        # A missing checksum only warns
+        assert run.verify_download("unsigned.zip", "unsigned.zip")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run.DOWNLOAD_RANGE_SIZE = RANGE_SIZE
+    run.properties["download_workers"] = 2
+    os.chdir(tempfile.mkdtemp())
+    test_resumes_after_a_failed_range()
+    test_verifies_the_published_checksum()
+    print("ok")
@@ -0,0 +1,31 @@
+"""
+Checks that run.py finds the winner of every match in the engine output
+The log in engine_logs/ is engine output with robot prints mixed in, replace it with a fresh capture of
+`python run.py run` whenever the engine changes its output format.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import run
+
+LOG = Path(__file__).resolve().parent / "engine_logs" / "two_maps.log"
+
+
+def test_parses_every_match_in_order():
+    outcomes = run.parse_match_results(LOG.read_text())
+    assert outcomes == [("A", 1532), ("B", 2000)], outcomes
+
+
+def test_unparsed_output_names_the_last_line():
+    error = run.unparsed_output_error("[server] Match Starting\\n[server] something new happened\\n")
+    assert "something new happened" in error, error
+    assert "no output" in run.unparsed_output_error("")
+
+
+if __name__ == "__main__":
+    test_parses_every_match_in_order()
+    test_unparsed_output_names_the_last_line()
+    print("ok")
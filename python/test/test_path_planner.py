@@ -0,0 +1,95 @@
+"""
+Checks that java_bot's distance fields, repaired after every wall change, match a BFS from scratch
+Needs the battlecode25 package, run from the python directory.
+"""
+
+import sys
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from battlecode25.stubs import *
+from sim import FakeRC, load_map, load_player
+
+bot = load_player("src/java_bot")
+state = bot.state
+
+
+def fresh_field(target):
+    """Computes the field of target with an empty cache, leaving the cached fields alone"""
+    cached = state.distance_fields
+    state.distance_fields = {}
+    field = list(bot.PathPlanner.distance_field(target))
+    state.distance_fields = cached
+    return field
+
+
+def toggle(i):
+    """Turns tile i into a wall or back, logging the change like the world map does"""
+    state.map_tiles[i] ^= bot.WALL_BIT
+    state.wall_changes.append(i)
+    state.wall_version = len(state.wall_changes)
+
+
+def test_repaired_fields_match_bfs(seed):
+    rng = random.Random(seed)
+    width = rng.randint(20, 40)
+    height = rng.randint(20, 40)
+    state.map_width = width
+    state.map_height = height
+    state.map_tiles = bytearray(width * height)
+    state.wall_changes = []
+    state.wall_version = 0
+    state.distance_fields = {}
+    target = MapLocation(rng.randrange(width), rng.randrange(height))
+    bot.PathPlanner.distance_field(target)
+    for step in range(300):
+        toggle(rng.randrange(width * height))
+        if step % 3 == 0:
+            repaired = list(bot.PathPlanner.distance_field(target))
+            assert repaired == fresh_field(target), f"seed {seed}, step {step}"
+
+
+def test_a_star_keeps_path_unless_blocked():
+    state.map_width = state.map_height = 20
+    state.map_tiles = bytearray(400)
+    state.wall_changes = []
+    state.wall_version = 0
+    path = bot.PathPlanner.a_star(MapLocation(0, 0), MapLocation(10, 0))
+    version = state.wall_version
+    # A wall away from the path keeps it, a wall on the path does not
+    toggle(15 * 20 + 15)
+    assert not bot.PathPlanner.path_blocked(path, version)
+    toggle(path[3].x * 20 + path[3].y)
+    assert bot.PathPlanner.path_blocked(path, version)
+
+
+def test_off_map_targets():
+    # Corner targets like (width, height) are off the map, and (0, height) shares its index with (1, 0)
+    state.map_width = state.map_height = 20
+    state.map_tiles = bytearray(400)
+    state.wall_changes = []
+    state.wall_version = 0
+    path = bot.PathPlanner.a_star(MapLocation(0, 0), MapLocation(0, 20))
+    assert path[-1] == MapLocation(0, 19), path[-1]
+
+    world = load_map("sim/maps/Square24.txt")
+    soldier = world.spawn(Team.A, UnitType.SOLDIER, MapLocation(3, 3))
+    rc = FakeRC(world, soldier)
+    bot.WorldMap.init(rc)
+    state.reset_variables()
+    for target in (MapLocation(24, 24), MapLocation(24, 0), MapLocation(0, 24), MapLocation(-1, -1)):
+        for _ in range(10):
+            dir = bot.Pathfinding.pathfind(rc, target)
+            if dir is not None and rc.can_move(dir):
+                rc.move(dir)
+            soldier.movement_ready = True
+
+
+if __name__ == "__main__":
+    for seed in range(10):
+        test_repaired_fields_match_bfs(seed)
+    test_a_star_keeps_path_unless_blocked()
+    test_off_map_targets()
+    print("ok")
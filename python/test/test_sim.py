@@ -0,0 +1,211 @@
+"""
+Checks the offline simulator: the move, attack and transfer rules of FakeRC, and java_bot's helpers played through it
+java_bot has no run_soldier or run_tower, so a whole match only shows the exceptions its turn() catches. The
+helpers those would call are driven directly instead. Needs the battlecode25 package, run from the python directory.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from battlecode25.stubs import *
+from sim import World, FakeRC, Match, load_map, load_player
+from sim.world import ATTACK_PAINT_COST, MOP_PAINT_STEAL, TOWER_DAMAGE, TOWER_PATTERNS
+
+bot = load_player("src/java_bot")
+state = bot.state
+
+# Rows from the top, so soldier A at (1, 3) has a wall to its east and a ruin two tiles south
+WORLD = """
+.....
+..#..
+.....
+.R...
+.....
+"""
+
+
+def world_with_robots():
+    world = World.from_text(WORLD)
+    soldier = world.spawn(Team.A, UnitType.SOLDIER, MapLocation(1, 3))
+    return world, soldier, FakeRC(world, soldier)
+
+
+def raises(action):
+    try:
+        action()
+    except GameActionException:
+        return True
+    return False
+
+
+def test_move():
+    world, soldier, rc = world_with_robots()
+    assert not rc.can_move(Direction.EAST)  # wall
+    assert raises(lambda: rc.move(Direction.EAST))
+    world.spawn(Team.B, UnitType.SOLDIER, MapLocation(1, 4))
+    assert not rc.can_move(Direction.NORTH)  # occupied
+    assert rc.can_move(Direction.SOUTH)
+    rc.move(Direction.SOUTH)
+    assert rc.get_location() == MapLocation(1, 2)
+    assert world.robot_at(MapLocation(1, 2)) is soldier and world.robot_at(MapLocation(1, 3)) is None
+    # One move per round
+    assert not rc.can_move(Direction.WEST)
+    # Ruins block movement
+    soldier.movement_ready = True
+    assert not rc.can_move(Direction.SOUTH)
+
+
+def test_attack():
+    world, soldier, rc = world_with_robots()
+    target = MapLocation(0, 3)
+    paint = soldier.paint
+    rc.attack(target, True)
+    assert world.paint_for(world.index(target), Team.A) == PaintType.ALLY_SECONDARY
+    assert world.paint_for(world.index(target), Team.B) == PaintType.ENEMY_SECONDARY
+    assert soldier.paint == paint - ATTACK_PAINT_COST[UnitType.SOLDIER]
+    # One action per round
+    assert not rc.can_attack(MapLocation(0, 2))
+    assert raises(lambda: rc.attack(MapLocation(0, 2)))
+
+    # Towers only hit enemy robots
+    tower = world.spawn(Team.B, UnitType.LEVEL_ONE_PAINT_TOWER, MapLocation(1, 1))
+    tower_rc = FakeRC(world, tower)
+    assert not tower_rc.can_attack(MapLocation(0, 0))
+    health = soldier.health
+    tower_rc.attack(soldier.location)
+    assert soldier.health == health - TOWER_DAMAGE
+
+    # Moppers clean enemy paint and take paint from enemy robots
+    mopper = world.spawn(Team.B, UnitType.MOPPER, MapLocation(0, 2))
+    mopper.paint = 0
+    soldier.paint = 50
+    mopper_rc = FakeRC(world, mopper)
+    mopper_rc.attack(soldier.location)
+    assert soldier.paint == 50 - MOP_PAINT_STEAL and mopper.paint == MOP_PAINT_STEAL // 2
+    mopper.action_ready = True
+    mopper_rc.attack(target)
+    assert world.paint[world.index(target)] == PaintType.EMPTY
+
+
+def test_transfer():
+    world, soldier, rc = world_with_robots()
+    tower = world.spawn(Team.A, UnitType.LEVEL_ONE_PAINT_TOWER, MapLocation(0, 2))
+    enemy = world.spawn(Team.B, UnitType.SOLDIER, MapLocation(0, 4))
+    soldier.paint = 10
+    tower_paint = tower.paint
+    assert not rc.can_transfer_paint(enemy.location, 5)
+    assert not rc.can_transfer_paint(tower.location, -(tower_paint + 1))
+    # Taking more than the capacity of the soldier
+    assert not rc.can_transfer_paint(tower.location, -UnitType.SOLDIER.paint_capacity)
+    rc.transfer_paint(tower.location, -50)
+    assert soldier.paint == 60 and tower.paint == tower_paint - 50
+    assert raises(lambda: rc.transfer_paint(tower.location, -10))
+
+    # Robots only take paint from towers
+    ally = world.spawn(Team.A, UnitType.SOLDIER, MapLocation(0, 3))
+    soldier.action_ready = True
+    assert not rc.can_transfer_paint(ally.location, -5)
+    assert rc.can_transfer_paint(ally.location, 0)
+
+
+def java_bot_soldier(world, loc):
+    """Spawns a team A soldier at loc and gives java_bot's shared state a fresh world map for it"""
+    soldier = world.spawn(Team.A, UnitType.SOLDIER, loc)
+    rc = FakeRC(world, soldier)
+    bot.WorldMap.init(rc)
+    state.reset_variables()
+    return soldier, rc
+
+
+def next_turn(world, robot):
+    world.round_num += 1
+    robot.action_ready = True
+    robot.movement_ready = True
+
+
+def test_java_bot_pathfinds_around_walls():
+    # The wall at x = 5 from y = 19 to 21 is between the soldier and its target
+    world = load_map("sim/maps/Square24.txt")
+    soldier, rc = java_bot_soldier(world, MapLocation(4, 20))
+    target = MapLocation(7, 20)
+    for _ in range(20):
+        if rc.get_location() == target:
+            break
+        dir = bot.Pathfinding.pathfind(rc, target)
+        if dir is not None and rc.can_move(dir):
+            rc.move(dir)
+        next_turn(world, soldier)
+    assert rc.get_location() == target, rc.get_location()
+
+
+def test_java_bot_fills_resource_pattern():
+    world = World.from_text("\n".join(["......."] * 7))
+    center = MapLocation(3, 3)
+    soldier, rc = java_bot_soldier(world, center)
+    state.srp_center = center
+    # One attack per tile, and one more turn to complete the pattern
+    for _ in range(26):
+        bot.Soldier.fill_srp(rc)
+        next_turn(world, soldier)
+    assert world.matches_resource_pattern(center, Team.A)
+    assert center in world.resource_patterns[Team.A.value]
+
+
+def test_java_bot_completes_ruin_and_tells_it_home():
+    world = World.from_text(".......\n.......\n.......\n...R...\n.......\n.......\n.P.....")
+    paint_tower = world.robot_at(MapLocation(1, 0))
+    # Next to the ruin, so the whole 5x5 around it is in vision
+    soldier, rc = java_bot_soldier(world, MapLocation(3, 2))
+    state.home_location = paint_tower.location
+    # Standing next to an existing tower sends nothing
+    bot.Robot.complete_ruin_if_possible(rc, paint_tower.location)
+    assert not paint_tower.inbox
+
+    ruin = MapLocation(3, 3)
+    pattern = TOWER_PATTERNS[UnitType.LEVEL_ONE_MONEY_TOWER]
+    for dx in range(-2, 3):
+        for dy in range(-2, 3):
+            if dx or dy:
+                paint = PaintType.ALLY_PRIMARY if pattern[dx + 2][dy + 2] == "P" else PaintType.ALLY_SECONDARY
+                world.set_paint_for(world.index(ruin.translate(dx, dy)), Team.A, paint)
+    assert bot.Sensing.find_paintable_ruin_tile(rc, ruin, bot.Constants.money_tower_pattern) is None
+    bot.Robot.complete_ruin_if_possible(rc, ruin)
+    tower = world.robot_at(ruin)
+    assert tower is not None and tower.type == UnitType.LEVEL_ONE_MONEY_TOWER
+    assert len(tower.inbox) == 1
+
+
+def test_java_bot_tower_sees_covered_spawn():
+    world = World.from_text(".....\n..-..\n.P...\n.....\n.....")
+    tower = world.robot_at(MapLocation(1, 2))
+    rc = FakeRC(world, tower)
+    bot.WorldMap.init(rc)
+    state.spawn_direction = Direction.NORTHEAST
+    assert bot.Tower.start_square_covered(rc)
+    state.spawn_direction = Direction.NORTH
+    assert not bot.Tower.start_square_covered(rc)
+
+
+def test_ties_are_draws():
+    # Without any rounds played, only the paint of the map decides
+    world = World.from_text("P..\n...\n..p")
+    match = Match(world, "src/java_bot", "src/java_bot", max_rounds=0)
+    assert match.run() is None
+    world = World.from_text("P+.\n...\n..p")
+    assert Match(world, "src/java_bot", "src/java_bot", max_rounds=0).run() == Team.A
+    world = World.from_text("P..\n...\n.-p")
+    assert Match(world, "src/java_bot", "src/java_bot", max_rounds=0).run() == Team.B
+
+
+if __name__ == "__main__":
+    test_move()
+    test_attack()
+    test_transfer()
+    test_java_bot_pathfinds_around_walls()
+    test_java_bot_fills_resource_pattern()
+    test_java_bot_completes_ruin_and_tells_it_home()
+    test_java_bot_tower_sees_covered_spawn()
+    test_ties_are_draws()
+    print("ok")